@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Performance benchmarks; run modules with `python -m benchmarks.<name>`
@@ -0,0 +1,76 @@
+# benchmarks/bench_async.py
+"""Batch wall time of the sequential pipeline against the overlapped async pipeline.
+
+Each input goes through load -> clean -> analyze -> render -> send to a
+local SMTP stand-in that waits `--smtp-delay` seconds per message, as a
+remote server would. The sequential run does one stage after another for
+one file after another; `AsyncPipeline` overlaps them, so its time should
+approach that of the busiest stage.
+
+    python -m benchmarks.bench_async --reports 100 --rows 20000 --smtp-delay 0.05
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from src.automation.async_pipeline import AsyncPipeline, analyze_input, read_input, render_report
+from src.automation.email_automation import EmailAutomation
+from tests.smtp_server import StubSMTPServer
+from .synthetic import write_ledger_csv
+
+SENDER = 'reports@example.com'
+
+def _sequential(paths, output_dir: str, emailer: EmailAutomation, recipients) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        analysis = analyze_input(path, read_input(path))
+        report_path = render_report(analysis, os.path.join(output_dir, f"{name}_report.md"),
+                                    os.path.join(output_dir, 'charts', name))
+        emailer.send_bulk(SENDER, recipients, 'Report', report_path, 'secret', max_workers=1)
+    return time.perf_counter() - start
+
+def run(reports: int, rows: int, recipients: int = 2, smtp_delay: float = 0.05,
+        workers: int = None, categories: int = 10):
+    """Run the batch both ways and return wall times and per-stage busy time."""
+    addresses = [f'user{i}@example.com' for i in range(recipients)]
+    with tempfile.TemporaryDirectory() as tmp_dir, StubSMTPServer(store=False, delay=smtp_delay) as server:
+        paths = [write_ledger_csv(os.path.join(tmp_dir, f'ledger_{i}.csv'), rows,
+                                  categories=categories, seed=i) for i in range(reports)]
+        emailer = EmailAutomation('127.0.0.1', server.port, use_tls=False)
+        
+        sequential = _sequential(paths, os.path.join(tmp_dir, 'sequential'), emailer, addresses)
+        pipeline = AsyncPipeline(os.path.join(tmp_dir, 'async'), emailer=emailer, sender=SENDER,
+                                 recipients=addresses, password='secret', max_workers=workers)
+        result = pipeline.run(paths)
+    
+    busy = result['stage_seconds']
+    slowest = max(busy[name] / width for name, width in [
+        ('read', pipeline.io_workers), ('analyze', pipeline.max_workers),
+        ('render', pipeline.max_workers), ('send', pipeline.send_concurrency)])
+    return {
+        'reports': reports,
+        'failed': len(result['failed']),
+        'sequential_seconds': round(sequential, 3),
+        'async_seconds': round(result['elapsed'], 3),
+        'speedup': round(sequential / result['elapsed'], 2),
+        'stage_busy_seconds': busy,
+        'slowest_stage_seconds': round(slowest, 3)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reports', type=int, default=100)
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--recipients', type=int, default=2)
+    parser.add_argument('--smtp-delay', type=float, default=0.05,
+                        help="Seconds the SMTP stand-in waits before accepting a message")
+    parser.add_argument('--workers', type=int, default=None, help="CPU executor size")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.reports, args.rows, args.recipients, args.smtp_delay,
+                         args.workers), indent=4))
+
+if __name__ == '__main__':
+    main()
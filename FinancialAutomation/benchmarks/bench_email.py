@@ -0,0 +1,95 @@
+# benchmarks/bench_email.py
+"""Memory and throughput of report distribution against a local SMTP stand-in.
+
+Compares one `send_report` call per recipient (new connection, attachment
+re-read and re-encoded per message) with `send_bulk` (pooled connections,
+attachment encoded once and streamed). The stand-in server runs in its own
+process. Throughput is timed untraced; peak memory is traced with
+tracemalloc over a smaller sample of recipients, since tracing slows the
+send loop by an order of magnitude.
+
+    python -m benchmarks.bench_email --recipients 1000 --size-mb 5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import tracemalloc
+
+from src.automation.email_automation import EmailAutomation
+from tests.smtp_server import StubSMTPServer
+
+SENDER = 'reports@example.com'
+
+def _serve(port_queue, stop_event):
+    with StubSMTPServer(store=False) as server:
+        port_queue.put(server.port)
+        stop_event.wait()
+
+def _send_per_message(emailer: EmailAutomation, addresses, report_path: str) -> int:
+    return sum(emailer.send_report(SENDER, address, 'Report', report_path, 'secret')
+               for address in addresses)
+
+def _send_bulk(emailer: EmailAutomation, addresses, report_path: str,
+               workers: int, compression: str) -> int:
+    result = emailer.send_bulk(SENDER, addresses, 'Report', report_path, 'secret',
+                               max_workers=workers, compression=compression)
+    return len(result['sent'])
+
+def run(recipients: int, size_mb: float, workers: int, compression: str = None,
+        memory_sample: int = 50):
+    """Run both send modes and return their throughput and peak traced memory."""
+    addresses = [f'user{i}@example.com' for i in range(recipients)]
+    port_queue, stop_event = multiprocessing.Queue(), multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve, args=(port_queue, stop_event), daemon=True)
+    server.start()
+    
+    try:
+        emailer = EmailAutomation('127.0.0.1', port_queue.get(timeout=10), use_tls=False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_path = os.path.join(tmp_dir, 'financial_report.md')
+            with open(report_path, 'wb') as f:
+                f.write(os.urandom(int(size_mb * 1024 * 1024)))
+            
+            modes = {
+                'per_message': lambda batch: _send_per_message(emailer, batch, report_path),
+                'bulk': lambda batch: _send_bulk(emailer, batch, report_path, workers, compression)
+            }
+            results = {}
+            for name, send in modes.items():
+                start = time.perf_counter()
+                sent = send(addresses)
+                elapsed = time.perf_counter() - start
+                
+                tracemalloc.start()
+                send(addresses[:memory_sample])
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                
+                results[name] = {
+                    'sent': sent,
+                    'seconds': round(elapsed, 3),
+                    'messages_per_second': round(sent / elapsed, 1),
+                    'peak_traced_mb': round(peak / 1024**2, 2)
+                }
+    finally:
+        stop_event.set()
+        server.join(timeout=10)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recipients', type=int, default=1000)
+    parser.add_argument('--size-mb', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--compression', choices=['gzip', 'zip'], default=None)
+    parser.add_argument('--memory-sample', type=int, default=50,
+                        help="Recipients sent under tracemalloc for the memory figure")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.recipients, args.size_mb, args.workers, args.compression,
+                         args.memory_sample), indent=4))
+
+if __name__ == '__main__':
+    main()
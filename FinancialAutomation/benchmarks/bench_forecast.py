@@ -0,0 +1,58 @@
+# benchmarks/bench_forecast.py
+"""Forecasting throughput in series per second.
+
+Builds a random panel of trending, seasonal series and times each model
+on the whole panel, in-process and split across a process pool.
+
+    python -m benchmarks.bench_forecast --series 100000 --periods 60 --workers 1 4
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.analysis.forecasting import Forecaster, MODELS
+
+def random_panel(series: int, periods: int, season_length: int = 12, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(periods)
+    level = rng.uniform(100, 1000, (series, 1))
+    slope = rng.normal(0, 2, (series, 1))
+    amplitude = rng.uniform(0, 50, (series, 1))
+    season = amplitude * np.sin(2 * np.pi * t / season_length)
+    return level + slope * t + season + rng.normal(0, 10, (series, periods))
+
+def run(series: int, periods: int, horizon: int = 3, workers=(1,), season_length: int = 12,
+        repeat: int = 3, seed: int = 0):
+    """Best-of-`repeat` series/second for every model and worker count."""
+    panel = random_panel(series, periods, season_length, seed)
+    results = {}
+    for model in MODELS:
+        for max_workers in workers:
+            forecaster = Forecaster(model, horizon, season_length, max_workers=max_workers)
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                forecaster.forecast_array(panel)
+                best = min(best, time.perf_counter() - start)
+            results[f'{model}/{max_workers}'] = {
+                'seconds': round(best, 4),
+                'series_per_second': round(series / best)
+            }
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--series', type=int, default=100_000)
+    parser.add_argument('--periods', type=int, default=60)
+    parser.add_argument('--horizon', type=int, default=3)
+    parser.add_argument('--season-length', type=int, default=12)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.series, args.periods, args.horizon, args.workers,
+                         args.season_length, args.repeat), indent=4))
+
+if __name__ == '__main__':
+    main()
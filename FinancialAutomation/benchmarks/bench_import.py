@@ -0,0 +1,95 @@
+# benchmarks/bench_import.py
+"""Import time of the package entry points, from `python -X importtime`.
+
+Each module is imported in a fresh interpreter; the cumulative time of its
+own import line is kept (best of `--runs`), together with the heaviest
+modules it pulled in and which heavy third-party packages got loaded.
+`--check` exits non-zero when a module exceeds its budget or loads a
+package it should not.
+
+    python -m benchmarks.bench_import --check
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ['pandas', 'numpy', 'matplotlib', 'yaml', 'pyarrow']
+
+# Cumulative import budget in milliseconds and packages each entry point must not load
+BUDGETS = {
+    'src.utlis': (100, HEAVY_PACKAGES),
+    'src.analysis': (100, HEAVY_PACKAGES),
+    'src.data_processing': (100, HEAVY_PACKAGES),
+    'src.automation': (100, HEAVY_PACKAGES),
+    'src.automation.email_automation': (250, HEAVY_PACKAGES),
+    'src.automation.report_generator': (2000, ['matplotlib'])
+}
+
+def _parse(stderr: str) -> List[tuple]:
+    """(module, cumulative microseconds) per `-X importtime` line."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(cumulative)))
+    return entries
+
+def measure(module: str, runs: int = 3, top: int = 5) -> Dict[str, Any]:
+    """Best-of-`runs` cumulative import time of `module` in a fresh interpreter."""
+    best = None
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                   cwd=ROOT, capture_output=True, text=True, check=True)
+        entries = _parse(completed.stderr)
+        total = dict(entries)[module]
+        if best is None or total < best[0]:
+            best = (total, entries)
+    total, entries = best
+    loaded = {name for name, _ in entries}
+    heaviest = sorted((e for e in entries if e[0] != module), key=lambda e: -e[1])[:top]
+    return {
+        'cumulative_ms': round(total / 1000, 1),
+        'heavy_packages': [name for name in HEAVY_PACKAGES if name in loaded],
+        'heaviest': {name: round(us / 1000, 1) for name, us in heaviest}
+    }
+
+def check(results: Dict[str, Dict[str, Any]], budgets: Dict[str, tuple] = None) -> List[str]:
+    """List modules over their time budget or loading forbidden packages."""
+    budgets = budgets or BUDGETS
+    violations = []
+    for module, stats in results.items():
+        if module not in budgets:
+            continue
+        budget_ms, forbidden = budgets[module]
+        if stats['cumulative_ms'] > budget_ms:
+            violations.append(f"{module}: {stats['cumulative_ms']} ms > {budget_ms} ms budget")
+        loaded = sorted(set(stats['heavy_packages']) & set(forbidden))
+        if loaded:
+            violations.append(f"{module}: imports {', '.join(loaded)}")
+    return violations
+
+def run(modules: List[str] = None, runs: int = 3) -> Dict[str, Dict[str, Any]]:
+    return {module: measure(module, runs) for module in modules or list(BUDGETS)}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', help="Modules to time (default: all budgeted)")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--check', action='store_true', help="Fail on budget violations")
+    args = parser.parse_args(argv)
+    results = run(args.modules, args.runs)
+    print(json.dumps(results, indent=4))
+    if args.check:
+        violations = check(results)
+        for line in violations:
+            print(f"BUDGET {line}")
+        return 1 if violations else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+# benchmarks/bench_memory.py
+"""Bytes per row of the default and compact ledger layouts after load -> clean.
+
+    python -m benchmarks.bench_memory --rows 1000000 --money-dtype int64
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from src.data_processing import DataLoader, DataCleaner, CompactSchema, memory_report
+from .synthetic import write_ledger_csv
+
+def run(rows: int, money_dtype: str = 'int64', categories: int = 50, seed: int = 0):
+    """Load and clean one synthetic ledger in both layouts and compare their footprint."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_ledger_csv(os.path.join(tmp_dir, 'ledger.csv'), rows,
+                                categories=categories, seed=seed)
+        loader = DataLoader()
+        default = DataCleaner().clean_data(loader.load_data(path))
+        schema = CompactSchema(money_dtype)
+        compact = DataCleaner(schema=schema).clean_data(loader.load_data(path, schema=schema))
+    return memory_report(default, compact)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10**6)
+    parser.add_argument('--money-dtype', choices=['int64', 'float32'], default='int64')
+    parser.add_argument('--categories', type=int, default=50)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.rows, args.money_dtype, args.categories), indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_reports.py
+"""Report rendering: string concatenation against the streaming template engine.
+
+The legacy path is the old `ReportGenerator._generate_report_content`
+loop (`report += ...` per category) followed by one write. The engine
+streams sections to the file, re-renders only sections whose values
+changed on a second run, and spreads many entities over a process pool.
+
+    python -m benchmarks.bench_reports --categories 100000 --entities 1000 --workers 4
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.automation.report_engine import ReportEngine, render_reports
+
+def make_analysis(categories: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    revenue = rng.lognormal(10, 1, categories)
+    return {
+        'summary_metrics': {'total_revenue': revenue.sum(), 'total_profit': revenue.sum() * 0.2,
+                            'average_profit_margin': 20.0, 'revenue_growth': 5.0},
+        'trend_analysis': {'revenue_trend': 'upward', 'profit_trend': 'stable'},
+        'category_analysis': {f'Category_{i:06d}': {'revenue': float(r), 'profit': float(r * 0.2),
+                                                    'profit_margin': 20.0}
+                              for i, r in enumerate(revenue)}
+    }
+
+def _legacy(analysis, path: str):
+    summary = analysis['summary_metrics']
+    report = f"""# Financial Analysis Report
+Generated on: 2024-01-01
+
+## Summary Metrics
+- Total Revenue: ${summary['total_revenue']:,.2f}
+- Total Profit: ${summary['total_profit']:,.2f}
+- Average Profit Margin: {summary['average_profit_margin']:.2f}%
+- Revenue Growth: {summary['revenue_growth']}%
+
+## Trend Analysis
+- Revenue Trend: {analysis['trend_analysis']['revenue_trend']}
+- Profit Trend: {analysis['trend_analysis']['profit_trend']}
+
+## Category Performance
+"""
+    for category, metrics in analysis['category_analysis'].items():
+        report += f"\n### {category}\n"
+        report += f"- Revenue: ${metrics['revenue']:,.2f}\n"
+        report += f"- Profit: ${metrics['profit']:,.2f}\n"
+        report += f"- Average Profit Margin: {metrics['profit_margin']:.2f}%\n"
+    with open(path, 'w') as f:
+        f.write(report)
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def run(categories: int, entities: int, entity_categories: int = 50, workers: int = None,
+        changed: float = 0.01):
+    """Time one large report, an incremental re-render, and many entity reports."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        analysis = make_analysis(categories)
+        legacy, _ = _timed(_legacy, analysis, os.path.join(tmp_dir, 'legacy.md'))
+        results['single_report'] = {'categories': categories, 'legacy_seconds': round(legacy, 4)}
+        for format in ['markdown', 'html', 'pdf']:
+            path = os.path.join(tmp_dir, f'report.{format}')
+            engine = ReportEngine(format)
+            full, _ = _timed(engine.render, analysis, path, None, '2024-01-01')
+            for name in list(analysis['category_analysis'])[:max(1, int(categories * changed))]:
+                analysis['category_analysis'][name]['profit'] += 1.0
+            incremental, stats = _timed(engine.render, analysis, path, None, '2024-01-01')
+            results['single_report'][format] = {
+                'full_seconds': round(full, 4),
+                'incremental_seconds': round(incremental, 4),
+                'sections_rendered': stats['rendered'],
+                'megabytes': round(os.path.getsize(path) / 1024**2, 2)
+            }
+        
+        batch = {f'unit_{i:05d}': make_analysis(entity_categories, seed=i) for i in range(entities)}
+        serial, _ = _timed(render_reports, batch, os.path.join(tmp_dir, 'serial'), 'markdown', 1)
+        parallel, _ = _timed(render_reports, batch, os.path.join(tmp_dir, 'parallel'), 'markdown', workers)
+        unchanged, stats = _timed(render_reports, batch, os.path.join(tmp_dir, 'parallel'), 'markdown', workers)
+        results['entity_reports'] = {
+            'entities': entities,
+            'serial_seconds': round(serial, 3),
+            'parallel_seconds': round(parallel, 3),
+            'unchanged_rerun_seconds': round(unchanged, 3),
+            'sections_rendered_on_rerun': stats['sections_rendered']
+        }
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--categories', type=int, default=100_000)
+    parser.add_argument('--entities', type=int, default=1000)
+    parser.add_argument('--entity-categories', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.categories, args.entities, args.entity_categories, args.workers),
+                     indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_serialization.py
+"""Archiving cost of multi-entity analysis results per serialization format.
+
+Each entity carries what `generate_full_analysis` returns (NumPy scalar
+metrics, monthly totals keyed by Timestamp, per-category breakdowns) plus
+a daily revenue array. The baseline is the old `json.dump(indent=4,
+default=str)`; since `default` is not applied to dict keys, which made it
+fail on Timestamp-keyed totals, the baseline first converts keys with
+`str`. It does not round-trip; the other formats are checked to load back
+equal.
+
+    python -m benchmarks.bench_serialization --entities 1000 --months 60
+"""
+import argparse
+import importlib.util
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utlis.serialization import dumps, loads
+from .synthetic import category_names
+
+def entity_results(entities: int, months: int = 60, categories: int = 10, seed: int = 0):
+    """Analysis results for `entities` business units, keyed by unit name."""
+    rng = np.random.default_rng(seed)
+    month_ends = list(pd.date_range('2019-01-31', periods=months, freq='ME'))
+    names = category_names(categories)
+    results = {}
+    for entity in range(entities):
+        revenue = rng.lognormal(12, 0.3, months)
+        profit = revenue * rng.uniform(0.1, 0.3, months)
+        results[f'unit_{entity:05d}'] = {
+            'summary_metrics': {
+                'total_revenue': np.float64(revenue.sum()),
+                'total_expenses': np.float64((revenue - profit).sum()),
+                'total_profit': np.float64(profit.sum()),
+                'average_profit_margin': np.float64(round(profit.sum() / revenue.sum() * 100, 2)),
+                'revenue_growth': np.float64(round(rng.normal(5, 10), 2))
+            },
+            'trend_analysis': {
+                'monthly_revenue': dict(zip(month_ends, revenue.tolist())),
+                'monthly_profit': dict(zip(month_ends, profit.tolist())),
+                'revenue_trend': 'upward',
+                'profit_trend': 'stable'
+            },
+            'category_analysis': {
+                name: {'revenue': float(r), 'profit': float(r * 0.2), 'profit_margin': 20.0}
+                for name, r in zip(names, rng.lognormal(10, 1, categories))
+            },
+            'daily_revenue': rng.lognormal(8, 0.5, months * 30)
+        }
+    return results
+
+def _equal(a, b) -> bool:
+    if isinstance(a, dict):
+        return isinstance(b, dict) and list(a) == list(b) and all(_equal(a[k], b[k]) for k in a)
+    if isinstance(a, np.ndarray):
+        return isinstance(b, np.ndarray) and a.dtype == b.dtype and np.array_equal(a, b)
+    return a == b
+
+def _string_keys(obj):
+    if isinstance(obj, dict):
+        return {str(key): _string_keys(value) for key, value in obj.items()}
+    return obj
+
+def _baseline_dumps(results) -> bytes:
+    return json.dumps(_string_keys(results), indent=4, default=str).encode()
+
+def run(entities: int, months: int = 60, repeat: int = 3):
+    """Time dump and load per format and check each for a lossless round trip."""
+    results = entity_results(entities, months)
+    formats = {'default_str': (_baseline_dumps, json.loads)}
+    for name in ['json', 'compact', 'msgpack']:
+        if name == 'msgpack' and importlib.util.find_spec('msgpack') is None:
+            continue
+        formats[name] = (lambda obj, name=name: dumps(obj, name), loads)
+    
+    report = {}
+    for name, (dump, load) in formats.items():
+        dump_seconds = load_seconds = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = dump(results)
+            dump_seconds = min(dump_seconds, time.perf_counter() - start)
+            start = time.perf_counter()
+            restored = load(data)
+            load_seconds = min(load_seconds, time.perf_counter() - start)
+        report[name] = {
+            'megabytes': round(len(data) / 1024**2, 2),
+            'dump_seconds': round(dump_seconds, 4),
+            'load_seconds': round(load_seconds, 4),
+            'lossless': _equal(results, restored)
+        }
+    baseline = report['default_str']['dump_seconds']
+    for entry in report.values():
+        entry['dump_speedup'] = round(baseline / entry['dump_seconds'], 2)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entities', type=int, default=1000)
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.entities, args.months, args.repeat), indent=4))
+
+if __name__ == '__main__':
+    main()
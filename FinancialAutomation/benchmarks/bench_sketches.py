@@ -0,0 +1,103 @@
+# benchmarks/bench_sketches.py
+"""Exact in-memory statistics against mergeable sketches over a chunk stream.
+
+The ledger is split into `--parts` independently generated parts. The
+exact path concatenates them and runs pandas `quantile`, `value_counts`
+and `nunique`; the sketch path folds each part's chunks into an
+`ApproximateAccumulator`, in-process and across a process pool, and merges
+the results. Observed errors are reported next to the bounds the sketches
+claim.
+
+    python -m benchmarks.bench_sketches --rows 10000000 --parts 8 --workers 4
+"""
+import argparse
+import json
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.sketches import ApproximateAccumulator, QUANTILES, summarize
+from .synthetic import iter_ledger
+
+def _part(rows: int, seed: int, categories: int):
+    return iter_ledger(rows, chunk_rows=250_000, categories=categories, seed=seed)
+
+def _sketch_part(args) -> ApproximateAccumulator:
+    rows, seed, categories = args
+    return summarize(_part(rows, seed, categories), seed=seed)
+
+def _merged(parts):
+    merged = ApproximateAccumulator()
+    for accumulator in parts:
+        merged.merge(accumulator)
+    return merged
+
+def run(rows: int, parts: int = 8, workers: int = None, categories: int = 1000):
+    """Time exact and sketched statistics and compare the sketch errors to their bounds."""
+    tasks = [(rows // parts, seed, categories) for seed in range(parts)]
+    
+    start = time.perf_counter()
+    ledger = pd.concat([chunk for task in tasks for chunk in _part(*task)], ignore_index=True)
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    exact_quantiles = ledger['revenue'].quantile(list(QUANTILES.values()))
+    exact_counts = ledger['category'].value_counts()
+    exact_distinct = ledger['category'].nunique()
+    exact_seconds = time.perf_counter() - start
+    revenue = np.sort(ledger['revenue'].dropna().to_numpy())
+    ledger_megabytes = ledger.memory_usage(deep=True).sum() / 1024**2
+    del ledger
+    
+    start = time.perf_counter()
+    _merged(_sketch_part(task) for task in tasks)
+    serial_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parallel = _merged(pool.map(_sketch_part, tasks))
+    parallel_seconds = time.perf_counter() - start
+    
+    results = parallel.results(top=10)
+    summary = results['quantiles']['revenue']
+    rank_errors = [abs(np.searchsorted(revenue, summary[name]['value'], side='right') / len(revenue) - q)
+                   for name, q in QUANTILES.items()]
+    top = results['top_categories']['by_rows']
+    count_errors = [exact_counts[item['category']] - item['estimate'] for item in top['items']]
+    distinct = results['distinct_categories']
+    return {
+        'rows': rows,
+        'exact': {
+            'generate_and_concat_seconds': round(load_seconds, 3),
+            'statistics_seconds': round(exact_seconds, 3),
+            'ledger_megabytes': round(ledger_megabytes, 1)
+        },
+        'sketch': {
+            'serial_seconds_including_generation': round(serial_seconds, 3),
+            'parallel_seconds_including_generation': round(parallel_seconds, 3),
+            'state_kilobytes': round(len(pickle.dumps(parallel)) / 1024, 1)
+        },
+        'errors': {
+            'max_quantile_rank_error': round(max(rank_errors), 5),
+            'rank_error_bound': round(summary['rank_error'], 5),
+            'median_relative_error': round(abs(summary['median']['value'] / exact_quantiles[0.5] - 1), 5),
+            'top10_exact_order': [item['category'] for item in top['items']] == list(exact_counts.index[:10]),
+            'max_top_count_error': float(max(count_errors)),
+            'top_count_error_bound': top['max_error'],
+            'distinct_relative_error': round(abs(distinct['estimate'] / exact_distinct - 1), 5),
+            'distinct_relative_error_bound': round(distinct['relative_error'], 5)
+        }
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--parts', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--categories', type=int, default=1000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.rows, args.parts, args.workers, args.categories), indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+# benchmarks/run_benchmarks.py
+"""Stage benchmarks for the load -> clean -> analyze -> report pipeline.
+
+Each stage is timed (best of `--repeat` untraced runs) and then run once
+more under tracemalloc for its peak memory. Ledgers above `--stream-above`
+rows (10^7 by default), which would not fit in memory as one frame, run
+the streaming pipeline instead: each stage makes its own pass over the
+file in chunks (read only; cleaning statistics from sketches; read, clean
+and accumulate). Results are JSON; `compare`
+checks a run against a stored baseline and exits non-zero when any stage
+is slower or larger than the baseline by more than the threshold.
+
+    python -m benchmarks.run_benchmarks run --rows 10000 1000000 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks run --rows 10000 1000000 --output latest.json
+    python -m benchmarks.run_benchmarks run --rows 100000000 --repeat 1 --no-memory --data-dir data/bench
+    python -m benchmarks.run_benchmarks compare latest.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any, List, Callable
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing import DataLoader, DataCleaner
+from src.analysis import FinancialAnalyzer
+from src.analysis.sketches import summarize
+from src.automation import ReportGenerator
+from .synthetic import write_ledger_csv
+
+STREAM_ABOVE = 10**7
+
+def _measure(func: Callable[[], Any], repeat: int, trace_memory: bool):
+    """Return (result, best seconds, peak traced MB or None)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = round(peak / 1024**2, 3)
+    return result, round(best, 4), peak_mb
+
+def run_stages(csv_path: str, repeat: int = 3, trace_memory: bool = True,
+               streaming: bool = False) -> Dict[str, Dict[str, float]]:
+    """Benchmark every pipeline stage on one ledger file, in memory or streamed."""
+    stats = {}
+    
+    def record(name: str, func: Callable[[], Any]):
+        result, seconds, peak_mb = _measure(func, repeat, trace_memory)
+        stats[name] = {'seconds': seconds, 'peak_mb': peak_mb}
+        return result
+    
+    if streaming:
+        rows = record('load', lambda: sum(len(chunk) for chunk in DataLoader().iter_chunks(csv_path)))
+        statistics = record('clean', lambda: summarize(DataLoader().iter_chunks(csv_path))
+                            .cleaning_statistics())
+        results = record('analyze', lambda: FinancialAnalyzer.analyze_chunks(
+            DataCleaner(statistics=statistics).clean_data(chunk)
+            for chunk in DataLoader().iter_chunks(csv_path)))
+        clean = None
+    else:
+        raw = record('load', lambda: DataLoader().load_data(csv_path))
+        clean = record('clean', lambda: DataCleaner().clean_data(raw))
+        results = record('analyze', lambda: FinancialAnalyzer(clean).generate_full_analysis())
+        rows = len(raw)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Fresh chart directory per run so the chart cache does not skip rendering
+        run_dirs = (os.path.join(tmp_dir, str(i)) for i in range(repeat + 1))
+        record('report', lambda: ReportGenerator(clean, results, output_dir=next(run_dirs))
+               .generate_report(os.path.join(tmp_dir, 'report.md')))
+    
+    for stage in stats.values():
+        stage['rows_per_second'] = round(rows / stage['seconds']) if stage['seconds'] else None
+    return stats
+
+def run(rows: List[int], repeat: int = 3, trace_memory: bool = True,
+        data_dir: str = None, seed: int = 0, stream_above: int = STREAM_ABOVE) -> Dict[str, Any]:
+    """Generate (or reuse) a ledger for each size and benchmark all stages."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        for n in rows:
+            csv_path = os.path.join(data_dir, f'ledger_{n}_{seed}.csv')
+            if not os.path.exists(csv_path):
+                write_ledger_csv(csv_path, n, seed=seed)
+            results[str(n)] = run_stages(csv_path, repeat, trace_memory, streaming=n > stream_above)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            'stream_above': stream_above,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': results
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 0.2, memory_threshold: float = None) -> List[str]:
+    """List stages that regressed by more than `threshold` (a fraction) against the baseline."""
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    regressions = []
+    for rows, stages in current['results'].items():
+        for stage, stats in stages.items():
+            base = baseline['results'].get(rows, {}).get(stage)
+            if base is None:
+                continue
+            checks = [('seconds', threshold), ('peak_mb', memory_threshold)]
+            for metric, limit in checks:
+                old, new = base.get(metric), stats.get(metric)
+                if old and new and new > old * (1 + limit):
+                    regressions.append(
+                        f"{stage} @ {rows} rows: {metric} {old} -> {new} (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _save(data: Dict[str, Any], path: str):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+def _report_regressions(regressions: List[str]) -> int:
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions against baseline.")
+    return 1 if regressions else 0
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pipeline stage benchmarks.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help="Run the benchmarks")
+    run_parser.add_argument('--rows', type=int, nargs='+', default=[10**4, 10**5, 10**6],
+                            help="Ledger sizes, from 10^4 up to 10^8 rows")
+    run_parser.add_argument('--stream-above', type=int, default=STREAM_ABOVE,
+                            help="Stream ledgers larger than this many rows in chunks")
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    run_parser.add_argument('--data-dir', default=None, help="Keep generated ledgers here for reuse")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--output', default=None, help="Write results JSON here")
+    run_parser.add_argument('--save-baseline', default=None, help="Store results as the baseline")
+    run_parser.add_argument('--baseline', default=None, help="Compare results against this baseline")
+    run_parser.add_argument('--threshold', type=float, default=0.2)
+    
+    compare_parser = commands.add_parser('compare', help="Compare a results file with a baseline")
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--baseline', required=True)
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+    compare_parser.add_argument('--memory-threshold', type=float, default=None)
+    
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        return _report_regressions(compare(_load(args.baseline), _load(args.results),
+                                           args.threshold, args.memory_threshold))
+    
+    results = run(args.rows, args.repeat, not args.no_memory, args.data_dir, args.seed,
+                  args.stream_above)
+    print(json.dumps(results['results'], indent=4))
+    if args.output:
+        _save(results, args.output)
+    if args.save_baseline:
+        _save(results, args.save_baseline)
+    if args.baseline:
+        return _report_regressions(compare(_load(args.baseline), results, args.threshold))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,12 +9,17 @@ setup(
         'pandas>=1.5.0',
         'numpy>=1.21.0',
         'matplotlib>=3.5.0',
-        'seaborn>=0.11.0',
         'pytest>=7.0.0',
         'pyyaml>=6.0.0',
         'jupyter>=1.0.0',
         'python-dateutil>=2.8.2'
     ],
+    extras_require={
+        'cache': ['pyarrow>=10.0.0'],
+        'parquet': ['pyarrow>=10.0.0'],
+        'excel': ['openpyxl>=3.0.0'],
+        'serialization': ['orjson>=3.6.0', 'msgpack>=1.0.0']
+    },
     author="Your Name",
     author_email="your.email@example.com",
     description="A financial analysis and process automation system",
@@ -0,0 +1,278 @@
+# src/analysis/aggregation.py
+import pandas as pd
+import numpy as np
+import copy
+import json
+import os
+from typing import Dict, Any, Iterable
+from ..utlis.instrumentation import stage
+from ..data_processing.schema import ledger_column
+
+TREND_COLUMNS = ['revenue', 'profit']
+STATE_VERSION = 1
+
+class AnalysisAccumulator:
+    """Single-pass, mergeable accumulator behind `FinancialAnalyzer`.
+    
+    Each `update` reduces a chunk once into running totals, per-month and
+    per-category buckets and the regression statistics for the trend slopes,
+    so the full analysis can run over a chunk stream in O(chunk) memory.
+    Slopes are fitted against the global row index, matching `np.polyfit`
+    over the whole frame; the statistics are kept as means and co-moments
+    (the centred form of Σx, Σy, Σxy, Σx²) so merging chunks stays
+    numerically stable on long ledgers.
+    """
+    
+    def __init__(self):
+        self.rows = 0
+        self.totals = {'revenue': 0.0, 'expenses': 0.0, 'profit': 0.0}
+        self.margin_sum = 0.0
+        self.margin_count = 0
+        self.first_row = None
+        self.last_row = None
+        # Per column: [mean_x, mean_y, co-moment xy, second moment x]
+        self.regression = {col: np.zeros(4) for col in TREND_COLUMNS}
+        # month code (year * 12 + month - 1) -> [revenue, profit]
+        self.monthly = {}
+        # category -> [revenue, profit, margin sum, margin count]
+        self.categories = {}
+    
+    def update(self, chunk: pd.DataFrame) -> 'AnalysisAccumulator':
+        """Fold one chunk of rows into the running aggregates."""
+        if len(chunk) == 0:
+            return self
+        with stage('analyze.accumulate', rows=len(chunk)):
+            return self._update(chunk)
+    
+    def _update(self, chunk: pd.DataFrame) -> 'AnalysisAccumulator':
+        # Derived columns are computed here for raw loader chunks and compact frames
+        values = pd.DataFrame({
+            col: ledger_column(chunk, col)
+            for col in ['revenue', 'expenses', 'profit', 'profit_margin']
+        })
+        other = AnalysisAccumulator()
+        other.rows = len(chunk)
+        sums = values.sum()
+        other.totals = {col: sums[col] for col in other.totals}
+        other.margin_sum = sums['profit_margin']
+        other.margin_count = int(values['profit_margin'].count())
+        other.first_row = {col: values[col].iloc[0] for col in TREND_COLUMNS}
+        other.last_row = {col: values[col].iloc[-1] for col in TREND_COLUMNS}
+        
+        x = np.arange(other.rows, dtype=np.float64)
+        mean_x = x.mean()
+        m2_x = ((x - mean_x) ** 2).sum()
+        for col in TREND_COLUMNS:
+            y = values[col].to_numpy()
+            mean_y = y.mean()
+            other.regression[col] = np.array(
+                [mean_x, mean_y, ((x - mean_x) * (y - mean_y)).sum(), m2_x]
+            )
+        
+        other.monthly = self._bucket_months(chunk['date'], values)
+        other.categories = self._bucket_categories(chunk['category'], values)
+        return self.merge(other)
+    
+    def merge(self, other: 'AnalysisAccumulator') -> 'AnalysisAccumulator':
+        """Merge the aggregates of rows that follow this accumulator's rows."""
+        if other.rows == 0:
+            return self
+        if self.rows == 0:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        
+        n_a, n_b = self.rows, other.rows
+        n = n_a + n_b
+        for col in TREND_COLUMNS:
+            mean_x_a, mean_y_a, c_xy_a, m2_x_a = self.regression[col]
+            mean_x_b, mean_y_b, c_xy_b, m2_x_b = other.regression[col]
+            # `other` is indexed from 0, so shift it past this accumulator's rows
+            dx = (mean_x_b + n_a) - mean_x_a
+            dy = mean_y_b - mean_y_a
+            self.regression[col] = np.array([
+                mean_x_a + dx * n_b / n,
+                mean_y_a + dy * n_b / n,
+                c_xy_a + c_xy_b + dx * dy * n_a * n_b / n,
+                m2_x_a + m2_x_b + dx * dx * n_a * n_b / n
+            ])
+        
+        self.rows = n
+        for col in self.totals:
+            self.totals[col] += other.totals[col]
+        self.margin_sum += other.margin_sum
+        self.margin_count += other.margin_count
+        self.last_row = other.last_row
+        for buckets, other_buckets in ((self.monthly, other.monthly),
+                                       (self.categories, other.categories)):
+            for key, values in other_buckets.items():
+                if key in buckets:
+                    buckets[key] = buckets[key] + values
+                else:
+                    buckets[key] = values.copy()
+        return self
+    
+    def results(self) -> Dict[str, Any]:
+        """Build the `FinancialAnalyzer.generate_full_analysis` result dict."""
+        with stage('analyze.summary', rows=self.rows):
+            summary_metrics = self.summary_metrics()
+        with stage('analyze.trends', rows=self.rows):
+            trend_analysis = self.trend_analysis()
+        with stage('analyze.categories', rows=self.rows):
+            category_analysis = self.category_analysis()
+        return {
+            'summary_metrics': summary_metrics,
+            'trend_analysis': trend_analysis,
+            'category_analysis': category_analysis
+        }
+    
+    def summary_metrics(self) -> Dict[str, float]:
+        """Totals, average margin and first-to-last growth."""
+        return {
+            'total_revenue': self.totals['revenue'],
+            'total_expenses': self.totals['expenses'],
+            'total_profit': self.totals['profit'],
+            'average_profit_margin': self._mean(self.margin_sum, self.margin_count),
+            'revenue_growth': self.growth('revenue'),
+            'profit_growth': self.growth('profit')
+        }
+    
+    def trend_analysis(self) -> Dict[str, Any]:
+        """Month-end buckets (gaps filled with zero, as `resample('M')` does) and trends."""
+        monthly_revenue, monthly_profit = {}, {}
+        if self.monthly:
+            for code in range(min(self.monthly), max(self.monthly) + 1):
+                month_end = pd.Timestamp(code // 12, code % 12 + 1, 1) + pd.offsets.MonthEnd(0)
+                revenue, profit = self.monthly.get(code, (0.0, 0.0))
+                monthly_revenue[month_end] = float(revenue)
+                monthly_profit[month_end] = float(profit)
+        
+        return {
+            'monthly_revenue': monthly_revenue,
+            'monthly_profit': monthly_profit,
+            'revenue_trend': self.trend('revenue'),
+            'profit_trend': self.trend('profit')
+        }
+    
+    def category_analysis(self) -> Dict[str, Dict[str, float]]:
+        """Per-category totals and mean margin, rounded to 2 decimals."""
+        analysis = {}
+        for category in sorted(self.categories):
+            revenue, profit, margin_sum, margin_count = self.categories[category]
+            analysis[category] = {
+                'revenue': float(np.round(revenue, 2)),
+                'profit': float(np.round(profit, 2)),
+                'profit_margin': float(np.round(self._mean(margin_sum, margin_count), 2))
+            }
+        return analysis
+    
+    def growth(self, column: str) -> float:
+        """Growth from the first to the last row, as in `_calculate_growth`."""
+        if self.rows == 0:
+            return np.nan
+        first_value = np.float64(self.first_row[column])
+        last_value = np.float64(self.last_row[column])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return ((last_value - first_value) / first_value * 100).round(2)
+    
+    def slope(self, column: str) -> float:
+        """Least-squares slope of `column` against the row index."""
+        _, _, c_xy, m2_x = self.regression[column]
+        return c_xy / m2_x if m2_x > 0 else np.nan
+    
+    def trend(self, column: str) -> str:
+        """Trend direction from the sign of the slope."""
+        slope = self.slope(column)
+        if slope > 0:
+            return 'upward'
+        elif slope < 0:
+            return 'downward'
+        return 'stable'
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of the aggregates."""
+        return {
+            'version': STATE_VERSION,
+            'rows': self.rows,
+            'totals': {col: float(value) for col, value in self.totals.items()},
+            'margin_sum': float(self.margin_sum),
+            'margin_count': self.margin_count,
+            'first_row': self._floats(self.first_row),
+            'last_row': self._floats(self.last_row),
+            'regression': {col: stats.tolist() for col, stats in self.regression.items()},
+            'monthly': {str(code): values.tolist() for code, values in self.monthly.items()},
+            'categories': {str(cat): values.tolist() for cat, values in self.categories.items()}
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'AnalysisAccumulator':
+        """Rebuild an accumulator from a `to_state` snapshot."""
+        if state.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported analysis state version: {state.get('version')}")
+        accumulator = cls()
+        accumulator.rows = state['rows']
+        accumulator.totals = dict(state['totals'])
+        accumulator.margin_sum = state['margin_sum']
+        accumulator.margin_count = state['margin_count']
+        accumulator.first_row = state['first_row']
+        accumulator.last_row = state['last_row']
+        accumulator.regression = {col: np.array(stats) for col, stats in state['regression'].items()}
+        accumulator.monthly = {int(code): np.array(values) for code, values in state['monthly'].items()}
+        accumulator.categories = {cat: np.array(values) for cat, values in state['categories'].items()}
+        return accumulator
+    
+    def save(self, filepath: str):
+        """Write the state snapshot atomically to `filepath`."""
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_state(), f)
+        os.replace(tmp_path, filepath)
+    
+    @classmethod
+    def load(cls, filepath: str) -> 'AnalysisAccumulator':
+        """Read a state snapshot written by `save`."""
+        with open(filepath, 'r') as f:
+            return cls.from_state(json.load(f))
+    
+    def _bucket_months(self, dates: pd.Series, values: pd.DataFrame) -> Dict[int, np.ndarray]:
+        """Sum revenue and profit per calendar month with one bincount per column."""
+        valid = dates.notna().to_numpy()
+        if not valid.any():
+            return {}
+        codes = (dates.dt.year.to_numpy()[valid] * 12
+                 + dates.dt.month.to_numpy()[valid] - 1).astype(np.int64)
+        low = codes.min()
+        offsets = codes - low
+        sums = [
+            np.bincount(offsets, weights=np.nan_to_num(values[col].to_numpy()[valid]))
+            for col in TREND_COLUMNS
+        ]
+        present = np.bincount(offsets) > 0
+        return {
+            int(low + i): np.array([sums[0][i], sums[1][i]])
+            for i in np.flatnonzero(present)
+        }
+    
+    def _bucket_categories(self, categories: pd.Series, values: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Sum revenue, profit and margins per category in one grouped pass."""
+        grouped = values.groupby(categories, observed=True, sort=False)
+        sums = grouped[['revenue', 'profit', 'profit_margin']].sum()
+        counts = grouped['profit_margin'].count()
+        values = np.column_stack([sums.to_numpy(dtype=np.float64),
+                                  counts.to_numpy(dtype=np.float64)])
+        return dict(zip(sums.index, values))
+    
+    @staticmethod
+    def _floats(row: Dict[str, Any]) -> Dict[str, float]:
+        return None if row is None else {col: float(value) for col, value in row.items()}
+    
+    @staticmethod
+    def _mean(total: float, count: int) -> float:
+        return float(total / count) if count else np.nan
+
+
+def accumulate(chunks: Iterable[pd.DataFrame]) -> AnalysisAccumulator:
+    """Fold a stream of chunks into a single accumulator."""
+    accumulator = AnalysisAccumulator()
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator
@@ -0,0 +1,174 @@
+# src/analysis/financial_metrics.py
+import pandas as pd
+import numpy as np
+import os
+from typing import Dict, Any, Iterable
+from .aggregation import AnalysisAccumulator, accumulate
+from .rollup import RollupIndex
+from .sketches import summarize
+from .windows import WindowedMetrics, rolling_metrics
+from .forecasting import Forecaster, series_panel
+
+class FinancialAnalyzer:
+    """Combined class for financial metrics and trend analysis"""
+    
+    def __init__(self, data: pd.DataFrame = None, state_path: str = None,
+                 rollup: RollupIndex = None):
+        self.data = data
+        self.state_path = state_path
+        self.rollup = rollup
+        
+    def generate_full_analysis(self) -> Dict[str, Any]:
+        """Generate comprehensive financial analysis in a single pass over the data."""
+        return AnalysisAccumulator().update(self.data).results()
+    
+    @staticmethod
+    def analyze_chunks(chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+        """Generate the full analysis over a chunk stream in O(chunk) memory."""
+        return accumulate(chunks).results()
+    
+    @staticmethod
+    def approximate_analysis(chunks: Iterable[pd.DataFrame], top: int = 10,
+                             **params) -> Dict[str, Any]:
+        """Quantiles, top categories and distinct counts from sketches, with error bounds.
+        
+        Memory stays fixed however long the stream is; `params` size the
+        sketches (see `ApproximateAccumulator`).
+        """
+        return summarize(chunks, **params).results(top)
+    
+    def build_rollup(self) -> RollupIndex:
+        """Build the day x category rollup index used by `query` and `rollup_series`."""
+        self.rollup = RollupIndex.build(self.data)
+        return self.rollup
+    
+    def query(self, metric: str, start=None, end=None, category: str = None,
+              last_days: int = None) -> float:
+        """Total of a metric over a date range and optional category, without touching raw rows.
+        
+        e.g. `query('revenue', '2023-07-01', '2023-09-30', category='Services')`
+        or `query('profit', last_days=90)`.
+        """
+        if self.rollup is None:
+            self.build_rollup()
+        return self.rollup.query(metric, start, end, category, last_days)
+    
+    def rollup_series(self, metric: str, granularity: str = 'month', category: str = None,
+                      start=None, end=None) -> pd.Series:
+        """Per-period totals at day, week, month, quarter or year granularity."""
+        if self.rollup is None:
+            self.build_rollup()
+        return self.rollup.series(metric, granularity, category, start, end)
+    
+    def rolling_metrics(self, metric: str = 'revenue', window: int = 30) -> WindowedMetrics:
+        """Rolling sum, moving average, OLS slope and window-over-window growth per category."""
+        if self.rollup is None:
+            self.build_rollup()
+        return rolling_metrics(self.rollup, metric, window)
+    
+    def forecast(self, metric: str = 'revenue', horizon: int = 3, model: str = 'holt_winters',
+                 freq: str = 'M', by='category', max_workers: int = 1, **params) -> pd.DataFrame:
+        """Forecast the next `horizon` periods of `metric` for every `by` series."""
+        panel = series_panel(self.data, metric, by, freq)
+        return Forecaster(model, horizon, max_workers=max_workers, **params).forecast(panel)
+    
+    def update(self, new_rows: pd.DataFrame) -> Dict[str, Any]:
+        """Merge appended rows into the persisted analysis state.
+        
+        Only `new_rows` are read, so the cost grows with the size of the delta
+        rather than the history. Returns the analysis for all rows seen so far.
+        """
+        accumulator = self._load_state()
+        accumulator.update(new_rows)
+        accumulator.save(self._require_state_path())
+        return accumulator.results()
+    
+    def rebuild_state(self) -> Dict[str, Any]:
+        """Recompute the persisted state from the full history in `self.data`."""
+        accumulator = AnalysisAccumulator().update(self.data)
+        accumulator.save(self._require_state_path())
+        return accumulator.results()
+    
+    def verify_state(self, rtol: float = 1e-9) -> bool:
+        """Check the persisted state against a full recomputation over `self.data`."""
+        return _results_match(self._load_state().results(),
+                              self._generate_reference_analysis(), rtol)
+    
+    def _load_state(self) -> AnalysisAccumulator:
+        state_path = self._require_state_path()
+        if os.path.exists(state_path):
+            return AnalysisAccumulator.load(state_path)
+        return AnalysisAccumulator()
+    
+    def _require_state_path(self) -> str:
+        if self.state_path is None:
+            raise ValueError("No state_path configured for incremental analysis")
+        return self.state_path
+    
+    def _generate_reference_analysis(self) -> Dict[str, Any]:
+        """Generate the full analysis with one pandas pass per metric."""
+        return {
+            'summary_metrics': self._calculate_summary_metrics(),
+            'trend_analysis': self._analyze_trends(),
+            'category_analysis': self._analyze_categories()
+        }
+    
+    def _calculate_summary_metrics(self) -> Dict[str, float]:
+        """Calculate key financial metrics."""
+        return {
+            'total_revenue': self.data['revenue'].sum(),
+            'total_expenses': self.data['expenses'].sum(),
+            'total_profit': self.data['profit'].sum(),
+            'average_profit_margin': self.data['profit_margin'].mean(),
+            'revenue_growth': self._calculate_growth('revenue'),
+            'profit_growth': self._calculate_growth('profit')
+        }
+    
+    def _analyze_trends(self) -> Dict[str, Any]:
+        """Analyze trends in financial metrics."""
+        monthly_data = self.data.set_index('date').resample('M').sum()
+        
+        return {
+            'monthly_revenue': monthly_data['revenue'].to_dict(),
+            'monthly_profit': monthly_data['profit'].to_dict(),
+            'revenue_trend': self._calculate_trend('revenue'),
+            'profit_trend': self._calculate_trend('profit')
+        }
+    
+    def _analyze_categories(self) -> Dict[str, Dict[str, float]]:
+        """Analyze performance by category."""
+        category_analysis = self.data.groupby('category').agg({
+            'revenue': 'sum',
+            'profit': 'sum',
+            'profit_margin': 'mean'
+        }).round(2)
+        
+        return category_analysis.to_dict('index')
+    
+    def _calculate_growth(self, column: str) -> float:
+        """Calculate growth rate for a given metric."""
+        first_value = self.data[column].iloc[0]
+        last_value = self.data[column].iloc[-1]
+        return ((last_value - first_value) / first_value * 100).round(2)
+    
+    def _calculate_trend(self, column: str) -> str:
+        """Calculate trend direction using simple linear regression."""
+        x = np.arange(len(self.data))
+        y = self.data[column].values
+        slope = np.polyfit(x, y, 1)[0]
+        
+        if slope > 0:
+            return 'upward'
+        elif slope < 0:
+            return 'downward'
+        return 'stable'
+
+
+def _results_match(actual: Any, expected: Any, rtol: float) -> bool:
+    """Compare nested analysis results, allowing float summation-order noise."""
+    if isinstance(expected, dict):
+        return (isinstance(actual, dict) and list(actual) == list(expected)
+                and all(_results_match(actual[k], expected[k], rtol) for k in expected))
+    if isinstance(expected, str):
+        return actual == expected
+    return bool(np.isclose(actual, expected, rtol=rtol, atol=1e-6, equal_nan=True))
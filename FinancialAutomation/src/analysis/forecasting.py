@@ -0,0 +1,132 @@
+# src/analysis/forecasting.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Union
+
+import pandas as pd
+import numpy as np
+from ..data_processing.schema import ledger_column
+
+MODELS = ['linear', 'holt_winters', 'seasonal_naive']
+SEASON_LENGTHS = {'D': 7, 'W': 52, 'M': 12, 'Q': 4, 'Y': 1, 'A': 1}
+
+def linear_trend(values: np.ndarray, horizon: int) -> np.ndarray:
+    """Least-squares line per row of a (series, periods) array, extrapolated `horizon` steps."""
+    periods = values.shape[1]
+    x = np.arange(periods, dtype=np.float64)
+    x_centered = x - x.mean()
+    y_mean = values.mean(axis=1, keepdims=True)
+    denominator = (x_centered ** 2).sum() or 1.0
+    slope = ((values - y_mean) * x_centered).sum(axis=1, keepdims=True) / denominator
+    future = np.arange(periods, periods + horizon, dtype=np.float64) - x.mean()
+    return y_mean + slope * future
+
+def seasonal_naive(values: np.ndarray, horizon: int, season_length: int) -> np.ndarray:
+    """Repeat the last observed season; plain naive (last value) when there is no full season."""
+    periods = values.shape[1]
+    if season_length < 1 or periods < season_length:
+        return np.repeat(values[:, -1:], horizon, axis=1)
+    steps = periods - season_length + np.arange(horizon) % season_length
+    return values[:, steps]
+
+def holt_winters(values: np.ndarray, horizon: int, season_length: int = None,
+                 alpha: float = 0.3, beta: float = 0.1, gamma: float = 0.1) -> np.ndarray:
+    """Additive Holt-Winters with fixed smoothing, updated for every row at once.
+    
+    The time loop runs once over the periods and each step updates all
+    series as arrays. Without `season_length`, or with fewer than two full
+    seasons, it falls back to Holt's linear trend method.
+    """
+    periods = values.shape[1]
+    seasonal = bool(season_length) and season_length > 1 and periods >= 2 * season_length
+    if not seasonal and periods < 2:
+        return np.repeat(values[:, -1:], horizon, axis=1)
+    # Time-major copy so each step reads one contiguous row of all series
+    columns = np.ascontiguousarray(values.T)
+    steps = np.arange(1, horizon + 1)
+    if not seasonal:
+        level, trend = columns[0].copy(), columns[1] - columns[0]
+        for t in range(1, periods):
+            previous = level
+            level = alpha * columns[t] + (1 - alpha) * (level + trend)
+            trend = beta * (level - previous) + (1 - beta) * trend
+        return level[:, None] + trend[:, None] * steps
+    
+    m = season_length
+    first_mean = columns[:m].mean(axis=0)
+    trend = (columns[m:2 * m].mean(axis=0) - first_mean) / m
+    # Detrend the first season so its indices do not absorb the slope
+    offsets = np.arange(m) - (m - 1) / 2
+    season = columns[:m] - (first_mean + trend * offsets[:, None])
+    level = first_mean + trend * (m - 1) / 2
+    for t in range(m, periods):
+        s = t % m
+        previous = level
+        level = alpha * (columns[t] - season[s]) + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+        season[s] = gamma * (columns[t] - level) + (1 - gamma) * season[s]
+    return level[:, None] + trend[:, None] * steps + season[(periods - 1 + steps) % m].T
+
+def forecast_array(values: np.ndarray, horizon: int, model: str = 'holt_winters',
+                   season_length: int = None, **params) -> np.ndarray:
+    """Forecast every row of a (series, periods) array with one model."""
+    values = np.asarray(values, dtype=np.float64)
+    if model == 'linear':
+        return linear_trend(values, horizon)
+    if model == 'seasonal_naive':
+        return seasonal_naive(values, horizon, season_length or 1)
+    if model == 'holt_winters':
+        return holt_winters(values, horizon, season_length, **params)
+    raise ValueError(f"Unsupported model: {model}")
+
+def series_panel(data: pd.DataFrame, metric: str = 'revenue',
+                 by: Union[str, List[str]] = 'category', freq: str = 'M') -> pd.DataFrame:
+    """Per-period totals with one row per series key and one column per period.
+    
+    Periods without rows are zero, so every series shares the same calendar.
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    periods = data['date'].dt.to_period(freq).rename('period')
+    values = ledger_column(data, metric)
+    totals = values.groupby([data[key] for key in keys] + [periods], observed=True).sum()
+    panel = totals.unstack('period', fill_value=0.0)
+    calendar = pd.period_range(panel.columns.min(), panel.columns.max(), freq=freq)
+    return panel.reindex(columns=calendar, fill_value=0.0).astype(np.float64)
+
+class Forecaster:
+    """Short-horizon forecasts for many series at once.
+    
+    Each model is fitted to the whole (series, periods) array with batched
+    NumPy operations. With `max_workers` above one the rows are split into
+    blocks that are forecast in a process pool; pool start-up and copying
+    the blocks outweigh the fit for panels under a few million series.
+    """
+    
+    def __init__(self, model: str = 'holt_winters', horizon: int = 3,
+                 season_length: int = None, max_workers: int = 1, **params):
+        if model not in MODELS:
+            raise ValueError(f"Unsupported model: {model}")
+        self.model = model
+        self.horizon = horizon
+        self.season_length = season_length
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.params = params
+    
+    def forecast_array(self, values: np.ndarray, season_length: int = None) -> np.ndarray:
+        """Forecast every row of a (series, periods) array."""
+        run = partial(forecast_array, horizon=self.horizon, model=self.model,
+                      season_length=season_length or self.season_length, **self.params)
+        if self.max_workers == 1 or len(values) < 2 * self.max_workers:
+            return run(values)
+        blocks = np.array_split(np.asarray(values), self.max_workers)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            return np.concatenate(list(pool.map(run, blocks)))
+    
+    def forecast(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """Forecast a `series_panel` frame; columns are the next `horizon` periods."""
+        season_length = self.season_length or SEASON_LENGTHS.get(panel.columns.freqstr[0])
+        future = pd.period_range(panel.columns[-1] + 1, periods=self.horizon,
+                                 freq=panel.columns.freq)
+        return pd.DataFrame(self.forecast_array(panel.to_numpy(), season_length),
+                            index=panel.index, columns=future)
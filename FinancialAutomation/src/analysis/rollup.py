@@ -0,0 +1,130 @@
+# src/analysis/rollup.py
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterable, List, Union
+from ..data_processing.schema import ledger_column
+
+METRICS = ['revenue', 'expenses', 'profit', 'count']
+GRANULARITIES = {'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+class RollupIndex:
+    """Pre-aggregated day x category index with prefix sums.
+    
+    Daily sums per category are stored as cumulative arrays of shape
+    (metrics, categories, days + 1), so the total of any metric over any
+    date range and category is two lookups. Period boundaries for week,
+    month, quarter and year are precomputed, which makes a rollup series
+    at those granularities one vectorized difference of the prefix sums.
+    """
+    
+    def __init__(self, origin: pd.Timestamp, categories: List[str], cumulative: np.ndarray):
+        self.origin = pd.Timestamp(origin)
+        self.categories = list(categories)
+        self.cumulative = cumulative
+        self.days = cumulative.shape[2] - 1
+        self._category_index = {category: i for i, category in enumerate(self.categories)}
+        self._totals = cumulative.sum(axis=1)
+        self._boundaries = self._build_boundaries()
+    
+    @classmethod
+    def build(cls, data: pd.DataFrame) -> 'RollupIndex':
+        """Build the index from a cleaned frame."""
+        return cls.from_chunks([data])
+    
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame]) -> 'RollupIndex':
+        """Build the index from a chunk stream, keeping only per (category, day) sums."""
+        partials = []
+        for chunk in chunks:
+            days = chunk['date'].dt.normalize()
+            values = pd.DataFrame({
+                'revenue': ledger_column(chunk, 'revenue'),
+                'expenses': ledger_column(chunk, 'expenses'),
+                'count': 1.0
+            })
+            values['profit'] = values['revenue'] - values['expenses']
+            partials.append(values.groupby([chunk['category'].astype(str), days]).sum())
+        daily = pd.concat(partials).groupby(level=[0, 1]).sum() if partials else None
+        if daily is None or daily.empty:
+            return cls(pd.Timestamp('1970-01-01'), [], np.zeros((len(METRICS), 0, 1)))
+        
+        categories = sorted(daily.index.get_level_values(0).unique())
+        dates = daily.index.get_level_values(1)
+        origin = dates.min()
+        n_days = (dates.max() - origin).days + 1
+        category_codes = pd.Categorical(daily.index.get_level_values(0), categories=categories).codes
+        day_codes = (dates - origin).days.to_numpy()
+        
+        grid = np.zeros((len(METRICS), len(categories), n_days))
+        for i, metric in enumerate(METRICS):
+            grid[i, category_codes, day_codes] = daily[metric].to_numpy()
+        cumulative = np.zeros((len(METRICS), len(categories), n_days + 1))
+        np.cumsum(grid, axis=2, out=cumulative[:, :, 1:])
+        return cls(origin, categories, cumulative)
+    
+    def query(self, metric: str, start: Union[str, pd.Timestamp] = None,
+              end: Union[str, pd.Timestamp] = None, category: str = None,
+              last_days: int = None) -> float:
+        """Total of `metric` between `start` and `end` (inclusive), optionally for one category.
+        
+        `last_days` selects the trailing window ending on the last indexed day.
+        """
+        first, last = self._day_range(start, end, last_days)
+        if first >= last:
+            return 0.0
+        cumulative = self._series_cumulative(metric, category)
+        return float(cumulative[last] - cumulative[first])
+    
+    def series(self, metric: str, granularity: str = 'month', category: str = None,
+               start: Union[str, pd.Timestamp] = None,
+               end: Union[str, pd.Timestamp] = None) -> pd.Series:
+        """Per-period totals of `metric` at `granularity`, clipped to `start`/`end`."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        first, last = self._day_range(start, end)
+        starts, labels = self._boundaries[granularity]
+        keep = (starts < last) & (np.append(starts[1:], self.days) > first)
+        edges = np.clip(np.append(starts[keep], np.inf), first, last).astype(np.int64)
+        cumulative = self._series_cumulative(metric, category)
+        return pd.Series(np.diff(cumulative[edges]), index=labels[keep], name=metric)
+    
+    def save(self, filepath: str):
+        """Store the index as a compressed NumPy archive."""
+        np.savez_compressed(filepath, origin=np.array(str(self.origin.date())),
+                            categories=np.array(self.categories, dtype=str),
+                            cumulative=self.cumulative)
+    
+    @classmethod
+    def load(cls, filepath: str) -> 'RollupIndex':
+        with np.load(filepath) as archive:
+            return cls(pd.Timestamp(str(archive['origin'])), archive['categories'].tolist(),
+                       archive['cumulative'])
+    
+    def _series_cumulative(self, metric: str, category: str = None) -> np.ndarray:
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+        m = METRICS.index(metric)
+        if category is None:
+            return self._totals[m]
+        if category not in self._category_index:
+            return np.zeros(self.days + 1)
+        return self.cumulative[m, self._category_index[category]]
+    
+    def _day_range(self, start=None, end=None, last_days: int = None):
+        """Convert an inclusive date range into half-open day offsets clipped to the index."""
+        if last_days is not None:
+            return max(self.days - last_days, 0), self.days
+        first = 0 if start is None else (pd.Timestamp(start).normalize() - self.origin).days
+        last = self.days if end is None else (pd.Timestamp(end).normalize() - self.origin).days + 1
+        return min(max(first, 0), self.days), min(max(last, 0), self.days)
+    
+    def _build_boundaries(self) -> Dict[str, tuple]:
+        """Start offsets and labels of every period at each granularity."""
+        dates = pd.date_range(self.origin, periods=self.days, freq='D')
+        boundaries = {}
+        for granularity, freq in GRANULARITIES.items():
+            periods = dates.to_period(freq)
+            changes = np.r_[True, periods[1:] != periods[:-1]] if self.days else np.zeros(0, bool)
+            starts = np.flatnonzero(changes)
+            boundaries[granularity] = (starts, periods[starts])
+        return boundaries
@@ -0,0 +1,347 @@
+# src/analysis/sketches.py
+import math
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Iterable, List
+from ..utlis.instrumentation import stage
+from ..data_processing.schema import ledger_column
+
+QUANTILE_COLUMNS = ['revenue', 'expenses', 'profit', 'profit_margin']
+QUANTILES = {'q1': 0.25, 'median': 0.5, 'q3': 0.75, 'p90': 0.9, 'p99': 0.99}
+CONFIDENCE = 0.99
+
+def hash64(values) -> np.ndarray:
+    """Stable 64-bit hashes of non-null values; equal across processes and runs.
+    
+    Categorical columns hash the same as their values, so chunks that were
+    loaded with different category dictionaries still agree.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    series = series[series.notna()]
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang & Liberty compactors).
+    
+    Values enter level 0 with weight 1. A level that outgrows its capacity
+    is sorted and every other item, from a random offset, moves up a level
+    with twice the weight, so memory stays around `3k` items however many
+    values are seen. Each compaction at weight `w` shifts any rank by 0 or
+    ±w with equal chance; the sum of squared weights is tracked so
+    `rank_error` is a Hoeffding bound for this sketch's actual history.
+    """
+    
+    def __init__(self, k: int = 200, seed: int = None):
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self.variance = 0.0
+        self._rng = np.random.default_rng(seed)
+    
+    def update(self, values) -> 'KLLSketch':
+        """Add an array of values; NaNs are skipped."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+    
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Fold in a sketch built over other values."""
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge KLL sketches with k={self.k} and k={other.k}")
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.variance += other.variance
+        self._compress()
+        return self
+    
+    def quantile(self, q) -> Any:
+        """Value at quantile `q` (a float or an array of floats in [0, 1])."""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        targets = np.asarray(q, dtype=np.float64) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(items) - 1)
+        values = np.clip(items[positions], self.min, self.max)
+        values = np.where(np.asarray(q) <= 0, self.min, np.where(np.asarray(q) >= 1, self.max, values))
+        return values if np.ndim(q) else float(values)
+    
+    def rank(self, value: float) -> float:
+        """Approximate fraction of values less than or equal to `value`."""
+        if self.count == 0:
+            return np.nan
+        items, weights = self._weighted_items()
+        return float(weights[items <= value].sum() / weights.sum())
+    
+    def rank_error(self, confidence: float = CONFIDENCE) -> float:
+        """Normalized rank error that holds for any single query with `confidence`."""
+        if self.count == 0:
+            return 0.0
+        bound = math.sqrt(2 * self.variance * math.log(2 / (1 - confidence)))
+        return min(1.0, bound / self.count)
+    
+    def size(self) -> int:
+        """Number of retained items."""
+        return sum(len(items) for items in self.levels)
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+    
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            grew = level + 1 == len(self.levels)
+            if grew:
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            odd = len(items) % 2
+            promoted = items[:len(items) - odd][self._rng.integers(2)::2]
+            self.levels[level] = items[len(items) - odd:]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            self.variance += float(4 ** level)
+            # A new top level shrinks the capacities below it
+            level = 0 if grew else level + 1
+    
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+
+class FrequentItems:
+    """Mergeable heavy-hitter summary (Misra-Gries, the counter form of space-saving).
+    
+    At most `capacity` counters are kept. When a merge leaves more, the
+    `capacity + 1`-th largest count is subtracted from every counter and
+    added to `error`, so each estimate undercounts its item's true weight
+    by at most `error`, which never exceeds `total / (capacity + 1)`.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.total = 0.0
+        self.error = 0.0
+        self.counts = pd.Series(dtype=np.float64)
+    
+    def update(self, keys, weights=None) -> 'FrequentItems':
+        """Count non-null keys, optionally by non-negative `weights` (NaN counts as 0)."""
+        codes, uniques = pd.factorize(pd.Series(keys))
+        valid = codes >= 0
+        if weights is not None:
+            weights = np.clip(np.nan_to_num(np.asarray(weights, dtype=np.float64)[valid]), 0, None)
+        return self.add_counts(uniques, np.bincount(codes[valid], weights, minlength=len(uniques)))
+    
+    def add_counts(self, items, counts) -> 'FrequentItems':
+        """Fold in exact, non-negative per-item totals of a batch of rows."""
+        counts = np.asarray(counts, dtype=np.float64)
+        other = FrequentItems(self.capacity)
+        other.counts = pd.Series(counts, index=pd.Index(np.asarray(items, dtype=object)))
+        other.counts = other.counts[other.counts > 0]
+        other.total = float(counts.sum())
+        return self.merge(other)
+    
+    def merge(self, other: 'FrequentItems') -> 'FrequentItems':
+        """Fold in a summary built over other rows."""
+        counts = self.counts.add(other.counts, fill_value=0) if len(self.counts) else other.counts
+        self.total += other.total
+        self.error += other.error
+        if len(counts) > self.capacity:
+            threshold = counts.nlargest(self.capacity + 1).iloc[-1]
+            counts = counts[counts > threshold] - threshold
+            self.error += float(threshold)
+        self.counts = counts
+        return self
+    
+    def top(self, n: int = 10) -> List[Dict[str, Any]]:
+        """The `n` heaviest items with lower and upper bounds on their true weight."""
+        return [{'item': item, 'estimate': float(count), 'lower': float(count),
+                 'upper': float(count + self.error)}
+                for item, count in self.counts.nlargest(n).items()]
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch over `2**precision` one-byte registers.
+    
+    The relative standard error is `1.04 / sqrt(2**precision)`, 0.8% at the
+    default precision of 14 (16 KB); small counts use linear counting.
+    """
+    
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+    
+    def update(self, values) -> 'HyperLogLog':
+        """Add non-null values."""
+        hashes = hash64(values)
+        if len(hashes) == 0:
+            return self
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        # Leading zeros of the next (up to 52) bits, via the float exponent
+        bits = min(52, 64 - self.precision)
+        rest = (hashes >> np.uint64(64 - self.precision - bits)) & np.uint64((1 << bits) - 1)
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rho = (bits - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rho)
+        return self
+    
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Fold in a sketch built over other values."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+    
+    def estimate(self) -> float:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return float(raw)
+    
+    def relative_error(self) -> float:
+        """Relative standard error of `estimate`."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class ApproximateAccumulator:
+    """Sketch-backed counterpart of `AnalysisAccumulator` for exploratory summaries.
+    
+    Holds a quantile sketch per money column, heavy-hitter summaries of the
+    categories by rows and by revenue, and a distinct-category count, all in
+    memory independent of the ledger size. Accumulators built over separate
+    chunks or processes merge into the summary of their union.
+    """
+    
+    def __init__(self, k: int = 200, capacity: int = 64, precision: int = 14,
+                 seed: int = None):
+        self.rows = 0
+        self.quantiles = {col: KLLSketch(k, seed) for col in QUANTILE_COLUMNS}
+        self.categories_by_rows = FrequentItems(capacity)
+        self.categories_by_revenue = FrequentItems(capacity)
+        self.distinct_categories = HyperLogLog(precision)
+    
+    def update(self, chunk: pd.DataFrame) -> 'ApproximateAccumulator':
+        """Fold one chunk of rows into the sketches."""
+        if len(chunk) == 0:
+            return self
+        with stage('analyze.sketch', rows=len(chunk)):
+            self.rows += len(chunk)
+            values = {col: ledger_column(chunk, col) for col in QUANTILE_COLUMNS}
+            for col, sketch in self.quantiles.items():
+                sketch.update(values[col].to_numpy(dtype=np.float64))
+            # One factorization serves both category summaries and the distinct count
+            codes, categories = pd.factorize(chunk['category'])
+            valid = codes >= 0
+            revenue = np.clip(np.nan_to_num(values['revenue'].to_numpy(dtype=np.float64)[valid]), 0, None)
+            self.categories_by_rows.add_counts(
+                categories, np.bincount(codes[valid], minlength=len(categories)))
+            self.categories_by_revenue.add_counts(
+                categories, np.bincount(codes[valid], revenue, minlength=len(categories)))
+            self.distinct_categories.update(categories)
+        return self
+    
+    def merge(self, other: 'ApproximateAccumulator') -> 'ApproximateAccumulator':
+        """Merge the sketches of another set of rows, in any order."""
+        self.rows += other.rows
+        for col, sketch in self.quantiles.items():
+            sketch.merge(other.quantiles[col])
+        self.categories_by_rows.merge(other.categories_by_rows)
+        self.categories_by_revenue.merge(other.categories_by_revenue)
+        self.distinct_categories.merge(other.distinct_categories)
+        return self
+    
+    def results(self, top: int = 10) -> Dict[str, Any]:
+        """Approximate quantiles, top categories and distinct count, each with its error bound.
+        
+        Quantile bounds are the sketch's values at `q ± rank_error`; category
+        bounds bracket the true row count or revenue; the distinct-count bounds
+        are ±2 standard errors.
+        """
+        with stage('analyze.sketch_results', rows=self.rows):
+            distinct = self.distinct_categories.estimate()
+            spread = 2 * self.distinct_categories.relative_error()
+            return {
+                'rows': self.rows,
+                'quantiles': {col: self._quantile_summary(sketch)
+                              for col, sketch in self.quantiles.items()},
+                'top_categories': {
+                    'by_rows': self._top(self.categories_by_rows, top),
+                    'by_revenue': self._top(self.categories_by_revenue, top)
+                },
+                'distinct_categories': {
+                    'estimate': round(distinct),
+                    'lower': math.floor(distinct * (1 - spread)),
+                    'upper': math.ceil(distinct * (1 + spread)),
+                    'relative_error': self.distinct_categories.relative_error()
+                }
+            }
+    
+    def cleaning_statistics(self) -> Dict[str, Any]:
+        """Medians, quartiles and the modal category in the form `DataCleaner(statistics=...)` takes."""
+        columns = ['revenue', 'expenses']
+        statistics = {
+            name: {col: self.quantiles[col].quantile(QUANTILES[name]) for col in columns}
+            for name in ['q1', 'median', 'q3']
+        }
+        modal = self.categories_by_rows.top(1)
+        statistics['category_mode'] = modal[0]['item'] if modal else None
+        return statistics
+    
+    @staticmethod
+    def _quantile_summary(sketch: KLLSketch) -> Dict[str, Any]:
+        error = sketch.rank_error()
+        probabilities = np.array(list(QUANTILES.values()))
+        values = sketch.quantile(probabilities)
+        lower = sketch.quantile(np.clip(probabilities - error, 0, 1))
+        upper = sketch.quantile(np.clip(probabilities + error, 0, 1))
+        summary = {'count': sketch.count, 'min': float(sketch.min), 'max': float(sketch.max),
+                   'rank_error': error}
+        for i, name in enumerate(QUANTILES):
+            summary[name] = {'value': float(values[i]), 'lower': float(lower[i]),
+                             'upper': float(upper[i])}
+        return summary
+    
+    @staticmethod
+    def _top(summary: FrequentItems, n: int) -> Dict[str, Any]:
+        return {
+            'items': [{'category': entry.pop('item'), **entry} for entry in summary.top(n)],
+            'max_error': summary.error,
+            'total': summary.total
+        }
+
+
+def summarize(chunks: Iterable[pd.DataFrame], **params) -> ApproximateAccumulator:
+    """Fold a stream of chunks into a single sketch accumulator."""
+    accumulator = ApproximateAccumulator(**params)
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator
@@ -0,0 +1,95 @@
+# src/analysis/windows.py
+import pandas as pd
+import numpy as np
+from typing import List
+
+from .rollup import RollupIndex, METRICS
+
+STATISTICS = ['sum', 'mean', 'slope', 'growth']
+
+def sliding_statistics(daily: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum, mean, OLS slope and growth over the first axis of a (days, columns) array.
+    
+    Every statistic comes from prefix sums of y and t * y, so each window
+    costs O(1) regardless of its length. Windows that do not fit yet are NaN,
+    as with pandas' rolling; growth compares each window with the one before
+    it and is a percentage, like `FinancialAnalyzer._calculate_growth`.
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    days, columns = daily.shape
+    out = np.full((len(STATISTICS), days, columns), np.nan)
+    if days < window:
+        return out
+    
+    t = np.arange(days, dtype=np.float64)[:, None]
+    zeros = np.zeros((1, columns))
+    cum_y = np.concatenate([zeros, np.cumsum(daily, axis=0)])
+    cum_ty = np.concatenate([zeros, np.cumsum(t * daily, axis=0)])
+    
+    sums = cum_y[window:] - cum_y[:-window]
+    # Within a window starting at s, x = t - s, so sum(x * y) = sum(t * y) - s * sum(y)
+    starts = t[:days - window + 1]
+    sum_xy = cum_ty[window:] - cum_ty[:-window] - starts * sums
+    sum_x = window * (window - 1) / 2
+    sum_xx = (window - 1) * window * (2 * window - 1) / 6
+    slopes = (window * sum_xy - sum_x * sums) / (window * sum_xx - sum_x ** 2)
+    
+    out[0, window - 1:] = sums
+    out[1, window - 1:] = sums / window
+    out[2, window - 1:] = slopes
+    previous = sums[:-window]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[3, 2 * window - 1:] = np.where(previous != 0,
+                                           (sums[window:] - previous) / np.abs(previous) * 100, np.nan)
+    return out
+
+class WindowedMetrics:
+    """Array-backed rolling statistics for one metric.
+    
+    `values` has shape (statistics, days, columns), where the columns are
+    the categories followed by 'total'. Frames are only built on request.
+    """
+    
+    def __init__(self, metric: str, window: int, dates: pd.DatetimeIndex,
+                 columns: List[str], values: np.ndarray):
+        self.metric = metric
+        self.window = window
+        self.dates = dates
+        self.columns = list(columns)
+        self.values = values
+    
+    def frame(self, statistic: str) -> pd.DataFrame:
+        """One statistic as a days x columns frame."""
+        if statistic not in STATISTICS:
+            raise ValueError(f"Unsupported statistic: {statistic}")
+        return pd.DataFrame(self.values[STATISTICS.index(statistic)],
+                            index=self.dates, columns=self.columns)
+    
+    def column(self, name: str = 'total') -> pd.DataFrame:
+        """All statistics for one category (or the total) as a days x statistics frame."""
+        if name not in self.columns:
+            raise KeyError(f"Unknown column: {name}")
+        return pd.DataFrame(self.values[:, :, self.columns.index(name)].T,
+                            index=self.dates, columns=STATISTICS)
+    
+    def latest(self) -> dict:
+        """Most recent value of each statistic per column."""
+        return {
+            name: {statistic: float(self.values[s, -1, c]) for s, statistic in enumerate(STATISTICS)}
+            for c, name in enumerate(self.columns)
+        } if len(self.dates) else {}
+
+def rolling_metrics(index: RollupIndex, metric: str = 'revenue', window: int = 30) -> WindowedMetrics:
+    """Rolling statistics over `window` days of daily totals, per category and overall.
+    
+    Daily totals come from the rollup index, so calendar days without rows
+    count as zero instead of being skipped.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unsupported metric: {metric}")
+    daily = np.diff(index.cumulative[METRICS.index(metric)], axis=1).T
+    daily = np.concatenate([daily, daily.sum(axis=1, keepdims=True)], axis=1)
+    dates = pd.date_range(index.origin, periods=index.days, freq='D')
+    return WindowedMetrics(metric, window, dates, index.categories + ['total'],
+                           sliding_statistics(daily, window))
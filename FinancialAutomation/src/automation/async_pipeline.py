@@ -0,0 +1,156 @@
+# src/automation/async_pipeline.py
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, List
+
+from ..utlis.config import get_config
+
+STAGES = ['read', 'analyze', 'render', 'send']
+# Formats pandas can parse from an in-memory buffer; others are read by the worker
+BUFFERED_FORMATS = ('.csv', '.jsonl', '.ndjson')
+_DONE = object()
+
+def read_input(filepath: str) -> Any:
+    """Raw bytes of a buffered format, or the path for the analysis worker to open."""
+    if not filepath.lower().endswith(BUFFERED_FORMATS):
+        return filepath
+    with open(filepath, 'rb') as f:
+        return f.read()
+
+def analyze_input(filepath: str, payload: Any) -> Dict[str, Any]:
+    """Load, clean and analyze one input; runs in the CPU executor."""
+    from ..data_processing import DataLoader, DataCleaner
+    from ..data_processing.sources import CSVSource, JSONLinesSource
+    from ..analysis import FinancialAnalyzer
+    if isinstance(payload, bytes):
+        source_class = CSVSource if filepath.lower().endswith('.csv') else JSONLinesSource
+        payload = source_class(io.BytesIO(payload))
+    data = DataCleaner().clean_data(DataLoader().load_data(payload))
+    return FinancialAnalyzer(data).generate_full_analysis()
+
+def render_report(analysis: Dict[str, Any], report_path: str, charts_dir: str) -> str:
+    """Write the report and its charts; runs in the CPU executor."""
+    from .report_generator import ReportGenerator
+    ReportGenerator(None, analysis, output_dir=charts_dir,
+                    max_workers=1).generate_report(report_path)
+    return report_path
+
+class AsyncPipeline:
+    """Runs read -> analyze -> render -> send for many inputs with the stages overlapped.
+    
+    Each stage is a group of asyncio tasks joined to the next by a queue of
+    `queue_size` items, so a slow stage holds back its producers instead of
+    letting results pile up in memory. Reads go to an I/O thread pool and
+    sends are async SMTP; analysis and rendering run in `executor`
+    ('process' or 'thread', `max_workers` wide). Once the queues fill, a
+    batch takes roughly as long as its slowest stage rather than the sum of
+    all four. A failing input is recorded and the rest carry on.
+    """
+    
+    def __init__(self, output_dir: str = 'reports', emailer=None, sender: str = None,
+                 recipients: List[str] = None, password: str = '',
+                 subject: str = 'Financial Analysis Report',
+                 max_workers: int = None, queue_size: int = None, io_workers: int = 8,
+                 send_concurrency: int = 4, executor: str = 'process'):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unsupported executor: {executor}")
+        self.output_dir = output_dir
+        self.emailer = emailer
+        self.sender = sender
+        self.recipients = list(recipients or [])
+        self.password = password
+        self.subject = subject
+        self.max_workers = (max_workers or get_config().settings.pipeline.max_workers
+                            or os.cpu_count() or 1)
+        self.queue_size = queue_size or 2 * self.max_workers
+        self.io_workers = io_workers
+        self.send_concurrency = send_concurrency
+        self.executor = executor
+    
+    def run(self, paths: List[str]) -> Dict[str, Any]:
+        """Blocking wrapper around `run_async`."""
+        return asyncio.run(self.run_async(paths))
+    
+    async def run_async(self, paths: List[str]) -> Dict[str, Any]:
+        """Process every input and return the reports written, sends and failures."""
+        start = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._reports, self._sent, self._failed = {}, {}, {}
+        self._busy = dict.fromkeys(STAGES, 0.0)
+        sending = self.emailer is not None and bool(self.recipients)
+        pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=self.io_workers) as io_pool, \
+                pool_class(max_workers=self.max_workers) as cpu_pool:
+            queues = [asyncio.Queue(self.queue_size) for _ in range(4 if sending else 3)]
+            stages = [
+                self._stage('read', queues[0], queues[1], self.io_workers,
+                            lambda path, _: self._in(io_pool, read_input, path)),
+                self._stage('analyze', queues[1], queues[2], self.max_workers,
+                            lambda path, raw: self._in(cpu_pool, analyze_input, path, raw)),
+                self._stage('render', queues[2], queues[3] if sending else None,
+                            self.max_workers, lambda path, analysis: self._render(cpu_pool, path, analysis))
+            ]
+            if sending:
+                stages.append(self._stage('send', queues[3], None, self.send_concurrency, self._send))
+            await asyncio.gather(self._feed(paths, queues[0]), *stages)
+        
+        return {
+            'reports': self._reports,
+            'sent': self._sent,
+            'failed': self._failed,
+            'stage_seconds': {name: round(busy, 3) for name, busy in self._busy.items()},
+            'elapsed': time.perf_counter() - start
+        }
+    
+    async def _feed(self, paths: List[str], outbox: asyncio.Queue):
+        for path in paths:
+            await outbox.put((path, None))
+        await outbox.put(_DONE)
+    
+    async def _stage(self, name: str, inbox: asyncio.Queue, outbox: asyncio.Queue,
+                     workers: int, handler):
+        """Run `workers` tasks that apply `handler` to items until the inbox is exhausted."""
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    # Put the marker back for the sibling workers
+                    await inbox.put(_DONE)
+                    return
+                path, payload = item
+                started = time.perf_counter()
+                try:
+                    result = await handler(path, payload)
+                except Exception as e:
+                    self._failed[path] = f"{name}: {str(e)}"
+                    continue
+                finally:
+                    self._busy[name] += time.perf_counter() - started
+                if outbox is not None:
+                    await outbox.put((path, result))
+        
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        if outbox is not None:
+            await outbox.put(_DONE)
+    
+    async def _in(self, pool: Executor, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    
+    async def _render(self, pool: Executor, path: str, analysis: Dict[str, Any]) -> str:
+        name = os.path.splitext(os.path.basename(path))[0]
+        report_path = os.path.join(self.output_dir, f"{name}_report.md")
+        await self._in(pool, render_report, analysis, report_path,
+                       os.path.join(self.output_dir, 'charts', name))
+        self._reports[path] = report_path
+        return report_path
+    
+    async def _send(self, path: str, report_path: str):
+        result = await self.emailer.send_bulk_async(self.sender, self.recipients, self.subject,
+                                                    report_path, self.password)
+        self._sent[path] = result['sent']
+        if result['failed']:
+            raise RuntimeError(f"undelivered to {', '.join(result['failed'])}")
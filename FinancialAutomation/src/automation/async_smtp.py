@@ -0,0 +1,173 @@
+# src/automation/async_smtp.py
+import asyncio
+import base64
+import smtplib
+import ssl
+import time
+from typing import Dict, Any, List, Tuple
+
+from .email_automation import EncodedAttachment
+
+class AsyncSMTPConnection:
+    """Minimal asyncio SMTP client for streaming `EncodedAttachment` messages.
+    
+    Covers the dialogue the distribution path needs: EHLO, STARTTLS, AUTH
+    PLAIN and one MAIL/RCPT/DATA transaction per message. Failures raise the
+    `smtplib` exceptions, so `EmailAutomation._is_permanent` classifies them
+    the same way as on the blocking path.
+    """
+    
+    def __init__(self, host: str, port: int, use_tls: bool = True, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+    
+    async def connect(self, sender: str, password: str):
+        """Open the connection, upgrade it to TLS if asked and log in."""
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        code, resp = await self._reply()
+        if code != 220:
+            raise smtplib.SMTPConnectError(code, resp)
+        await self._ehlo()
+        if self.use_tls:
+            code, resp = await self.command('STARTTLS')
+            if code != 220:
+                raise smtplib.SMTPNotSupportedError(f"STARTTLS refused: {code} {resp}")
+            await self._writer.start_tls(ssl.create_default_context(), server_hostname=self.host)
+            await self._ehlo()
+        if password:
+            token = base64.b64encode(f"\0{sender}\0{password}".encode()).decode()
+            code, resp = await self.command(f'AUTH PLAIN {token}')
+            if code != 235:
+                raise smtplib.SMTPAuthenticationError(code, resp)
+    
+    async def send(self, sender: str, recipient: str, headers: bytes,
+                   attachment: EncodedAttachment):
+        """Run one transaction, streaming the shared body with flow control."""
+        code, resp = await self.command(f'MAIL FROM:<{sender}>')
+        if code != 250:
+            await self.command('RSET')
+            raise smtplib.SMTPSenderRefused(code, resp, sender)
+        code, resp = await self.command(f'RCPT TO:<{recipient}>')
+        if code not in (250, 251):
+            await self.command('RSET')
+            raise smtplib.SMTPRecipientsRefused({recipient: (code, resp)})
+        code, resp = await self.command('DATA')
+        if code != 354:
+            await self.command('RSET')
+            raise smtplib.SMTPDataError(code, resp)
+        self._writer.write(headers)
+        for block in attachment.iter_body():
+            self._writer.write(block)
+            await self._writer.drain()
+        self._writer.write(b'.\r\n')
+        code, resp = await self._reply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+    
+    async def command(self, line: str) -> Tuple[int, bytes]:
+        self._writer.write(line.encode() + b'\r\n')
+        return await self._reply()
+    
+    async def close(self, quit: bool = True):
+        """Say QUIT (best effort) and close the socket."""
+        if self._writer is None:
+            return
+        try:
+            if quit:
+                await self.command('QUIT')
+        except Exception:
+            pass
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+        self._reader = self._writer = None
+    
+    async def _ehlo(self):
+        code, resp = await self.command('EHLO localhost')
+        if code != 250:
+            code, resp = await self.command('HELO localhost')
+            if code != 250:
+                raise smtplib.SMTPHeloError(code, resp)
+    
+    async def _reply(self) -> Tuple[int, bytes]:
+        """Read a (possibly multi-line) reply and return its code and text."""
+        await self._writer.drain()
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self._reader.readline(), self.timeout)
+            if not line:
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            lines.append(line[4:].strip())
+            if line[3:4] != b'-':
+                return int(line[:3]), b'\n'.join(lines)
+
+async def send_bulk_async(emailer, sender: str, recipients: List[str], subject: str,
+                          report_path: str, password: str, max_connections: int = 4,
+                          retries: int = 3, backoff: float = 0.5, compression: str = None,
+                          compress_threshold: int = 1024 * 1024) -> Dict[str, Any]:
+    """Asyncio counterpart of `EmailAutomation.send_bulk`; returns the same summary.
+    
+    Each of up to `max_connections` tasks keeps one connection open and
+    takes the next recipient when its previous message is done, so sends
+    wait on the network without holding a thread.
+    """
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    attachment = await loop.run_in_executor(
+        None, EncodedAttachment, report_path, compression, compress_threshold)
+    todo = asyncio.Queue()
+    for recipient in recipients:
+        todo.put_nowait(recipient)
+    outcomes = {}
+    
+    async def worker():
+        connection = None
+        while not todo.empty():
+            recipient = todo.get_nowait()
+            try:
+                headers = attachment.headers(sender, recipient, subject)
+            except ValueError as e:
+                outcomes[recipient] = (0, str(e))
+                continue
+            for attempt in range(retries + 1):
+                try:
+                    if connection is None:
+                        connection = AsyncSMTPConnection(emailer.smtp_server, emailer.smtp_port,
+                                                         emailer.use_tls)
+                        try:
+                            await connection.connect(sender, password)
+                        except Exception:
+                            # A failed greeting, EHLO or AUTH leaves no usable session
+                            await connection.close(quit=False)
+                            connection = None
+                            raise
+                    await connection.send(sender, recipient, headers, attachment)
+                    outcomes[recipient] = (attempt + 1, None)
+                    break
+                except Exception as e:
+                    if connection is not None and not emailer._session_usable(e):
+                        await connection.close(quit=False)
+                        connection = None
+                    if emailer._is_permanent(e) or attempt == retries:
+                        outcomes[recipient] = (attempt + 1, str(e))
+                        break
+                    await asyncio.sleep(backoff * 2 ** attempt)
+        if connection is not None:
+            await connection.close()
+    
+    with attachment:
+        await asyncio.gather(*(worker() for _ in range(min(max_connections, len(recipients)))))
+    
+    return {
+        'sent': [r for r in recipients if outcomes[r][1] is None],
+        'failed': {r: outcomes[r][1] for r in recipients if outcomes[r][1] is not None},
+        'attempts': sum(attempts for attempts, _ in outcomes.values()),
+        'elapsed': time.perf_counter() - start
+    }
@@ -0,0 +1,149 @@
+# src/automation/batch_runner.py
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Union
+
+from ..data_processing import DataLoader, DataCleaner
+from ..analysis import AnalysisAccumulator
+from ..utlis.config import add_config_arguments, configure_from_args, get_config
+
+def resolve_inputs(source: Union[str, List[str]]) -> List[str]:
+    """Resolve a glob pattern, a manifest file (one path per line) or a list of paths."""
+    if not isinstance(source, str):
+        return list(source)
+    if os.path.isfile(source) and source.endswith(('.txt', '.manifest')):
+        base_dir = os.path.dirname(source)
+        with open(source, 'r') as f:
+            lines = [line.strip() for line in f]
+        return [os.path.join(base_dir, line) for line in lines
+                if line and not line.startswith('#')]
+    return sorted(glob.glob(source))
+
+def process_file(filepath: str, report_dir: str = None) -> AnalysisAccumulator:
+    """Run load -> clean -> analyze (-> report) for one file and return its partial aggregate."""
+    df = DataCleaner().clean_data(DataLoader().load_data(filepath))
+    accumulator = AnalysisAccumulator().update(df)
+    if report_dir is not None:
+        from .report_generator import ReportGenerator
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        ReportGenerator(df, accumulator.results(), output_dir=os.path.join(report_dir, name),
+                        max_workers=1).generate_report(os.path.join(report_dir, f"{name}_report.md"))
+    return accumulator
+
+def tree_reduce(partials: List[AnalysisAccumulator]) -> AnalysisAccumulator:
+    """Merge partial aggregates pairwise, keeping input order."""
+    if not partials:
+        return AnalysisAccumulator()
+    while len(partials) > 1:
+        merged = [partials[i].merge(partials[i + 1]) for i in range(0, len(partials) - 1, 2)]
+        if len(partials) % 2:
+            merged.append(partials[-1])
+        partials = merged
+    return partials[0]
+
+class BatchRunner:
+    """Fan the per-file pipeline out over a process pool.
+    
+    At most `max_in_flight` files are submitted at once so memory stays
+    bounded, a failing file is recorded without stopping the batch, and
+    the per-file partial aggregates are tree-reduced in input order. If a
+    worker process dies, the files in flight are recorded as failed and
+    the rest of the batch continues on a fresh pool.
+    """
+    
+    def __init__(self, max_workers: int = None, max_in_flight: int = None,
+                 report_dir: str = None):
+        pipeline = get_config().settings.pipeline
+        self.max_workers = max_workers or pipeline.max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or pipeline.max_in_flight or 2 * self.max_workers
+        self.report_dir = report_dir
+    
+    def run(self, source: Union[str, List[str]]) -> Dict[str, Any]:
+        """Process every input and return the combined analysis."""
+        paths = resolve_inputs(source)
+        if self.report_dir is not None:
+            os.makedirs(self.report_dir, exist_ok=True)
+        
+        partials, failed = {}, {}
+        pending = {}
+        pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            for index, path in enumerate(paths):
+                if len(pending) >= self.max_in_flight and self._collect(pending, partials, failed):
+                    pool = self._restart(pool, pending, partials, failed)
+                try:
+                    future = pool.submit(process_file, path, self.report_dir)
+                except BrokenProcessPool:
+                    pool = self._restart(pool, pending, partials, failed)
+                    future = pool.submit(process_file, path, self.report_dir)
+                pending[future] = (index, path)
+            while pending:
+                self._collect(pending, partials, failed)
+        finally:
+            pool.shutdown()
+        
+        ordered = [partials[index] for index in sorted(partials)]
+        accumulator = tree_reduce(ordered)
+        return {
+            'analysis': accumulator.results(),
+            'accumulator': accumulator,
+            'succeeded': [paths[index] for index in sorted(partials)],
+            'failed': failed
+        }
+    
+    def _collect(self, pending: Dict, partials: Dict[int, AnalysisAccumulator],
+                 failed: Dict[str, str]) -> bool:
+        """Wait for at least one in-flight file and record its outcome; return whether the pool broke."""
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        broken = False
+        for future in done:
+            index, path = pending.pop(future)
+            try:
+                partials[index] = future.result()
+            except BrokenProcessPool as e:
+                broken = True
+                failed[path] = f"Worker process died: {str(e)}"
+            except Exception as e:
+                failed[path] = str(e)
+        return broken
+    
+    def _restart(self, pool: ProcessPoolExecutor, pending: Dict,
+                 partials: Dict[int, AnalysisAccumulator],
+                 failed: Dict[str, str]) -> ProcessPoolExecutor:
+        """Record what is left of a broken pool's files and start a new pool."""
+        while pending:
+            self._collect(pending, partials, failed)
+        pool.shutdown()
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+def main(argv: List[str] = None):
+    """Command-line entry point for batch runs."""
+    parser = argparse.ArgumentParser(description="Run the financial pipeline over many files.")
+    parser.add_argument('source', help="Glob pattern or manifest file (one path per line)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Process pool size (default: pipeline.max_workers)")
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help="Maximum number of files submitted at once")
+    parser.add_argument('--report-dir', default=None, help="Write a report per file here")
+    parser.add_argument('--output', default='reports/batch_analysis.json',
+                        help="Where to save the combined analysis")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    configure_from_args(args)
+    from ..utlis.helpers import save_to_json, setup_logging
+    setup_logging()
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    result = BatchRunner(args.workers, args.max_in_flight, args.report_dir).run(args.source)
+    save_to_json({
+        'analysis': result['analysis'],
+        'succeeded': result['succeeded'],
+        'failed': result['failed']
+    }, args.output)
+    return 1 if result['failed'] else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+# src/automation/charts.py
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple
+import hashlib
+import json
+import os
+import tempfile
+from ..utlis.instrumentation import stage
+
+CACHE_MANIFEST = '.chart_cache.json'
+
+def render_trends(path: str, months: List[str], revenue: List[float], profit: List[float]):
+    """Render monthly revenue and profit trends."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    import pandas as pd
+    
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    dates = pd.to_datetime(months)
+    ax.plot(dates, revenue, label='Revenue')
+    ax.plot(dates, profit, label='Profit')
+    ax.set_title('Monthly Revenue and Profit Trends')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Amount ($)')
+    ax.legend()
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+    fig.savefig(path)
+
+def render_category_performance(path: str, categories: List[str], profit: List[float]):
+    """Render total profit by category."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    colors = [f'C{i % 10}' for i in range(len(categories))]
+    ax.bar(categories, profit, color=colors)
+    ax.set_title('Profit by Category')
+    ax.set_xlabel('Category')
+    ax.set_ylabel('Total Profit ($)')
+    fig.tight_layout()
+    fig.savefig(path)
+
+RENDERERS = {
+    'trends': render_trends,
+    'category_performance': render_category_performance
+}
+
+def _render(name: str, path: str, series: Dict[str, Any]):
+    with stage(f'report.chart.{name}'):
+        RENDERERS[name](path, **series)
+
+def chart_series(analysis_results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Extract the input series of each chart from the analysis results.
+    
+    Charts whose inputs are missing from the results are left out.
+    """
+    charts = {}
+    trends = analysis_results.get('trend_analysis', {})
+    if trends.get('monthly_revenue') and trends.get('monthly_profit'):
+        charts['trends'] = {
+            'months': [str(month) for month in trends['monthly_revenue']],
+            'revenue': [float(value) for value in trends['monthly_revenue'].values()],
+            'profit': [float(value) for value in trends['monthly_profit'].values()]
+        }
+    categories = analysis_results.get('category_analysis', {})
+    if categories:
+        charts['category_performance'] = {
+            'categories': [str(category) for category in categories],
+            'profit': [float(metrics['profit']) for metrics in categories.values()]
+        }
+    return charts
+
+class ChartRenderer:
+    """Render report charts concurrently, skipping charts whose inputs are unchanged.
+    
+    Charts are drawn with the object-oriented Figure API on the Agg canvas,
+    so no pyplot global state is shared between workers. A manifest in the
+    output directory records a content hash of each chart's input series.
+    """
+    
+    def __init__(self, output_dir: str = 'reports', max_workers: int = 2,
+                 executor: str = 'thread'):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unsupported executor: {executor}")
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.executor = executor
+    
+    def render(self, analysis_results: Dict[str, Any]) -> Dict[str, str]:
+        """Render all charts and return their paths by chart name."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        paths, stale = {}, []
+        for name, series in chart_series(analysis_results).items():
+            path = os.path.join(self.output_dir, f"{name}.png")
+            digest = self._hash(name, series)
+            paths[name] = path
+            if manifest.get(name) != digest or not os.path.exists(path):
+                stale.append((name, path, series, digest))
+        
+        if stale:
+            self._render_all(stale)
+            manifest.update({name: digest for name, _, _, digest in stale})
+            self._save_manifest(manifest)
+        return paths
+    
+    def _render_all(self, stale: List[Tuple[str, str, Dict[str, Any], str]]):
+        if len(stale) == 1 or self.max_workers <= 1:
+            for name, path, series, _ in stale:
+                _render(name, path, series)
+            return
+        pool_class = ThreadPoolExecutor if self.executor == 'thread' else ProcessPoolExecutor
+        with pool_class(max_workers=min(self.max_workers, len(stale))) as pool:
+            futures = [pool.submit(_render, name, path, series) for name, path, series, _ in stale]
+            for future in futures:
+                future.result()
+    
+    def _hash(self, name: str, series: Dict[str, Any]) -> str:
+        payload = json.dumps({'chart': name, 'series': series}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.output_dir, CACHE_MANIFEST), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+    
+    def _save_manifest(self, manifest: Dict[str, str]):
+        # Written to a private temporary file and renamed, so readers never see a partial manifest
+        fd, tmp_path = tempfile.mkstemp(prefix=CACHE_MANIFEST, suffix='.tmp', dir=self.output_dir)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, os.path.join(self.output_dir, CACHE_MANIFEST))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
@@ -0,0 +1,374 @@
+# src/automation/email_automation.py
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
+from email.header import Header
+from email.message import Message
+from email.policy import compat32
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Iterator, BinaryIO
+import base64
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+import zlib
+from ..utlis.instrumentation import stage
+
+BODY = "Please find attached the latest financial analysis report."
+# 57 raw bytes encode to one 76-character base64 line
+BASE64_LINE_BYTES = 57
+BLOCK_SIZE = BASE64_LINE_BYTES * 1024
+ATTACHMENT_SUBTYPES = {None: 'txt', 'gzip': 'gzip', 'zip': 'zip'}
+ATTACHMENT_SUFFIXES = {None: '', 'gzip': '.gz', 'zip': '.zip'}
+
+def check_header(name: str, value: str) -> str:
+    """Reject header values with line breaks, which would inject extra headers."""
+    if '\r' in value or '\n' in value:
+        raise ValueError(f"{name} must not contain line breaks")
+    return value
+
+def disposition_header(filename: str) -> bytes:
+    """Content-Disposition header for an attachment, quoted (or RFC 2231-encoded) as by `add_header`."""
+    part = Message()
+    part.add_header('Content-Disposition', 'attachment', filename=check_header('filename', filename))
+    # Drop the blank line that ends the header block
+    return part.as_bytes(policy=compat32.clone(linesep='\r\n'))[:-2]
+
+class EncodedAttachment:
+    """MIME body with the report attachment, encoded once per distribution run.
+    
+    The report is read and base64-encoded in fixed-size blocks (optionally
+    gzip- or zip-compressed when larger than `compress_threshold`). Bodies
+    up to `max_memory` bytes are kept in memory, larger ones in a temporary
+    file, and every message streams the same encoded body.
+    """
+    
+    def __init__(self, report_path: str, compression: str = None,
+                 compress_threshold: int = 1024 * 1024, max_memory: int = 8 * 1024 * 1024):
+        if compression not in ATTACHMENT_SUBTYPES:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if os.path.getsize(report_path) <= compress_threshold:
+            compression = None
+        self.compression = compression
+        self.filename = os.path.basename(report_path) + ATTACHMENT_SUFFIXES[compression]
+        self.boundary = '===============' + uuid.uuid4().hex
+        self._data = None
+        self._path = None
+        
+        with tempfile.SpooledTemporaryFile(max_size=max_memory) as spool:
+            self._write_body(report_path, spool)
+            self.size = spool.tell()
+            spool.seek(0)
+            if self.size <= max_memory:
+                self._data = spool.read()
+            else:
+                fd, self._path = tempfile.mkstemp(suffix='.mime')
+                with os.fdopen(fd, 'wb') as f:
+                    shutil.copyfileobj(spool, f)
+    
+    def headers(self, sender: str, recipient: str, subject: str) -> bytes:
+        """Top-level headers for one recipient."""
+        check_header('From', sender)
+        check_header('To', recipient)
+        check_header('Subject', subject)
+        if not subject.isascii():
+            subject = Header(subject, 'utf-8').encode()
+        return (f"From: {sender}\r\nTo: {recipient}\r\nSubject: {subject}\r\n"
+                f"MIME-Version: 1.0\r\n"
+                f"Content-Type: multipart/mixed; boundary=\"{self.boundary}\"\r\n\r\n").encode()
+    
+    def iter_body(self) -> Iterator[bytes]:
+        """Yield the encoded body in blocks; safe to call from several threads."""
+        if self._data is not None:
+            view = memoryview(self._data)
+            for start in range(0, len(view), BLOCK_SIZE):
+                yield view[start:start + BLOCK_SIZE]
+        else:
+            with open(self._path, 'rb') as f:
+                yield from iter(lambda: f.read(BLOCK_SIZE), b'')
+    
+    def close(self):
+        """Remove the spilled body file, if any."""
+        if self._path is not None and os.path.exists(self._path):
+            os.remove(self._path)
+        self._path = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _write_body(self, report_path: str, out: BinaryIO):
+        boundary = self.boundary
+        out.write((f"--{boundary}\r\n"
+                   f"Content-Type: text/plain; charset=\"us-ascii\"\r\n"
+                   f"MIME-Version: 1.0\r\nContent-Transfer-Encoding: 7bit\r\n\r\n"
+                   f"{BODY}\r\n"
+                   f"--{boundary}\r\n"
+                   f"Content-Type: application/{ATTACHMENT_SUBTYPES[self.compression]}\r\n"
+                   f"MIME-Version: 1.0\r\nContent-Transfer-Encoding: base64\r\n").encode())
+        out.write(disposition_header(self.filename) + b'\r\n')
+        
+        pending = b''
+        for block in self._iter_payload(report_path):
+            pending += block
+            whole = len(pending) - len(pending) % BASE64_LINE_BYTES
+            self._write_base64(pending[:whole], out)
+            pending = pending[whole:]
+        self._write_base64(pending, out)
+        out.write(f"--{boundary}--\r\n".encode())
+    
+    def _iter_payload(self, report_path: str) -> Iterator[bytes]:
+        """Yield the attachment bytes in blocks, compressed if requested."""
+        with open(report_path, 'rb') as src:
+            if self.compression == 'gzip':
+                compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+                for block in iter(lambda: src.read(BLOCK_SIZE), b''):
+                    yield compressor.compress(block)
+                yield compressor.flush()
+            elif self.compression == 'zip':
+                with tempfile.TemporaryFile() as archive:
+                    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+                        with zf.open(os.path.basename(report_path), 'w') as dst:
+                            shutil.copyfileobj(src, dst, BLOCK_SIZE)
+                    archive.seek(0)
+                    yield from iter(lambda: archive.read(BLOCK_SIZE), b'')
+            else:
+                yield from iter(lambda: src.read(BLOCK_SIZE), b'')
+    
+    @staticmethod
+    def _write_base64(data: bytes, out: BinaryIO):
+        for start in range(0, len(data), BASE64_LINE_BYTES):
+            out.write(base64.b64encode(data[start:start + BASE64_LINE_BYTES]) + b'\r\n')
+
+class SMTPConnectionPool:
+    """Pool of reusable, authenticated SMTP connections.
+    
+    Connections are opened lazily (connect, STARTTLS, login) up to
+    `max_connections` and handed back after each message, so a bulk send
+    pays the handshake once per connection rather than once per message.
+    """
+    
+    def __init__(self, smtp_server: str, smtp_port: int, sender: str, password: str,
+                 max_connections: int = 4, use_tls: bool = True, timeout: float = 30):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.sender = sender
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+    
+    def acquire(self) -> smtplib.SMTP:
+        """Take an idle connection, opening a new one if none is available."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, server: smtplib.SMTP, healthy: bool = True):
+        """Return a connection to the pool, or close it if it is broken."""
+        if healthy:
+            self._idle.put(server)
+        else:
+            self._close(server)
+        self._slots.release()
+    
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.password:
+                server.login(self.sender, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+    
+    def _close(self, server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class EmailAutomation:
+    def __init__(self, smtp_server: str, smtp_port: int, use_tls: bool = True):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.use_tls = use_tls
+    
+    def send_report(self, sender: str, recipient: str, subject: str,
+                   report_path: str, password: str):
+        """Send financial report via email."""
+        with open(report_path, 'rb') as f:
+            msg = self._build_message(sender, recipient, subject, f.read(),
+                                      os.path.basename(report_path))
+        
+        # Send email
+        try:
+            with stage('email.send', rows=1), smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                if self.use_tls:
+                    server.starttls()
+                server.login(sender, password)
+                server.send_message(msg)
+            return True
+        except Exception as e:
+            print(f"Error sending email: {str(e)}")
+            return False
+    
+    def send_bulk(self, sender: str, recipients: List[str], subject: str,
+                  report_path: str, password: str, max_workers: int = 4,
+                  retries: int = 3, backoff: float = 0.5, compression: str = None,
+                  compress_threshold: int = 1024 * 1024) -> Dict[str, Any]:
+        """Send a report to many recipients over a pool of persistent connections.
+        
+        The attachment is encoded once (see `EncodedAttachment`) and streamed
+        to every recipient. Up to `max_workers` messages are in flight at once,
+        each on its own pooled connection. Transient failures are retried with
+        exponential backoff; permanent (5xx) rejections are not. Returns a
+        summary with the sent and failed recipients.
+        """
+        start = time.perf_counter()
+        check_header('From', sender)
+        check_header('Subject', subject)
+        with stage('email.encode_attachment'):
+            attachment = EncodedAttachment(report_path, compression, compress_threshold)
+        pool = SMTPConnectionPool(self.smtp_server, self.smtp_port, sender, password,
+                                  max_connections=max_workers, use_tls=self.use_tls)
+        with stage('email.bulk_send', rows=len(recipients)), attachment, pool, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = list(executor.map(
+                lambda recipient: self._send_with_retry(
+                    pool, sender, recipient, subject, attachment, retries, backoff),
+                recipients))
+        
+        failed = {recipient: error for recipient, _, error in outcomes if error is not None}
+        return {
+            'sent': [recipient for recipient, _, error in outcomes if error is None],
+            'failed': failed,
+            'attempts': sum(attempts for _, attempts, _ in outcomes),
+            'elapsed': time.perf_counter() - start
+        }
+    
+    async def send_bulk_async(self, sender: str, recipients: List[str], subject: str,
+                              report_path: str, password: str, **kwargs) -> Dict[str, Any]:
+        """Coroutine version of `send_bulk`; see `async_smtp.send_bulk_async`."""
+        from .async_smtp import send_bulk_async
+        return await send_bulk_async(self, sender, recipients, subject, report_path,
+                                     password, **kwargs)
+
+    def _send_with_retry(self, pool: SMTPConnectionPool, sender: str, recipient: str,
+                         subject: str, attachment: EncodedAttachment,
+                         retries: int, backoff: float):
+        """Send one message, retrying transient failures. Returns (recipient, attempts, error)."""
+        try:
+            headers = attachment.headers(sender, recipient, subject)
+        except ValueError as e:
+            return recipient, 0, str(e)
+        for attempt in range(retries + 1):
+            server = None
+            try:
+                server = pool.acquire()
+                with stage('email.message', rows=1):
+                    self._stream_message(server, sender, recipient, headers, attachment)
+                pool.release(server)
+                return recipient, attempt + 1, None
+            except Exception as e:
+                if server is not None:
+                    pool.release(server, healthy=self._session_usable(e))
+                if self._is_permanent(e) or attempt == retries:
+                    return recipient, attempt + 1, str(e)
+                time.sleep(backoff * 2 ** attempt)
+    
+    def _stream_message(self, server: smtplib.SMTP, sender: str, recipient: str,
+                        headers: bytes, attachment: EncodedAttachment):
+        """Run the SMTP transaction, streaming the shared body block by block.
+        
+        The body needs no dot-stuffing: its only lines are MIME headers,
+        boundaries, the fixed body text and base64.
+        """
+        server.ehlo_or_helo_if_needed()
+        code, resp = server.mail(sender)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, sender)
+        code, resp = server.rcpt(recipient)
+        if code not in (250, 251):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused({recipient: (code, resp)})
+        code, resp = server.docmd('DATA')
+        if code != 354:
+            server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+        server.send(headers)
+        for block in attachment.iter_body():
+            server.send(block)
+        server.send(b'.\r\n')
+        code, resp = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+    
+    def _is_permanent(self, error: Exception) -> bool:
+        """Whether an SMTP error is a permanent (5xx) rejection."""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(code >= 500 for code, _ in error.recipients.values())
+        return getattr(error, 'smtp_code', 0) >= 500
+    
+    def _session_usable(self, error: Exception) -> bool:
+        """Whether a connection can carry the next message after `error`.
+        
+        Only sender and recipient refusals, which are answered before DATA and
+        followed by RSET, leave the session in a known state; a 421 reply
+        means the server is closing it.
+        """
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(code != 421 for code, _ in error.recipients.values())
+        return isinstance(error, smtplib.SMTPSenderRefused) and error.smtp_code != 421
+    
+    def _build_message(self, sender: str, recipient: str, subject: str,
+                       attachment: bytes, filename: str) -> MIMEMultipart:
+        """Build the report email for one recipient."""
+        # Create message
+        msg = MIMEMultipart()
+        msg['From'] = check_header('From', sender)
+        msg['To'] = check_header('To', recipient)
+        msg['Subject'] = check_header('Subject', subject)
+        
+        # Add body
+        msg.attach(MIMEText(BODY, 'plain'))
+        
+        # Attach report
+        report_attachment = MIMEApplication(attachment, _subtype='txt')
+        report_attachment.add_header('Content-Disposition', 'attachment',
+                                  filename=filename)
+        msg.attach(report_attachment)
+        return msg
@@ -0,0 +1,320 @@
+# src/automation/report_engine.py
+import hashlib
+import json
+import os
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html import escape
+from typing import Dict, Any, List, Iterator, Tuple, Union, IO
+
+from ..utlis.instrumentation import stage
+
+FORMATS = {'.md': 'markdown', '.markdown': 'markdown', '.html': 'html', '.htm': 'html', '.pdf': 'pdf'}
+EXTENSIONS = {'markdown': '.md', 'html': '.html', 'pdf': '.pdf'}
+CACHE_VERSION = 1
+
+# str.format templates; money and percentages are formatted by their spec
+TEMPLATES = {
+    'markdown': {
+        'header': "# Financial Analysis Report\nGenerated on: {report_date}\n",
+        'summary': ("\n## Summary Metrics\n"
+                    "- Total Revenue: ${total_revenue:,.2f}\n"
+                    "- Total Profit: ${total_profit:,.2f}\n"
+                    "- Average Profit Margin: {average_profit_margin:.2f}%\n"
+                    "- Revenue Growth: {revenue_growth}%\n"),
+        'trends': ("\n## Trend Analysis\n"
+                   "- Revenue Trend: {revenue_trend}\n"
+                   "- Profit Trend: {profit_trend}\n"),
+        'categories': "\n## Category Performance\n",
+        'category': ("\n### {category}\n"
+                     "- Revenue: ${revenue:,.2f}\n"
+                     "- Profit: ${profit:,.2f}\n"
+                     "- Average Profit Margin: {profit_margin:.2f}%\n"),
+        'chart': "\n![{title}]({path})\n",
+        'footer': ""
+    },
+    'html': {
+        'header': ("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                   "<title>Financial Analysis Report</title>\n</head>\n<body>\n"
+                   "<h1>Financial Analysis Report</h1>\n<p>Generated on: {report_date}</p>\n"),
+        'summary': ("<h2>Summary Metrics</h2>\n<ul>\n"
+                    "<li>Total Revenue: ${total_revenue:,.2f}</li>\n"
+                    "<li>Total Profit: ${total_profit:,.2f}</li>\n"
+                    "<li>Average Profit Margin: {average_profit_margin:.2f}%</li>\n"
+                    "<li>Revenue Growth: {revenue_growth}%</li>\n</ul>\n"),
+        'trends': ("<h2>Trend Analysis</h2>\n<ul>\n"
+                   "<li>Revenue Trend: {revenue_trend}</li>\n"
+                   "<li>Profit Trend: {profit_trend}</li>\n</ul>\n"),
+        'categories': "<h2>Category Performance</h2>\n",
+        'category': ("<h3>{category}</h3>\n<ul>\n"
+                     "<li>Revenue: ${revenue:,.2f}</li>\n"
+                     "<li>Profit: ${profit:,.2f}</li>\n"
+                     "<li>Average Profit Margin: {profit_margin:.2f}%</li>\n</ul>\n"),
+        'chart': "<img src=\"{path}\" alt=\"{title}\">\n",
+        'footer': "</body>\n</html>\n"
+    }
+}
+
+def report_format(path: str) -> str:
+    """Output format for a report path, from its extension (Markdown by default)."""
+    return FORMATS.get(os.path.splitext(path)[1].lower(), 'markdown')
+
+def report_sections(analysis_results: Dict[str, Any], report_date: str,
+                    charts: Dict[str, str] = None) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Yield (key, template, values) for each section of a report, in order.
+    
+    The values are the raw analysis values a section shows, so two runs
+    render a section identically exactly when its values are equal.
+    """
+    summary = analysis_results['summary_metrics']
+    trends = analysis_results['trend_analysis']
+    yield 'header', 'header', {'report_date': report_date}
+    yield 'summary', 'summary', {
+        'total_revenue': summary['total_revenue'],
+        'total_profit': summary['total_profit'],
+        'average_profit_margin': summary['average_profit_margin'],
+        'revenue_growth': summary['revenue_growth']
+    }
+    yield 'trends', 'trends', {'revenue_trend': trends['revenue_trend'],
+                               'profit_trend': trends['profit_trend']}
+    yield 'categories', 'categories', {}
+    for category, metrics in analysis_results['category_analysis'].items():
+        yield f'category:{category}', 'category', {
+            'category': category,
+            'revenue': metrics['revenue'],
+            'profit': metrics['profit'],
+            'profit_margin': metrics['profit_margin']
+        }
+    for name, path in (charts or {}).items():
+        yield f'chart:{name}', 'chart', {'title': name.replace('_', ' ').title(), 'path': path}
+    yield 'footer', 'footer', {}
+
+class PDFWriter:
+    """Streams a text-only PDF (Helvetica on US Letter) to a binary file.
+    
+    Each page is written as soon as it is full, so memory holds one page of
+    text; the page tree and cross-reference table follow at `close`.
+    """
+    WIDTH, HEIGHT, MARGIN = 612, 792, 54
+    STYLES = {'h1': (18, 'F2'), 'h2': (14, 'F2'), 'h3': (12, 'F2'), 'text': (10, 'F1')}
+    # Objects 1-4 are the catalog, page tree and the two fonts
+    RESERVED = 4
+    
+    def __init__(self, out: IO[bytes]):
+        self.out = out
+        self.position = 0
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = self.RESERVED + 1
+        self._ops = []
+        self._y = self.HEIGHT - self.MARGIN
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    
+    def add_line(self, style: str, text: str):
+        """Add a line of text, wrapping it to the page width and starting pages as needed."""
+        size, font = self.STYLES[style]
+        width = int((self.WIDTH - 2 * self.MARGIN) / (size * 0.5))
+        for line in (textwrap.wrap(text, width) or ['']) if len(text) > width else [text]:
+            if self._y - size * 1.4 < self.MARGIN:
+                self._flush_page()
+            self._y -= size * 1.4
+            escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            self._ops.append(f"BT /{font} {size} Tf {self.MARGIN} {self._y:.1f} Td ({escaped}) Tj ET")
+    
+    def close(self):
+        if self._ops or not self.page_ids:
+            self._flush_page()
+        kids = ' '.join(f'{page} 0 R' for page in self.page_ids)
+        self._object(b'<< /Type /Catalog /Pages 2 0 R >>', 1)
+        self._object(f'<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>'.encode(), 2)
+        self._object(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>', 3)
+        self._object(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>', 4)
+        xref = self.position
+        rows = ''.join(f'{self.offsets[i]:010d} 00000 n \n' for i in range(1, self.next_id))
+        self._write((f'xref\n0 {self.next_id}\n0000000000 65535 f \n{rows}'
+                     f'trailer\n<< /Size {self.next_id} /Root 1 0 R >>\n'
+                     f'startxref\n{xref}\n%%EOF\n').encode())
+    
+    def _flush_page(self):
+        content = '\n'.join(self._ops).encode('latin-1', 'replace')
+        content_id = self._object(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content))
+        page_id = self._object((f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.WIDTH} {self.HEIGHT}] '
+                                f'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> '
+                                f'/Contents {content_id} 0 R >>').encode())
+        self.page_ids.append(page_id)
+        self._ops = []
+        self._y = self.HEIGHT - self.MARGIN
+    
+    def _object(self, body: bytes, object_id: int = None) -> int:
+        if object_id is None:
+            object_id, self.next_id = self.next_id, self.next_id + 1
+        self.offsets[object_id] = self.position
+        self._write(b'%d 0 obj\n%s\nendobj\n' % (object_id, body))
+        return object_id
+    
+    def _write(self, data: bytes):
+        self.out.write(data)
+        self.position += len(data)
+
+def _pdf_lines(markdown: str) -> List[Tuple[str, str]]:
+    """(style, text) lines of a Markdown fragment, for the PDF writer."""
+    lines = []
+    for line in markdown.splitlines():
+        if line.startswith('#'):
+            level = len(line) - len(line.lstrip('#'))
+            lines.append((f'h{min(level, 3)}', line[level:].strip()))
+        elif line.startswith('!['):
+            title, path = line[2:-1].split('](', 1)
+            lines.append(('text', f"{title} chart: {path}"))
+        elif line:
+            lines.append(('text', line))
+    return lines
+
+class ReportEngine:
+    """Template-based report rendering to Markdown, HTML or PDF.
+    
+    A report is a sequence of sections, each rendered from its template and
+    written to the output as soon as it is ready. When rendering to a file,
+    a JSON sidecar keeps every section's rendered fragment and a digest of
+    its values; the next render re-renders only sections whose digest
+    changed and skips the write entirely when none did and the file is
+    untouched.
+    """
+    
+    def __init__(self, format: str = 'markdown', templates: Dict[str, str] = None):
+        if format not in EXTENSIONS:
+            raise ValueError(f"Unsupported report format: {format}")
+        self.format = format
+        # PDF is laid out from the Markdown fragments
+        self.templates = templates or TEMPLATES['html' if format == 'html' else 'markdown']
+    
+    def render(self, analysis_results: Dict[str, Any], output: Union[str, IO],
+               charts: Dict[str, str] = None, report_date: str = None) -> Dict[str, Any]:
+        """Render a report to a path or an open file (binary for PDF); return section counts."""
+        report_date = report_date or datetime.now().strftime('%Y-%m-%d')
+        if charts and isinstance(output, str):
+            base = os.path.dirname(os.path.abspath(output))
+            charts = {name: os.path.relpath(path, base) for name, path in charts.items()}
+        sections = report_sections(analysis_results, report_date, charts)
+        if not isinstance(output, str):
+            fragments = (self._render_section(template, values) for _, template, values in sections)
+            return {'sections': self._write(fragments, output), 'rendered': None, 'written': True}
+        
+        cache_path = os.path.join(os.path.dirname(output) or '.',
+                                  f".{os.path.basename(output)}.sections.json")
+        cache = self._load_cache(cache_path)
+        cached = cache.get('sections', {})
+        entries, rendered = [], 0
+        for key, template, values in sections:
+            # repr round-trips floats and is stable for NaN, which never equals itself,
+            # so no number is formatted for an unchanged section
+            digest = hashlib.blake2b(repr(tuple(values.values())).encode(),
+                                     digest_size=16).hexdigest()
+            if key in cached and cached[key][0] == digest:
+                entries.append((key, cached[key]))
+            else:
+                entries.append((key, (digest, self._render_section(template, values))))
+                rendered += 1
+        
+        stat = os.stat(output) if os.path.exists(output) else None
+        unchanged = (rendered == 0 and len(entries) == len(cached)
+                     and [key for key, _ in entries] == list(cached)
+                     and stat is not None and (stat.st_size, stat.st_mtime_ns) == cache.get('output'))
+        if not unchanged:
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+            mode, encoding = ('wb', None) if self.format == 'pdf' else ('w', 'utf-8')
+            with open(output, mode, encoding=encoding) as f:
+                self._write((fragment for _, (_, fragment) in entries), f)
+            stat = os.stat(output)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'format': self.format,
+                           'output': [stat.st_size, stat.st_mtime_ns],
+                           'sections': [[key, digest, fragment]
+                                        for key, (digest, fragment) in entries]}, f)
+        return {'sections': len(entries), 'rendered': rendered, 'written': not unchanged}
+    
+    def _render_section(self, template: str, values: Dict[str, Any]) -> str:
+        if self.format == 'html':
+            values = {name: escape(value) if isinstance(value, str) else value
+                      for name, value in values.items()}
+        return self.templates[template].format_map(values)
+    
+    def _write(self, fragments: Iterator, out: IO) -> int:
+        count = 0
+        if self.format == 'pdf':
+            writer = PDFWriter(out)
+            for count, fragment in enumerate(fragments, 1):
+                for style, text in _pdf_lines(fragment):
+                    writer.add_line(style, text)
+            writer.close()
+            return count
+        for count, fragment in enumerate(fragments, 1):
+            out.write(fragment)
+        return count
+    
+    def _load_cache(self, cache_path: str) -> Dict[str, Any]:
+        """The sidecar written by `render`, or {} if it is missing, stale or malformed."""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache['version'] != CACHE_VERSION or cache['format'] != self.format:
+                return {}
+            sections = {}
+            for key, digest, fragment in cache['sections']:
+                if not all(isinstance(item, str) for item in (key, digest, fragment)):
+                    return {}
+                sections[key] = (digest, fragment)
+            return {'output': tuple(cache['output']), 'sections': sections}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+def render_entity_report(name: str, analysis_results: Dict[str, Any], output_dir: str,
+                         format: str = 'markdown', charts: bool = False,
+                         report_date: str = None) -> Dict[str, Any]:
+    """Render one entity's report (and charts, if asked) into `output_dir`."""
+    path = os.path.join(output_dir, f"{name}_report{EXTENSIONS[format]}")
+    chart_paths = None
+    if charts:
+        from .charts import ChartRenderer
+        chart_paths = ChartRenderer(os.path.join(output_dir, 'charts', name),
+                                    max_workers=1).render(analysis_results)
+    result = ReportEngine(format).render(analysis_results, path, chart_paths, report_date)
+    return {'path': path, **result}
+
+def _render_entity(args) -> Tuple[str, Dict[str, Any], str]:
+    name = args[0]
+    try:
+        return name, render_entity_report(*args), None
+    except Exception as e:
+        return name, None, str(e)
+
+def render_reports(entities: Dict[str, Dict[str, Any]], output_dir: str, format: str = 'markdown',
+                   max_workers: int = None, charts: bool = False,
+                   report_date: str = None) -> Dict[str, Any]:
+    """Render one report per entity, spread over a process pool.
+    
+    Entities are handed to the workers in chunks so thousands of small
+    reports do not pay one round trip each. A failing entity is recorded
+    without stopping the rest.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    report_date = report_date or datetime.now().strftime('%Y-%m-%d')
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(name, analysis, output_dir, format, charts, report_date)
+             for name, analysis in entities.items()]
+    with stage('report.entities', rows=len(tasks)):
+        if max_workers == 1 or len(tasks) < 2:
+            outcomes = list(map(_render_entity, tasks))
+        else:
+            chunksize = max(1, len(tasks) // (4 * max_workers))
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                outcomes = list(pool.map(_render_entity, tasks, chunksize=chunksize))
+    
+    reports = {name: result for name, result, error in outcomes if error is None}
+    return {
+        'reports': {name: result['path'] for name, result in reports.items()},
+        'failed': {name: error for name, _, error in outcomes if error is not None},
+        'sections_rendered': sum(result['rendered'] for result in reports.values()),
+        'sections_reused': sum(result['sections'] - result['rendered'] for result in reports.values())
+    }
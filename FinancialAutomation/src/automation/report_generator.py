@@ -0,0 +1,53 @@
+# src/automation/report_generator.py
+import pandas as pd
+from typing import Dict, Any
+import io
+from datetime import datetime
+from .charts import ChartRenderer
+from .report_engine import ReportEngine, report_format
+from ..utlis.config import get_config
+from ..utlis.instrumentation import stage
+
+class ReportGenerator:
+    def __init__(self, data: pd.DataFrame, analysis_results: Dict[str, Any],
+                 output_dir: str = None, max_workers: int = None):
+        reporting = get_config().settings.reporting
+        self.data = data
+        self.analysis_results = analysis_results
+        self.report_date = datetime.now().strftime('%Y-%m-%d')
+        self.chart_renderer = ChartRenderer(output_dir or reporting.charts_dir,
+                                            max_workers=max_workers or reporting.chart_workers)
+        
+    def generate_report(self, output_path: str) -> Dict[str, Any]:
+        """Generate comprehensive financial report with visualizations.
+        
+        The format (Markdown, HTML or PDF) follows the extension of
+        `output_path`; see `ReportEngine` for section-level re-rendering.
+        Charts are linked from HTML and PDF reports; Markdown keeps its
+        original text-only layout.
+        """
+        # Create visualizations
+        with stage('report.charts'):
+            charts = self._create_visualizations()
+        
+        # Render and stream the report sections
+        with stage('report.content'):
+            format = report_format(output_path)
+            return ReportEngine(format).render(self.analysis_results, output_path,
+                                               None if format == 'markdown' else charts,
+                                               self.report_date)
+    
+    def _create_visualizations(self) -> Dict[str, str]:
+        """Create financial visualizations from the analysis results."""
+        return self.chart_renderer.render(self.analysis_results)
+    
+    def _generate_report_content(self) -> str:
+        """Generate the report content in Markdown format."""
+        buffer = io.StringIO()
+        ReportEngine('markdown').render(self.analysis_results, buffer, report_date=self.report_date)
+        return buffer.getvalue()
+    
+    def _save_report(self, content: str, output_path: str):
+        """Save the report to file."""
+        with open(output_path, 'w') as f:
+            f.write(content)
@@ -0,0 +1,342 @@
+# src/automation/scheduler.py
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+from ..utlis.instrumentation import stage
+
+logger = logging.getLogger(__name__)
+
+STAGES = ['load', 'clean', 'analyze', 'render', 'send']
+
+def file_digest(filepath: str) -> str:
+    """SHA-256 of a file's contents, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class PipelineJob:
+    """The load -> clean -> analyze -> render -> send pipeline for one input file.
+    
+    The job keeps its last cleaned frame, analysis and digests in memory and
+    re-runs only the stages whose inputs changed: load, clean and analyze
+    when the input's contents or the `data`/`analysis` settings of the
+    process-wide config change, render when the analysis differs from
+    the one last rendered, and send when the report differs from the one last
+    sent. A touched but unchanged file costs one hash; an unchanged size and
+    mtime cost one `os.stat` per file.
+    """
+    
+    def __init__(self, input_path: str, report_path: str, charts_dir: str = None,
+                 cleaner=None, send: Callable[[str], bool] = None, name: str = None):
+        self.input_path = input_path
+        self.report_path = report_path
+        self.charts_dir = charts_dir or os.path.join(os.path.dirname(report_path) or '.', 'charts')
+        self.cleaner = cleaner
+        self.send = send
+        self.name = name or input_path
+        self.data = None
+        self.analysis = None
+        self._stat = None
+        self._input_digest = None
+        self._analysis_digest = None
+        self._rendered_digest = None
+        self._sent_digest = None
+        self._sent_stat = None
+        self._analysis_settings = None
+    
+    def reconfigure(self, report_path: str, charts_dir: str, send: Callable[[str], bool] = None):
+        """Point the job at new report paths and send stage; a moved report is rendered again."""
+        if (report_path, charts_dir) != (self.report_path, self.charts_dir):
+            self._rendered_digest = None
+        self.report_path, self.charts_dir, self.send = report_path, charts_dir, send
+    
+    def needs_run(self) -> bool:
+        """Cheap check for a change in the input, a missing or unrendered report or an unsent one."""
+        try:
+            stat = os.stat(self.input_path)
+        except FileNotFoundError:
+            return False
+        if (stat.st_size, stat.st_mtime_ns) != self._stat:
+            return True
+        if _analysis_settings() != self._analysis_settings:
+            return True
+        # A render that failed after a new analysis is retried without an input change
+        if (self._rendered_digest is None or self._rendered_digest != self._analysis_digest
+                or not os.path.exists(self.report_path)):
+            return True
+        return self.send is not None and self._sent_stat != self._report_stat()
+    
+    def run(self) -> Dict[str, Any]:
+        """Run the stages that are out of date and return which ones ran."""
+        from ..data_processing import DataLoader, DataCleaner
+        from ..analysis import FinancialAnalyzer
+        from .report_generator import ReportGenerator
+        
+        ran = []
+        # Recorded before reading, so a write during the run is seen by the next tick
+        stat = os.stat(self.input_path)
+        self._stat = (stat.st_size, stat.st_mtime_ns)
+        input_digest = file_digest(self.input_path)
+        settings = _analysis_settings()
+        if (input_digest != self._input_digest or self.data is None
+                or settings != self._analysis_settings):
+            try:
+                with stage('schedule.load'):
+                    raw = DataLoader().load_data(self.input_path)
+                with stage('schedule.clean', rows=len(raw)):
+                    data = (self.cleaner or DataCleaner()).clean_data(raw)
+                with stage('schedule.analyze', rows=len(data)):
+                    analysis = FinancialAnalyzer(data).generate_full_analysis()
+            except Exception:
+                self._stat = None
+                raise
+            self.data, self.analysis = data, analysis
+            self._analysis_digest = hashlib.sha256(pickle.dumps(analysis)).hexdigest()
+            self._input_digest = input_digest
+            self._analysis_settings = settings
+            ran += ['load', 'clean', 'analyze']
+        
+        if self._analysis_digest != self._rendered_digest or not os.path.exists(self.report_path):
+            with stage('schedule.render'):
+                os.makedirs(os.path.dirname(self.report_path) or '.', exist_ok=True)
+                ReportGenerator(self.data, self.analysis,
+                                output_dir=self.charts_dir).generate_report(self.report_path)
+            self._rendered_digest = self._analysis_digest
+            ran.append('render')
+        
+        if self.send is not None and self._report_stat() != self._sent_stat:
+            # Recorded before hashing, so a write during the send is seen by the next tick
+            report_stat, report_digest = self._report_stat(), self._report_digest()
+            if report_digest == self._sent_digest:
+                self._sent_stat = report_stat
+            else:
+                with stage('schedule.send'):
+                    delivered = self.send(self.report_path)
+                # An undelivered report stays out of date and is retried next tick
+                if delivered:
+                    self._sent_digest, self._sent_stat = report_digest, report_stat
+                ran.append('send')
+        return {'job': self.name, 'ran': ran, 'skipped': [s for s in STAGES if s not in ran]}
+    
+    def _report_digest(self) -> Optional[str]:
+        return file_digest(self.report_path) if os.path.exists(self.report_path) else None
+    
+    def _report_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.report_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+def _analysis_settings():
+    """The config sections that shape a job's cleaned data and analysis."""
+    from ..utlis.config import get_config
+    settings = get_config().settings
+    return (settings.data, settings.analysis)
+
+class Scheduler:
+    """Polls pipeline jobs and runs the ones whose inputs changed.
+    
+    Runs execute on a thread pool of `max_workers`. Backpressure: a job never
+    runs twice at once; a change seen while it runs is coalesced into a single
+    pending rerun, and when every worker is busy nothing more is submitted, so
+    changes wait for the next tick instead of queueing without bound.
+    
+    With a `config`, `run_forever` reloads it whenever the file changes, so
+    the loaders, cleaners and report generators built by later runs use the
+    new settings without a restart, and jobs whose analysis settings changed
+    run again. `on_reload(config)` is then called to apply the rest (see
+    `main`), typically through `resize`, `interval` and `PipelineJob.reconfigure`.
+    """
+    
+    def __init__(self, jobs: List[PipelineJob], interval: float = 60.0, max_workers: int = 1,
+                 config=None, on_reload: Callable[[Any], None] = None):
+        self.jobs = list(jobs)
+        self.config = config
+        self.on_reload = on_reload
+        self.interval = interval
+        self.max_workers = max_workers
+        self.history = []
+        self._pending = set()
+        self._running = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._retired = []
+    
+    def tick(self) -> List[str]:
+        """Check every job once and submit the changed ones that fit; return their names."""
+        submitted = []
+        with self._lock:
+            for job in self.jobs:
+                if job.name in self._running:
+                    if job.needs_run():
+                        self._pending.add(job.name)
+                    continue
+                if job.name not in self._pending and not job.needs_run():
+                    continue
+                if len(self._running) >= self.max_workers:
+                    self._pending.add(job.name)
+                    continue
+                self._pending.discard(job.name)
+                self._running[job.name] = self._executor.submit(self._run, job)
+                submitted.append(job.name)
+        return submitted
+    
+    def drain(self, timeout: float = None):
+        """Wait for the runs in progress."""
+        with self._lock:
+            futures = list(self._running.values())
+        for future in futures:
+            future.result(timeout)
+    
+    def run_forever(self, stop_event: threading.Event = None):
+        """Tick every `interval` seconds until `stop_event` is set."""
+        stop_event = stop_event or threading.Event()
+        try:
+            while not stop_event.is_set():
+                self.reload()
+                self.tick()
+                stop_event.wait(self.interval)
+        finally:
+            self.shutdown()
+    
+    def reload(self) -> bool:
+        """Reload the config if its file changed and apply it; return whether it changed."""
+        if self.config is None or not self.config.reload_if_changed():
+            return False
+        if self.on_reload is not None:
+            try:
+                self.on_reload(self.config)
+            except Exception as e:
+                logger.error(f"Could not apply reloaded configuration: {str(e)}")
+        return True
+    
+    def resize(self, max_workers: int):
+        """Run later jobs on `max_workers` threads; runs in progress finish where they are."""
+        with self._lock:
+            if max_workers == self.max_workers:
+                return
+            self._retired.append(self._executor)
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self.max_workers = max_workers
+        self._retired[-1].shutdown(wait=False)
+    
+    def set_jobs(self, jobs: List[PipelineJob]):
+        with self._lock:
+            self.jobs = list(jobs)
+    
+    def shutdown(self):
+        for executor in self._retired + [self._executor]:
+            executor.shutdown(wait=True)
+    
+    @property
+    def pending(self) -> List[str]:
+        with self._lock:
+            return sorted(self._pending)
+    
+    def _run(self, job: PipelineJob) -> Dict[str, Any]:
+        try:
+            result = job.run()
+            logger.info(f"{job.name}: ran {result['ran'] or 'nothing'}")
+        except Exception as e:
+            # State is only advanced by completed stages, so the next tick retries
+            result = {'job': job.name, 'error': str(e)}
+            logger.error(f"{job.name}: run failed: {str(e)}")
+        with self._lock:
+            self.history.append(result)
+            self._running.pop(job.name, None)
+        return result
+
+def _email_sender(config) -> Optional[Callable[[str], bool]]:
+    """Build the send stage from the `email` config section, if recipients are set."""
+    recipients = config.get('email', 'recipient_email')
+    if not recipients:
+        return None
+    if isinstance(recipients, str):
+        recipients = [r.strip() for r in recipients.split(',') if r.strip()]
+    from .email_automation import EmailAutomation
+    emailer = EmailAutomation(config.get('email', 'smtp_server'), config.get('email', 'smtp_port'))
+    sender = config.get('email', 'sender_email')
+    password = os.environ.get('FINAUTO_SMTP_PASSWORD', '')
+    
+    def send(report_path: str) -> bool:
+        result = emailer.send_bulk(sender, recipients, 'Financial Analysis Report',
+                                   report_path, password)
+        return not result['failed']
+    return send
+
+def build_jobs(config, inputs: List[str], jobs: List[PipelineJob] = ()) -> List[PipelineJob]:
+    """Jobs for `inputs`, with report paths and the send stage taken from `config`.
+    
+    Existing `jobs` for the same inputs are reconfigured rather than
+    replaced, so a reload keeps their state.
+    """
+    existing = {job.name: job for job in jobs}
+    report_path = config.get('reporting', 'report_path')
+    charts_dir = config.get('reporting', 'charts_dir')
+    send = _email_sender(config)
+    built = []
+    for path in inputs:
+        job_report, job_charts = report_path, charts_dir
+        if len(inputs) > 1:
+            # One report and chart directory per input when several files are watched
+            name = os.path.splitext(os.path.basename(path))[0]
+            job_report = os.path.join(os.path.dirname(report_path), f"{name}_report.md")
+            job_charts = os.path.join(charts_dir, name)
+        if path in existing:
+            existing[path].reconfigure(job_report, job_charts, send)
+            built.append(existing[path])
+        else:
+            built.append(PipelineJob(path, job_report, job_charts, send=send, name=path))
+    return built
+
+def main(argv: List[str] = None):
+    """Command-line entry point for the scheduler daemon."""
+    parser = argparse.ArgumentParser(description="Re-run the pipeline when its inputs change.")
+    parser.add_argument('--input', nargs='*', default=None,
+                        help="Input files to watch (default: data.input_path from the config)")
+    parser.add_argument('--interval', type=float, default=None,
+                        help="Seconds between polls (default: scheduler.interval)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Concurrent pipeline runs (default: scheduler.workers)")
+    parser.add_argument('--once', action='store_true', help="Run one tick and exit")
+    from ..utlis.config import add_config_arguments, configure_from_args
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    from ..utlis.helpers import setup_logging
+    setup_logging()
+    config = configure_from_args(args)
+    
+    def inputs(config):
+        return args.input or [config.get('data', 'input_path')]
+    
+    def on_reload(config):
+        # Command-line values keep precedence over the reloaded file
+        settings = config.settings.scheduler
+        scheduler.interval = args.interval or settings.interval
+        scheduler.resize(args.workers or settings.workers)
+        scheduler.set_jobs(build_jobs(config, inputs(config), scheduler.jobs))
+    
+    scheduler = Scheduler(build_jobs(config, inputs(config)),
+                          args.interval or config.settings.scheduler.interval,
+                          args.workers or config.settings.scheduler.workers,
+                          config=config, on_reload=on_reload)
+    if args.once:
+        scheduler.tick()
+        scheduler.drain()
+        scheduler.shutdown()
+        return 1 if any('error' in result for result in scheduler.history) else 0
+    scheduler.run_forever()
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+# src/data_processing/cache.py
+import pandas as pd
+from typing import Dict, Any, List, Optional
+import hashlib
+import json
+import os
+import time
+from ..utlis.config import get_config
+
+CACHE_FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+# Access times only order evictions, so a hit saves the index at most this often
+ACCESS_FLUSH_SECONDS = 60.0
+
+class DataCache:
+    """Content-addressed columnar cache for loaded and cleaned frames.
+    
+    Entries are keyed by the input file fingerprint (size, mtime, SHA-256)
+    combined with the stage name and its settings, and stored as
+    uncompressed Arrow IPC or Parquet. A hit is read through a memory map
+    and converted column by column, so the frame is the only full copy in
+    memory. The least recently used entries are evicted once the cache
+    exceeds `max_bytes`; access times are saved with the next write, or
+    once a minute. Requires pyarrow.
+    """
+    
+    def __init__(self, cache_dir: str = None, max_bytes: int = None, fmt: str = None):
+        pipeline = get_config().settings.pipeline
+        cache_dir = cache_dir or pipeline.cache_dir
+        max_bytes = max_bytes or pipeline.cache_max_bytes
+        fmt = fmt or pipeline.cache_format
+        if fmt not in CACHE_FORMATS:
+            raise ValueError(f"Unsupported cache format: {fmt}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.fmt = fmt
+        self._index_path = os.path.join(cache_dir, 'index.json')
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._saved_at = time.monotonic()
+    
+    def fingerprint(self, filepath: str) -> str:
+        """Return the SHA-256 of a file, rehashing only if its size or mtime changed."""
+        stat = os.stat(filepath)
+        path = os.path.abspath(filepath)
+        known = self._index['fingerprints'].get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        
+        self._index['fingerprints'][path] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest.hexdigest()
+        }
+        self._save_index()
+        return digest.hexdigest()
+    
+    def make_key(self, filepath: str, stage: str, settings: Dict[str, Any] = None) -> str:
+        """Build a cache key from the file fingerprint, stage and settings."""
+        payload = json.dumps({
+            'file': self.fingerprint(filepath),
+            'stage': stage,
+            'settings': settings or {}
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+    
+    def get(self, key: str, columns: List[str] = None) -> Optional[pd.DataFrame]:
+        """Return the cached frame for `key`, or None on a miss."""
+        entry = self._index['entries'].get(key)
+        path = self._entry_path(key)
+        if entry is None or not os.path.exists(path):
+            return None
+        
+        if self.fmt == 'arrow':
+            from pyarrow import feather
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        else:
+            import pyarrow.parquet as pq
+            table = pq.read_table(path, columns=columns, memory_map=True)
+        
+        entry['last_access'] = time.time()
+        if time.monotonic() - self._saved_at >= ACCESS_FLUSH_SECONDS:
+            self._save_index()
+        # One pandas block per column, each Arrow column released once converted
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    
+    def put(self, key: str, df: pd.DataFrame, source: str = None):
+        """Store a frame under `key` and evict old entries if over budget."""
+        import pyarrow as pa
+        
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        path = self._entry_path(key)
+        tmp_path = path + '.tmp'
+        if self.fmt == 'arrow':
+            from pyarrow import feather
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+        else:
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        
+        now = time.time()
+        self._index['entries'][key] = {
+            'source': source,
+            'size': os.path.getsize(path),
+            'rows': len(df),
+            'created': now,
+            'last_access': now
+        }
+        self._evict()
+        self._save_index()
+    
+    def load_cleaned(self, filepath: str, loader, cleaner) -> pd.DataFrame:
+        """Load and clean a file, reusing cached validated and cleaned frames."""
+        key = self.make_key(filepath, 'cleaned', cleaner.get_settings())
+        df = self.get(key)
+        if df is None:
+            df = cleaner.clean_data(loader.load_data(filepath, cache=self))
+            self.put(key, df, source=filepath)
+        return df
+    
+    def entries(self) -> List[Dict[str, Any]]:
+        """List cache entries, most recently used first."""
+        entries = [dict(entry, key=key) for key, entry in self._index['entries'].items()]
+        return sorted(entries, key=lambda e: e['last_access'], reverse=True)
+    
+    def total_size(self) -> int:
+        """Total size of cached entries in bytes."""
+        return sum(entry['size'] for entry in self._index['entries'].values())
+    
+    def clear(self, key: str = None):
+        """Remove one entry, or every entry if no key is given."""
+        keys = [key] if key is not None else list(self._index['entries'])
+        for k in keys:
+            self._remove(k)
+        if key is None:
+            self._index['fingerprints'] = {}
+        self._save_index()
+    
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in `max_bytes`."""
+        for entry in reversed(self.entries()):
+            if self.total_size() <= self.max_bytes:
+                break
+            self._remove(entry['key'])
+    
+    def _remove(self, key: str):
+        """Delete an entry's file and index record."""
+        self._index['entries'].pop(key, None)
+        path = self._entry_path(key)
+        if os.path.exists(path):
+            os.remove(path)
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FORMATS[self.fmt])
+    
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the cache index, starting fresh if it is missing or corrupt."""
+        try:
+            with open(self._index_path, 'r') as f:
+                index = json.load(f)
+            if {'entries', 'fingerprints'} <= set(index):
+                return index
+        except (FileNotFoundError, ValueError):
+            pass
+        return {'entries': {}, 'fingerprints': {}}
+    
+    def _save_index(self):
+        tmp_path = self._index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+        self._saved_at = time.monotonic()
+
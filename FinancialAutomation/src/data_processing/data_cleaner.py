@@ -0,0 +1,145 @@
+# src/data_processing/data_cleaner.py
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Tuple
+from ..utlis.config import get_config
+from ..utlis.instrumentation import stage
+from .schema import CompactSchema
+
+NUMERICAL_COLUMNS = ['revenue', 'expenses']
+IQR_MULTIPLIER = 1.5
+
+class DataCleaner:
+    def __init__(self, groupwise: bool = False, window: str = None,
+                 schema: CompactSchema = None, statistics: Dict[str, Any] = None):
+        # Standard deviations for outlier detection
+        self.outlier_threshold = get_config().settings.analysis.outlier_threshold
+        # Per-category medians and IQR bounds, optionally over a trailing date window
+        self.groupwise = groupwise or window is not None
+        self.window = window
+        # Compact output: cleaned in float64, stored without derived columns
+        self.schema = schema
+        # Precomputed global medians, quartiles and category mode, e.g. from
+        # `ApproximateAccumulator.cleaning_statistics()`, so chunks clean alike
+        if statistics is not None and self.groupwise:
+            raise ValueError("statistics apply to global cleaning, not groupwise")
+        self.statistics = statistics
+    
+    def clean_data(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """Clean and prepare the financial data."""
+        rows = len(df)
+        if self.schema is not None:
+            with stage('clean.expand', rows):
+                df = self.schema.expand(df, derived=False)
+        elif not inplace:
+            with stage('clean.copy', rows):
+                df = df.copy()
+        if self.groupwise:
+            with stage('clean.groupwise', rows):
+                df = self._clean_groupwise(df)
+        else:
+            with stage('clean.missing_values', rows):
+                df = self._handle_missing_values(df)
+            with stage('clean.outliers', rows):
+                df = self._handle_outliers(df)
+        if self.schema is not None:
+            with stage('clean.compact', rows):
+                return self.schema.compact(df)
+        with stage('clean.derived_features', rows):
+            df = self._add_derived_features(df)
+        return df
+    
+    def get_settings(self) -> Dict[str, Any]:
+        """Return the settings that affect the cleaned output."""
+        return {
+            'outlier_threshold': self.outlier_threshold,
+            'groupwise': self.groupwise,
+            'window': self.window,
+            'schema': self.schema.money_dtype if self.schema is not None else None,
+            'statistics': self.statistics
+        }
+    
+    def _handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Handle missing values in the dataset."""
+        # Fill missing numerical values with median
+        numerical_cols = ['revenue', 'expenses']
+        if self.statistics is not None:
+            medians = pd.Series(self.statistics['median'])
+            mode = self.statistics['category_mode']
+        else:
+            medians = df[numerical_cols].median()
+            mode = df['category'].mode()[0]
+        df[numerical_cols] = df[numerical_cols].fillna(medians)
+        
+        # Fill missing categories with mode
+        df['category'] = df['category'].fillna(mode)
+        return df
+    
+    def _handle_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Handle outliers using IQR method."""
+        if self.statistics is not None:
+            Q1 = pd.Series(self.statistics['q1'])[NUMERICAL_COLUMNS]
+            Q3 = pd.Series(self.statistics['q3'])[NUMERICAL_COLUMNS]
+        else:
+            quartiles = df[NUMERICAL_COLUMNS].quantile([0.25, 0.75])
+            Q1, Q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+        IQR = Q3 - Q1
+        df[NUMERICAL_COLUMNS] = df[NUMERICAL_COLUMNS].clip(
+            lower=Q1 - IQR_MULTIPLIER*IQR, upper=Q3 + IQR_MULTIPLIER*IQR, axis=1)
+        return df
+    
+    def _clean_groupwise(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fill and clip numerical columns with per-category bounds.
+        
+        Quartiles and medians for all numerical columns come from one grouped
+        quantile pass (or one rolling pass per quantile when a window is set),
+        computed on the observed values. The median fill and IQR clip are then
+        applied to a single array that is written back once.
+        """
+        if df['category'].isna().any():
+            df['category'] = df['category'].fillna(df['category'].mode()[0])
+        codes, _ = pd.factorize(df['category'])
+        values = df[NUMERICAL_COLUMNS].to_numpy(dtype=np.float64, copy=True)
+        
+        if self.window is None:
+            Q1, median, Q3 = self._group_quantiles(values, codes)
+        else:
+            Q1, median, Q3 = self._rolling_group_quantiles(values, codes, df['date'])
+        
+        # Groups with no observed values fall back to global statistics
+        median = np.where(np.isnan(median), np.nanmedian(values, axis=0), median)
+        IQR = Q3 - Q1
+        lower = np.nan_to_num(Q1 - IQR_MULTIPLIER*IQR, nan=-np.inf)
+        upper = np.nan_to_num(Q3 + IQR_MULTIPLIER*IQR, nan=np.inf)
+        
+        np.copyto(values, median, where=np.isnan(values))
+        np.clip(values, lower, upper, out=values)
+        df[NUMERICAL_COLUMNS] = values
+        return df
+    
+    def _group_quantiles(self, values: np.ndarray,
+                         codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-row Q1, median and Q3 of each column within its category."""
+        quantiles = pd.DataFrame(values).groupby(codes).quantile([0.25, 0.5, 0.75])
+        table = quantiles.to_numpy().reshape(-1, 3, values.shape[1])
+        return tuple(table[codes, i] for i in range(3))
+    
+    def _rolling_group_quantiles(self, values: np.ndarray, codes: np.ndarray,
+                                 dates: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-row Q1, median and Q3 over the trailing `window` within each category."""
+        order = np.lexsort((dates.to_numpy(), codes))
+        ordered = pd.DataFrame(values[order], index=pd.DatetimeIndex(dates.to_numpy()[order]))
+        rolling = ordered.groupby(codes[order], sort=True).rolling(self.window, min_periods=1)
+        
+        results = []
+        for q in (0.25, 0.5, 0.75):
+            aligned = np.empty_like(values)
+            aligned[order] = rolling.quantile(q).to_numpy()
+            results.append(aligned)
+        return tuple(results)
+    
+    def _add_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add derived financial features."""
+        df['profit'] = df['revenue'] - df['expenses']
+        df['profit_margin'] = (df['profit'] / df['revenue'] * 100).round(2)
+        return df
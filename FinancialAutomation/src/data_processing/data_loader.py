@@ -0,0 +1,131 @@
+# src/data_processing/data_loader.py
+import pandas as pd
+from typing import Iterator, Iterable, List, Sequence, Union
+from ..utlis.config import get_config
+from ..utlis.instrumentation import stage
+from .sources import DataSource, Filter, resolve_source
+from .schema import CompactSchema, MONEY_COLUMNS, to_cents
+
+# Compact dtypes used when streaming; money columns are set by `money_dtype`
+CHUNK_DTYPES = {'category': 'category'}
+
+class DataLoader:
+    def __init__(self):
+        self.required_columns = ['date', 'revenue', 'expenses', 'category']
+        self.date_format = get_config().settings.data.date_format
+    
+    def load_data(self, source: Union[str, DataSource], cache=None, columns: List[str] = None,
+                  filters: Sequence[Filter] = None, schema: CompactSchema = None) -> pd.DataFrame:
+        """Load financial data from a file path or a `DataSource`.
+        
+        Paths are read by extension (CSV, Parquet, JSON Lines, Excel).
+        `columns` adds columns to the required ones and `filters` keeps only
+        matching rows; both are pushed down where the source supports it.
+        If a `DataCache` is given, the validated frame of a file source is
+        served from it when the file is unchanged and stored in it otherwise.
+        With a `CompactSchema` the frame is returned in its compact layout.
+        """
+        try:
+            source = resolve_source(source)
+            if columns is not None:
+                columns = list(dict.fromkeys(self.required_columns + list(columns)))
+            if cache is not None and source.path is not None:
+                settings = {'columns': columns, 'filters': filters} if columns or filters else None
+                key = cache.make_key(source.path, 'validated', settings)
+                df = cache.get(key)
+                if df is not None:
+                    return self._compact(df, schema)
+            
+            with stage('load.parse') as parse:
+                df = source.read(columns, filters)
+                parse.rows = len(df)
+            with stage('load.validate', rows=len(df)):
+                df = self._validate_data(df)
+            if cache is not None and source.path is not None:
+                cache.put(key, df, source=source.path)
+            return self._compact(df, schema)
+        except Exception as e:
+            raise Exception(f"Error loading data: {str(e)}")
+    
+    def iter_chunks(self, source: Union[str, DataSource], chunksize: int = None,
+                    date_format: str = None, money_dtype: str = 'float32',
+                    filters: Sequence[Filter] = None,
+                    schema: CompactSchema = None) -> Iterator[pd.DataFrame]:
+        """Stream financial data from a file path or `DataSource` in bounded-memory chunks.
+        
+        Only the required columns are read. `category` is parsed as a
+        categorical and money columns as `money_dtype` ('float32', 'float64'
+        or 'int64' for integer cents, flagged by `attrs['money_scale']`).
+        With a `CompactSchema` its money dtype is used and categories are
+        coded against its shared dictionary. Dates are parsed per chunk with
+        an explicit format so no chunk falls back to format inference.
+        `chunksize` defaults to `pipeline.chunk_size` from the configuration.
+        """
+        if schema is not None:
+            money_dtype = schema.money_dtype
+        if money_dtype not in ('float32', 'float64', 'int64'):
+            raise ValueError(f"Unsupported money dtype: {money_dtype}")
+        date_format = date_format or self.date_format
+        chunksize = chunksize or get_config().settings.pipeline.chunk_size
+        
+        try:
+            source = resolve_source(source)
+            self._check_columns(source.columns())
+            
+            dtypes = dict(CHUNK_DTYPES)
+            read_dtype = 'float64' if money_dtype == 'int64' else money_dtype
+            dtypes.update({col: read_dtype for col in MONEY_COLUMNS})
+            
+            chunks = source.iter_chunks(chunksize, self.required_columns, filters, dtypes)
+            while True:
+                with stage('load.chunk') as parse:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        chunk = self._coerce_chunk(chunk, dtypes, date_format)
+                        if money_dtype == 'int64':
+                            chunk = self._to_cents(chunk)
+                        if schema is not None:
+                            chunk['category'] = schema.encode_categories(chunk['category'])
+                        parse.rows = len(chunk)
+                if chunk is None:
+                    break
+                chunk = chunk[self.required_columns]
+                chunk.attrs['money_scale'] = 100 if money_dtype == 'int64' else 1
+                yield chunk
+        except Exception as e:
+            raise Exception(f"Error loading data: {str(e)}")
+    
+    def _validate_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Validate the data structure."""
+        self._check_columns(df.columns)
+        
+        # Convert date column to datetime
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+    
+    def _check_columns(self, columns: Iterable[str]):
+        """Check that all required columns are present."""
+        missing_cols = set(self.required_columns) - set(columns)
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+    
+    def _coerce_chunk(self, chunk: pd.DataFrame, dtypes: dict, date_format: str) -> pd.DataFrame:
+        """Bring a chunk from any source to the streaming dtypes (a no-op for typed CSV reads)."""
+        changed = {col: dtype for col, dtype in dtypes.items() if chunk[col].dtype != dtype}
+        if changed:
+            chunk = chunk.astype(changed)
+        if not pd.api.types.is_datetime64_any_dtype(chunk['date']):
+            chunk['date'] = pd.to_datetime(chunk['date'], format=date_format)
+        return chunk
+    
+    def _to_cents(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Convert money columns to integer cents (nullable if values are missing)."""
+        for col in MONEY_COLUMNS:
+            chunk[col] = to_cents(chunk[col])
+        return chunk
+    
+    def _compact(self, df: pd.DataFrame, schema: CompactSchema = None) -> pd.DataFrame:
+        if schema is None:
+            return df
+        with stage('load.compact', rows=len(df)):
+            return schema.compact(df)
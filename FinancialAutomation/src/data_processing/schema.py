@@ -0,0 +1,119 @@
+# src/data_processing/schema.py
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Iterable, List
+
+MONEY_COLUMNS = ['revenue', 'expenses']
+DERIVED_COLUMNS = ['profit', 'profit_margin']
+MONEY_DTYPES = {'int64': 100, 'float32': 1}
+
+def to_cents(values: pd.Series) -> pd.Series:
+    """Round currency values to integer cents (nullable if values are missing)."""
+    cents = (values.astype(np.float64) * 100).round()
+    return cents.astype('Int64' if cents.isna().any() else np.int64)
+
+def ledger_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """A ledger column in currency units as float64.
+    
+    Frames in integer cents carry `attrs['money_scale']`, which is divided
+    out here. `profit` and `profit_margin` are derived from revenue and
+    expenses when the frame does not store them, so compact frames never
+    materialise them.
+    """
+    scale = df.attrs.get('money_scale', 1)
+    if column in df.columns:
+        values = df[column].astype(np.float64)
+        if scale != 1 and column in MONEY_COLUMNS + ['profit']:
+            values = values / scale
+        return values
+    if column == 'profit':
+        return ledger_column(df, 'revenue') - ledger_column(df, 'expenses')
+    if column == 'profit_margin':
+        return (ledger_column(df, 'profit') / ledger_column(df, 'revenue') * 100).round(2)
+    raise KeyError(column)
+
+class CompactSchema:
+    """Compact in-memory layout for ledger frames.
+    
+    Money is stored as int64 cents (`money_dtype='int64'`) or float32,
+    `category` as a categorical over a dictionary shared by every frame
+    this schema compacts, and `profit`/`profit_margin` are not stored; read
+    them with `ledger_column`. The dictionary only grows, so category codes
+    stay stable across chunks and files.
+    """
+    
+    def __init__(self, money_dtype: str = 'int64', categories: Iterable[str] = None):
+        if money_dtype not in MONEY_DTYPES:
+            raise ValueError(f"Unsupported money dtype: {money_dtype}")
+        self.money_dtype = money_dtype
+        self.scale = MONEY_DTYPES[money_dtype]
+        self.categories = list(categories or [])
+    
+    def compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return `df` in the compact layout, dropping stored derived columns."""
+        scale = df.attrs.get('money_scale', 1)
+        columns = {}
+        for col in df.columns:
+            if col in DERIVED_COLUMNS:
+                continue
+            if col in MONEY_COLUMNS:
+                values = df[col].astype(np.float64) / scale if scale != 1 else df[col]
+                columns[col] = to_cents(values) if self.scale == 100 else values.astype(np.float32)
+            elif col == 'category':
+                columns[col] = self.encode_categories(df[col])
+            elif col == 'date' and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                columns[col] = pd.to_datetime(df[col])
+            else:
+                columns[col] = df[col]
+        compacted = pd.DataFrame(columns, index=df.index)
+        compacted.attrs['money_scale'] = self.scale
+        return compacted
+    
+    def expand(self, df: pd.DataFrame, derived: bool = True) -> pd.DataFrame:
+        """Return a float64 copy of `df` in currency units, with derived columns if asked."""
+        expanded = df.copy()
+        expanded.attrs = {}
+        for col in MONEY_COLUMNS:
+            expanded[col] = ledger_column(df, col)
+        if derived:
+            for col in DERIVED_COLUMNS:
+                expanded[col] = ledger_column(df, col)
+        return expanded
+    
+    def encode_categories(self, values: pd.Series) -> pd.Series:
+        """Encode categories against the shared dictionary, adding unseen ones."""
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('category')
+        unseen = values.cat.categories.difference(self.categories)
+        self.categories.extend(sorted(unseen))
+        return values.cat.set_categories(self.categories)
+    
+    def concat(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """Concatenate compact frames, widening each to the current dictionary."""
+        aligned = []
+        for df in frames:
+            df = df.copy()
+            df['category'] = df['category'].cat.set_categories(self.categories)
+            aligned.append(df)
+        combined = pd.concat(aligned, ignore_index=True)
+        combined.attrs['money_scale'] = self.scale
+        return combined
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> Dict[str, Any]:
+    """Bytes per row, per column and overall, of two layouts of the same rows."""
+    rows = max(len(before), 1)
+    usage_before = before.memory_usage(index=False, deep=True)
+    usage_after = after.memory_usage(index=False, deep=True)
+    return {
+        'rows': len(before),
+        'bytes_per_row_before': round(usage_before.sum() / rows, 2),
+        'bytes_per_row_after': round(usage_after.sum() / rows, 2),
+        'reduction': round(usage_before.sum() / max(usage_after.sum(), 1), 2),
+        'columns': {
+            col: {
+                'before': round(usage_before.get(col, 0) / rows, 2),
+                'after': round(usage_after.get(col, 0) / rows, 2)
+            }
+            for col in before.columns.union(after.columns, sort=False)
+        }
+    }
@@ -0,0 +1,304 @@
+# src/data_processing/sources.py
+import os
+import queue
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import numpy as np
+
+# Filters are (column, op, value) tuples combined with AND, as in pandas.read_parquet
+Filter = Tuple[str, str, Any]
+FILTER_OPS = {
+    '==': lambda s, v: s == v,
+    '!=': lambda s, v: s != v,
+    '<': lambda s, v: s < v,
+    '<=': lambda s, v: s <= v,
+    '>': lambda s, v: s > v,
+    '>=': lambda s, v: s >= v,
+    'in': lambda s, v: s.isin(v),
+    'not in': lambda s, v: ~s.isin(v)
+}
+# Table names are interpolated into SQL, so only plain (optionally schema-qualified) names pass
+TABLE_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?')
+
+def apply_filters(df: pd.DataFrame, filters: Optional[Sequence[Filter]]) -> pd.DataFrame:
+    """Apply filters to an in-memory frame, for sources that cannot push them down."""
+    if not filters:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        mask &= FILTER_OPS[op](df[column], value).to_numpy()
+    return df[mask].reset_index(drop=True)
+
+def read_columns(columns: Optional[List[str]], filters: Optional[Sequence[Filter]]) -> Optional[List[str]]:
+    """Columns to read so that `filters` can be applied before projecting to `columns`."""
+    if not columns:
+        return None
+    return list(dict.fromkeys(list(columns) + [column for column, _, _ in filters or []]))
+
+def project(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    return df[columns] if columns else df
+
+class DataSource(ABC):
+    """Base class of the source adapters used by `DataLoader`.
+    
+    `read` returns the whole (projected, filtered) frame and `iter_chunks`
+    streams it. Adapters push `columns` and `filters` down to the storage
+    where it supports them and apply them in memory otherwise. `path` is set
+    for file sources so `DataCache` can fingerprint them.
+    """
+    path: Optional[str] = None
+    
+    def read(self, columns: List[str] = None, filters: Sequence[Filter] = None) -> pd.DataFrame:
+        chunks = list(self.iter_chunks(columns=columns, filters=filters))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+    
+    @abstractmethod
+    def iter_chunks(self, chunksize: int = 100_000, columns: List[str] = None,
+                    filters: Sequence[Filter] = None,
+                    dtype: Dict[str, str] = None) -> Iterator[pd.DataFrame]:
+        """Stream the (projected, filtered) rows in chunks of at most `chunksize`."""
+    
+    @abstractmethod
+    def columns(self) -> List[str]:
+        """Column names available in the source."""
+
+class CSVSource(DataSource):
+    def __init__(self, path: str):
+        self.path = path
+    
+    def read(self, columns=None, filters=None):
+        df = pd.read_csv(self.path, usecols=read_columns(columns, filters))
+        return project(apply_filters(df, filters), columns)
+    
+    def iter_chunks(self, chunksize=100_000, columns=None, filters=None, dtype=None):
+        with pd.read_csv(self.path, usecols=read_columns(columns, filters), dtype=dtype,
+                         chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield project(apply_filters(chunk, filters), columns)
+    
+    def columns(self):
+        return list(pd.read_csv(self.path, nrows=0).columns)
+
+class JSONLinesSource(DataSource):
+    """Newline-delimited JSON, one record per line."""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def iter_chunks(self, chunksize=100_000, columns=None, filters=None, dtype=None):
+        with pd.read_json(self.path, lines=True, chunksize=chunksize,
+                          dtype=False, convert_dates=False) as reader:
+            for chunk in reader:
+                yield project(apply_filters(chunk, filters), columns)
+    
+    def columns(self):
+        with pd.read_json(self.path, lines=True, chunksize=1, dtype=False,
+                          convert_dates=False) as reader:
+            return list(next(iter(reader), pd.DataFrame()).columns)
+
+class ExcelSource(DataSource):
+    """One worksheet of an Excel workbook (needs openpyxl or xlrd).
+    
+    Workbooks are not streamable, so the sheet is read once and sliced.
+    """
+    
+    def __init__(self, path: str, sheet_name: Union[str, int] = 0):
+        self.path = path
+        self.sheet_name = sheet_name
+    
+    def read(self, columns=None, filters=None):
+        df = pd.read_excel(self.path, sheet_name=self.sheet_name,
+                           usecols=read_columns(columns, filters))
+        return project(apply_filters(df, filters), columns)
+    
+    def iter_chunks(self, chunksize=100_000, columns=None, filters=None, dtype=None):
+        df = self.read(columns, filters)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    
+    def columns(self):
+        return list(pd.read_excel(self.path, sheet_name=self.sheet_name, nrows=0).columns)
+
+class ParquetSource(DataSource):
+    """Parquet file or directory, read through a pyarrow dataset.
+    
+    Columns are projected and filters become a dataset expression, so row
+    groups whose statistics exclude the predicate are never decoded.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def read(self, columns=None, filters=None):
+        return self._dataset().to_table(columns=columns,
+                                        filter=self._expression(filters)).to_pandas()
+    
+    def iter_chunks(self, chunksize=100_000, columns=None, filters=None, dtype=None):
+        batches = self._dataset().to_batches(columns=columns, filter=self._expression(filters),
+                                             batch_size=chunksize)
+        for batch in batches:
+            if batch.num_rows:
+                yield batch.to_pandas()
+    
+    def columns(self):
+        return list(self._dataset().schema.names)
+    
+    def _dataset(self):
+        import pyarrow.dataset as ds
+        return ds.dataset(self.path, format='parquet')
+    
+    def _expression(self, filters):
+        if not filters:
+            return None
+        import pyarrow.parquet as pq
+        return pq.filters_to_expression([tuple(f) for f in filters])
+
+class ConnectionPool:
+    """Pool of reusable DB-API connections.
+    
+    Connections come from `factory` on demand, up to `max_connections`, and
+    are kept open between reads. `placeholder` is the driver's parameter
+    marker ('?' for sqlite3, '%s' for most server drivers).
+    """
+    
+    def __init__(self, factory: Callable[[], Any], max_connections: int = 4,
+                 placeholder: str = '?'):
+        self.factory = factory
+        self.placeholder = placeholder
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+    
+    @classmethod
+    def sqlite(cls, path: str, max_connections: int = 4) -> 'ConnectionPool':
+        return cls(lambda: sqlite3.connect(path, check_same_thread=False), max_connections)
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is closed instead of returned if the block does not finish."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.factory()
+            finished = False
+            try:
+                yield conn
+                finished = True
+            finally:
+                if finished:
+                    self._idle.put(conn)
+                else:
+                    conn.close()
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class SQLSource(DataSource):
+    """A table or query on any DB-API connection pool.
+    
+    Rows are fetched with `fetchmany`, so only one chunk is materialised at a
+    time; with server-side cursor drivers nothing else is held client-side.
+    For a `table`, columns become the SELECT list and filters a parameterised
+    WHERE clause; for a raw `query` they are applied to each chunk instead.
+    Column names are checked against the table before they are interpolated.
+    """
+    
+    def __init__(self, pool: ConnectionPool, table: str = None, query: str = None,
+                 params: Sequence[Any] = ()):
+        if (table is None) == (query is None):
+            raise ValueError("Give exactly one of table or query")
+        if table is not None and not TABLE_NAME.fullmatch(table):
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.pool = pool
+        self.table = table
+        self.query = query
+        self.params = tuple(params)
+    
+    def iter_chunks(self, chunksize=100_000, columns=None, filters=None, dtype=None):
+        sql, params = self._statement(columns, filters)
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                names = [d[0] for d in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(chunksize)
+                    if not rows:
+                        break
+                    chunk = pd.DataFrame.from_records(rows, columns=names)
+                    if self.query is not None:
+                        chunk = project(apply_filters(chunk, filters), columns)
+                    yield chunk
+            finally:
+                cursor.close()
+    
+    def columns(self):
+        relation = self.table or f"({self.query}) AS source_query"
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"SELECT * FROM {relation} WHERE 1 = 0", self.params)
+                return [d[0] for d in cursor.description]
+            finally:
+                cursor.close()
+    
+    def _statement(self, columns, filters):
+        if self.query is not None:
+            return self.query, self.params
+        if columns or filters:
+            names = set(columns or []) | {column for column, _, _ in filters or []}
+            unknown = names - set(self.columns())
+            if unknown:
+                raise ValueError(f"Unknown column(s) in {self.table}: {', '.join(sorted(unknown))}")
+        select = ', '.join(columns) if columns else '*'
+        clauses, params = [], []
+        for column, op, value in filters or []:
+            if op in ('in', 'not in'):
+                markers = ', '.join([self.pool.placeholder] * len(value))
+                clauses.append(f"{column} {op.upper()} ({markers})")
+                params.extend(value)
+            elif op in FILTER_OPS:
+                clauses.append(f"{column} {'=' if op == '==' else op} {self.pool.placeholder}")
+                params.append(value)
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return f"SELECT {select} FROM {self.table}{where}", tuple(params)
+
+FILE_SOURCES = {
+    '.csv': CSVSource,
+    '.parquet': ParquetSource,
+    '.pq': ParquetSource,
+    '.jsonl': JSONLinesSource,
+    '.ndjson': JSONLinesSource,
+    '.xlsx': ExcelSource,
+    '.xls': ExcelSource
+}
+
+def resolve_source(source: Union[str, DataSource]) -> DataSource:
+    """Wrap a file path in the adapter for its extension; adapters pass through.
+    
+    Directories are read as Parquet datasets and unknown extensions as CSV.
+    """
+    if isinstance(source, DataSource):
+        return source
+    extension = os.path.splitext(str(source))[1].lower()
+    if os.path.isdir(source):
+        return ParquetSource(source)
+    return FILE_SOURCES.get(extension, CSVSource)(source)
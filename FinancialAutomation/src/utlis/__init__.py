@@ -1,28 +1,26 @@
 # src/utils/__init__.py
-from .config import Config
-from .helpers import (
-    setup_directories,
-    validate_numerical_columns,
-    calculate_growth_rate,
-    format_currency,
-    format_percentage,
-    get_date_range,
-    save_to_json,
-    load_from_json,
-    create_timestamp,
-    validate_email
-)
+from .lazy import lazy_exports
+# Standard library only; imported eagerly since the `instrumentation` object
+# shares its name with the submodule
+from .instrumentation import Instrumentation, instrumentation, instrumented, stage
 
-__all__ = [
-    'Config',
-    'setup_directories',
-    'validate_numerical_columns',
-    'calculate_growth_rate',
-    'format_currency',
-    'format_percentage',
-    'get_date_range',
-    'save_to_json',
-    'load_from_json',
-    'create_timestamp',
-    'validate_email'
-]
\ No newline at end of file
+# Config needs PyYAML, so the remaining names are resolved on first access
+__getattr__, __dir__, _lazy_names = lazy_exports(__name__, {
+    'Config': '.config',
+    'Settings': '.config',
+    'get_config': '.config',
+    'configure': '.config',
+    'setup_directories': '.helpers',
+    'setup_logging': '.helpers',
+    'validate_numerical_columns': '.helpers',
+    'calculate_growth_rate': '.helpers',
+    'format_currency': '.helpers',
+    'format_percentage': '.helpers',
+    'get_date_range': '.helpers',
+    'save_to_json': '.helpers',
+    'load_from_json': '.helpers',
+    'create_timestamp': '.helpers',
+    'validate_email': '.helpers',
+    'lazy_exports': '.lazy'
+})
+__all__ = _lazy_names + ['Instrumentation', 'instrumentation', 'instrumented', 'stage']
@@ -1,55 +1,282 @@
 # src/utils/config.py
-import yaml
-from typing import Dict, Any
+import dataclasses
+import logging
 import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = 'config.yaml'
+# FINAUTO_CONFIG names the file; FINAUTO_<SECTION>__<KEY> overrides one setting
+ENV_PREFIX = 'FINAUTO_'
+CACHE_FORMATS = ('arrow', 'parquet')
+
+@dataclass(frozen=True)
+class DataSettings:
+    input_path: str = 'data/raw/financial_data_2023.csv'
+    output_path: str = 'data/processed/processed_data.csv'
+    date_format: str = '%Y-%m-%d'
+
+@dataclass(frozen=True)
+class AnalysisSettings:
+    outlier_threshold: float = 3
+    min_data_points: int = 30
+    categories: List[str] = field(default_factory=lambda: ['Sales', 'Services', 'Consulting'])
+
+@dataclass(frozen=True)
+class ReportingSettings:
+    report_path: str = 'reports/financial_insights.md'
+    charts_dir: str = 'reports/charts'
+    include_charts: bool = True
+    chart_workers: int = 2
+
+@dataclass(frozen=True)
+class EmailSettings:
+    smtp_server: str = 'smtp.gmail.com'
+    smtp_port: int = 587
+    sender_email: str = ''
+    recipient_email: List[str] = field(default_factory=list)
+
+@dataclass(frozen=True)
+class PipelineSettings:
+    chunk_size: int = 100_000
+    max_workers: Optional[int] = None  # None: one per CPU
+    max_in_flight: Optional[int] = None  # None: twice max_workers
+    cache_dir: str = 'data/cache'
+    cache_max_bytes: int = 2 * 1024**3
+    cache_format: str = 'arrow'
+    
+    def __post_init__(self):
+        if self.chunk_size <= 0:
+            raise ValueError("pipeline.chunk_size must be positive")
+        if self.max_workers is not None and self.max_workers <= 0:
+            raise ValueError("pipeline.max_workers must be positive")
+        if self.cache_format not in CACHE_FORMATS:
+            raise ValueError(f"pipeline.cache_format must be one of {', '.join(CACHE_FORMATS)}")
+
+@dataclass(frozen=True)
+class SchedulerSettings:
+    interval: float = 60.0
+    workers: int = 1
+    
+    def __post_init__(self):
+        if self.interval <= 0 or self.workers <= 0:
+            raise ValueError("scheduler.interval and scheduler.workers must be positive")
+
+@dataclass(frozen=True)
+class Settings:
+    """Typed, validated view of the whole configuration."""
+    data: DataSettings = field(default_factory=DataSettings)
+    analysis: AnalysisSettings = field(default_factory=AnalysisSettings)
+    reporting: ReportingSettings = field(default_factory=ReportingSettings)
+    email: EmailSettings = field(default_factory=EmailSettings)
+    pipeline: PipelineSettings = field(default_factory=PipelineSettings)
+    scheduler: SchedulerSettings = field(default_factory=SchedulerSettings)
+
+SECTIONS = {f.name: f.default_factory for f in dataclasses.fields(Settings)}
 
 class Config:
-    def __init__(self, config_path: str = 'config.yaml'):
-        self.config = self._load_config(config_path)
+    """YAML configuration validated into `Settings`, with overrides and hot reload.
     
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load configuration from YAML file."""
-        try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
-        except FileNotFoundError:
-            return self._get_default_config()
-    
-    def _get_default_config(self) -> Dict[str, Any]:
-        """Return default configuration."""
-        return {
-            'data': {
-                'input_path': 'data/raw/financial_data_2023.csv',
-                'output_path': 'data/processed/processed_data.csv',
-                'date_format': '%Y-%m-%d'
-            },
-            'analysis': {
-                'outlier_threshold': 3,
-                'min_data_points': 30,
-                'categories': ['Sales', 'Services', 'Consulting']
-            },
-            'reporting': {
-                'report_path': 'reports/financial_insights.md',
-                'charts_dir': 'reports/charts',
-                'include_charts': True
-            },
-            'email': {
-                'smtp_server': 'smtp.gmail.com',
-                'smtp_port': 587,
-                'sender_email': '',
-                'recipient_email': ''
-            }
-        }
+    Precedence is defaults < file < FINAUTO_<SECTION>__<KEY> environment
+    variables < `overrides` (e.g. from `--set section.key=value`) < `update`.
+    The file is parsed and validated once; `reload_if_changed` re-reads it
+    when its size or mtime changes and swaps in the new settings, keeping
+    the old ones if the new file is invalid or the file was deleted.
+    """
+    
+    def __init__(self, config_path: str = DEFAULT_PATH, overrides: Dict[str, Any] = None,
+                 environ: Dict[str, str] = None):
+        self.config_path = config_path
+        self._overrides = dict(overrides or {})
+        self._environ = os.environ if environ is None else environ
+        self._lock = threading.Lock()
+        self._stat = None
+        self.reload()
+    
+    @property
+    def settings(self) -> Settings:
+        return self._settings
     
     def get(self, section: str, key: str) -> Any:
         """Get configuration value."""
+        return self._flat.get((section, key))
+    
+    def update(self, section: str, key: str, value: Any):
+        """Update configuration value; it is validated and kept across reloads."""
+        with self._lock:
+            overrides = {**self._overrides, f'{section}.{key}': value}
+            self._apply(self._read_file()[0], overrides)
+            self._overrides = overrides
+    
+    def reload(self) -> Settings:
+        """Re-read and validate the file; raises ValueError if it is invalid."""
+        with self._lock:
+            raw, stat = self._read_file()
+            self._apply(raw, self._overrides)
+            self._stat = stat
+            return self._settings
+    
+    def reload_if_changed(self) -> bool:
+        """Reload if the file changed since the last load; return whether settings were replaced."""
+        stat = self._file_stat()
+        if stat == self._stat:
+            return False
+        if stat is None:
+            # Deleted (or mid-replace): keep the last good settings until a file reappears
+            self._stat = None
+            logger.warning(f"Configuration {self.config_path} was removed; keeping current settings")
+            return False
+        try:
+            self.reload()
+        except Exception as e:
+            # Keep serving the last good settings; the next change is tried again
+            self._stat = self._file_stat()
+            logger.error(f"Ignoring invalid configuration {self.config_path}: {str(e)}")
+            return False
+        logger.info(f"Reloaded configuration from {self.config_path}")
+        return True
+    
+    def _apply(self, raw: Dict[str, Any], overrides: Dict[str, Any]):
+        merged = {section: dict(values) for section, values in raw.items()}
+        for (section, key), value in self._environ_overrides().items():
+            merged.setdefault(section, {})[key] = value
+        for name, value in overrides.items():
+            section, _, key = name.partition('.')
+            merged.setdefault(section, {})[key] = value
+        settings = build_settings(merged)
+        self.config = dataclasses.asdict(settings)
+        self._flat = {(section, key): value for section, values in self.config.items()
+                      for key, value in values.items()}
+        self._settings = settings
+    
+    def _environ_overrides(self) -> Dict[Tuple[str, str], str]:
+        overrides = {}
+        for name, value in self._environ.items():
+            if name.startswith(ENV_PREFIX) and '__' in name:
+                section, _, key = name[len(ENV_PREFIX):].lower().partition('__')
+                overrides[(section, key)] = value
+        return overrides
+    
+    def _read_file(self) -> Tuple[Dict[str, Any], Optional[Tuple[int, int]]]:
+        """Load configuration from YAML file."""
+        stat = self._file_stat()
+        if stat is None:
+            return {}, None
+        with open(self.config_path, 'r') as f:
+            raw = yaml.safe_load(f) or {}
+        if not isinstance(raw, dict):
+            raise ValueError(f"{self.config_path} must contain a mapping of sections")
+        return {section: values or {} for section, values in raw.items()}, stat
+    
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
         try:
-            return self.config[section][key]
-        except KeyError:
+            stat = os.stat(self.config_path)
+        except FileNotFoundError:
             return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+def build_settings(raw: Dict[str, Dict[str, Any]]) -> Settings:
+    """Validate nested section -> key -> value data into `Settings`.
     
-    def update(self, section: str, key: str, value: Any):
-        """Update configuration value."""
-        if section not in self.config:
-            self.config[section] = {}
-        self.config[section][key] = value
\ No newline at end of file
+    Values are coerced to each field's type, so strings from the
+    environment or the command line work; unknown names raise ValueError.
+    """
+    unknown = set(raw) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown config section(s): {', '.join(sorted(unknown))}")
+    sections = {}
+    for section, factory in SECTIONS.items():
+        values = raw.get(section, {})
+        if not isinstance(values, dict):
+            raise ValueError(f"Config section '{section}' must be a mapping")
+        hints = get_type_hints(factory)
+        unknown = set(values) - set(hints)
+        if unknown:
+            raise ValueError(f"Unknown config key(s) in '{section}': {', '.join(sorted(unknown))}")
+        sections[section] = factory(**{key: _coerce(value, hints[key], f'{section}.{key}')
+                                       for key, value in values.items()})
+    return Settings(**sections)
+
+def _coerce(value: Any, hint: Any, name: str) -> Any:
+    if get_origin(hint) is Union:
+        if value is None or (isinstance(value, str) and value.strip().lower() in ('', 'none', 'null')):
+            return None
+        hint = next(arg for arg in get_args(hint) if arg is not type(None))
+    if get_origin(hint) in (list, List):
+        item = get_args(hint)[0]
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(',') if part.strip()]
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{name} must be a list")
+        return [_coerce(v, item, name) for v in value]
+    if hint is bool:
+        if isinstance(value, str) and value.strip().lower() in ('true', 'yes', 'on', '1'):
+            return True
+        if isinstance(value, str) and value.strip().lower() in ('false', 'no', 'off', '0'):
+            return False
+        if isinstance(value, bool):
+            return value
+    elif hint in (int, float):
+        if isinstance(value, str):
+            try:
+                value = hint(value.strip().replace('_', ''))
+            except ValueError:
+                pass
+        if isinstance(value, (int, float)) and not isinstance(value, bool) \
+                and (hint is float or float(value).is_integer()):
+            return hint(value)
+    elif hint is str:
+        if isinstance(value, str):
+            return value
+    raise ValueError(f"{name} must be of type {getattr(hint, '__name__', hint)}, got {value!r}")
+
+_default = None
+_default_lock = threading.Lock()
+
+def get_config() -> Config:
+    """The process-wide configuration, loaded on first use from FINAUTO_CONFIG or config.yaml."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = Config(os.environ.get(ENV_PREFIX + 'CONFIG', DEFAULT_PATH))
+    return _default
+
+def configure(config_path: str = None, overrides: Dict[str, Any] = None) -> Config:
+    """Load and validate a configuration and install it as the process-wide one."""
+    global _default
+    config = Config(config_path or os.environ.get(ENV_PREFIX + 'CONFIG', DEFAULT_PATH), overrides)
+    with _default_lock:
+        _default = config
+    return config
+
+def add_config_arguments(parser):
+    """Add `--config` and repeatable `--set SECTION.KEY=VALUE` options to an argparse parser."""
+    parser.add_argument('--config', default=None,
+                        help=f"YAML config file (default: $FINAUTO_CONFIG or {DEFAULT_PATH})")
+    parser.add_argument('--set', dest='overrides', action='append', default=[],
+                        metavar='SECTION.KEY=VALUE', help="Override one config setting")
+
+def configure_from_args(args) -> Config:
+    """Install the configuration selected by `add_config_arguments` options.
+    
+    The file and overrides are also exported to the environment so that
+    worker processes started with spawn or forkserver load the same settings.
+    """
+    overrides = {}
+    for item in args.overrides:
+        name, separator, value = item.partition('=')
+        if not separator or '.' not in name:
+            raise ValueError(f"Expected SECTION.KEY=VALUE, got {item!r}")
+        overrides[name.strip()] = value
+    config = configure(args.config, overrides)
+    os.environ[ENV_PREFIX + 'CONFIG'] = config.config_path
+    for name, value in overrides.items():
+        section, _, key = name.partition('.')
+        os.environ[f'{ENV_PREFIX}{section.upper()}__{key.upper()}'] = value
+    return config
@@ -1,18 +1,21 @@
 # src/utils/helpers.py
-import pandas as pd
-import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, TYPE_CHECKING
 import os
 from datetime import datetime
 import logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+def setup_logging(level: int = logging.INFO):
+    """Configure root logging; called by command-line entry points, never at import."""
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
 def setup_directories(dirs: List[str]):
     """Create necessary directories if they don't exist."""
     for dir_path in dirs:
@@ -20,8 +23,9 @@ def setup_directories(dirs: List[str]):
             os.makedirs(dir_path)
             logger.info(f"Created directory: {dir_path}")
 
-def validate_numerical_columns(df: pd.DataFrame, columns: List[str]) -> bool:
+def validate_numerical_columns(df: 'pd.DataFrame', columns: List[str]) -> bool:
     """Validate that specified columns are numerical."""
+    import numpy as np
     for col in columns:
         if not np.issubdtype(df[col].dtype, np.number):
             logger.error(f"Column {col} is not numerical")
@@ -42,28 +46,33 @@ def format_percentage(value: float) -> str:
     """Format number as percentage string."""
     return f"{value:.2f}%"
 
-def get_date_range(df: pd.DataFrame, date_column: str) -> Dict[str, str]:
+def get_date_range(df: 'pd.DataFrame', date_column: str) -> Dict[str, str]:
     """Get the date range of the dataset."""
     start_date = df[date_column].min().strftime('%Y-%m-%d')
     end_date = df[date_column].max().strftime('%Y-%m-%d')
     return {'start_date': start_date, 'end_date': end_date}
 
-def save_to_json(data: Dict[str, Any], filepath: str):
-    """Save dictionary data to JSON file."""
-    import json
+def save_to_json(data: Dict[str, Any], filepath: str, format: str = 'json'):
+    """Save dictionary data to a JSON (or msgpack) file.
+    
+    NumPy and pandas values are encoded natively by `serialization.dumps`,
+    so `load_from_json` returns equal objects; `format` is 'json'
+    (indented), 'compact' or 'msgpack'.
+    """
+    from .serialization import dumps
     try:
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=4, default=str)
+        with open(filepath, 'wb') as f:
+            f.write(dumps(data, format))
         logger.info(f"Data saved to {filepath}")
     except Exception as e:
         logger.error(f"Error saving to JSON: {str(e)}")
 
 def load_from_json(filepath: str) -> Dict[str, Any]:
-    """Load dictionary data from JSON file."""
-    import json
+    """Load dictionary data saved by `save_to_json`, in any of its formats."""
+    from .serialization import loads
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return loads(f.read())
     except Exception as e:
         logger.error(f"Error loading JSON: {str(e)}")
         return {}
@@ -0,0 +1,206 @@
+# src/utils/instrumentation.py
+from contextlib import contextmanager
+from typing import Dict, Any, List, Callable
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class _NullStage:
+    """Shared no-op stage used while instrumentation is disabled."""
+    rows = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """Measures one pipeline step and hands its record to the registry on exit."""
+    
+    def __init__(self, registry: 'Instrumentation', name: str, rows: int = None):
+        self.registry = registry
+        self.name = name
+        self.rows = rows
+        self.child_peak = 0
+    
+    def __enter__(self):
+        self.parent = self.registry._push(self)
+        if self.registry.trace_memory:
+            if self.parent is not None:
+                self.parent.child_peak = max(self.parent.child_peak,
+                                             tracemalloc.get_traced_memory()[1])
+            self.start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        record = {
+            'stage': self.name,
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'rows': self.rows,
+            'ok': exc_type is None
+        }
+        if self.registry.trace_memory:
+            # reset_peak in nested stages hides their peaks from us, so they report up
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            record['peak_memory_bytes'] = peak - self.start_memory
+            if self.parent is not None:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+        elif resource is not None:
+            record['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        self.registry._pop()
+        self.registry._emit(record)
+        return False
+
+class Instrumentation:
+    """Registry of per-stage timings for the pipeline.
+    
+    While disabled, `stage()` returns a shared no-op context manager, so
+    instrumented code pays one attribute check. When enabled, each stage
+    records wall time, CPU time, rows processed and memory: the peak traced
+    allocation with `trace_memory=True`, otherwise the process max RSS.
+    Records are kept in memory and passed to every registered hook.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.records = []
+        self.hooks = []
+        self._started_tracing = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def stage(self, name: str, rows: int = None):
+        """Context manager measuring one pipeline step; set `.rows` on it if known later."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows)
+    
+    def enable(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.trace_memory = False
+    
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        self.hooks.append(hook)
+    
+    def remove_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        self.hooks.remove(hook)
+    
+    def reset(self):
+        with self._lock:
+            self.records = []
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate records per stage: call count, totals and max memory."""
+        summary = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            stats = summary.setdefault(record['stage'], {
+                'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows': 0
+            })
+            stats['calls'] += 1
+            stats['wall_seconds'] += record['wall_seconds']
+            stats['cpu_seconds'] += record['cpu_seconds']
+            stats['rows'] += record['rows'] or 0
+            for key in ('peak_memory_bytes', 'max_rss_bytes'):
+                if key in record:
+                    stats[key] = max(stats.get(key, 0), record[key])
+        return summary
+    
+    def export_json(self, filepath: str):
+        """Write the raw records and the per-stage summary as JSON."""
+        with self._lock:
+            records = list(self.records)
+        with open(filepath, 'w') as f:
+            json.dump({'records': records, 'summary': self.summary()}, f, indent=4)
+    
+    def export_prometheus(self, filepath: str, prefix: str = 'finauto'):
+        """Write the per-stage summary in the Prometheus textfile-collector format."""
+        metrics = [
+            ('calls', 'stage_calls_total', 'counter', 'Number of times the stage ran'),
+            ('wall_seconds', 'stage_wall_seconds_total', 'counter', 'Wall time spent in the stage'),
+            ('cpu_seconds', 'stage_cpu_seconds_total', 'counter', 'CPU time spent in the stage'),
+            ('rows', 'stage_rows_total', 'counter', 'Rows processed by the stage'),
+            ('peak_memory_bytes', 'stage_peak_memory_bytes', 'gauge', 'Peak traced memory of the stage'),
+            ('max_rss_bytes', 'stage_max_rss_bytes', 'gauge', 'Process max RSS after the stage')
+        ]
+        summary = self.summary()
+        lines = []
+        for key, name, kind, help_text in metrics:
+            samples = [(stage, stats[key]) for stage, stats in summary.items() if key in stats]
+            if not samples:
+                continue
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for stage, value in samples:
+                lines.append(f'{prefix}_{name}{{stage="{stage}"}} {value}')
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, filepath)
+    
+    def _push(self, stage: _Stage):
+        stack = self._local.__dict__.setdefault('stack', [])
+        parent = stack[-1] if stack else None
+        stack.append(stage)
+        return parent
+    
+    def _pop(self):
+        self._local.stack.pop()
+    
+    def _emit(self, record: Dict[str, Any]):
+        with self._lock:
+            self.records.append(record)
+        for hook in list(self.hooks):
+            hook(record)
+
+# Process-wide registry used by the pipeline components
+instrumentation = Instrumentation()
+
+def stage(name: str, rows: int = None):
+    """Measure a pipeline step with the process-wide registry."""
+    return instrumentation.stage(name, rows)
+
+@contextmanager
+def instrumented(trace_memory: bool = False, hooks: List[Callable] = None):
+    """Enable instrumentation for a block, restoring the previous state afterwards."""
+    previous = (instrumentation.enabled, instrumentation.trace_memory)
+    hooks = hooks or []
+    for hook in hooks:
+        instrumentation.add_hook(hook)
+    instrumentation.enable(trace_memory)
+    try:
+        yield instrumentation
+    finally:
+        instrumentation.disable()
+        for hook in hooks:
+            instrumentation.remove_hook(hook)
+        if previous[0]:
+            instrumentation.enable(previous[1])
@@ -0,0 +1,24 @@
+# src/utils/lazy.py
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable, List[str]]:
+    """Module `__getattr__`, `__dir__` and `__all__` that import exported names on first access.
+    
+    `exports` maps each public name to the submodule defining it, relative
+    to `package`. A resolved name is stored in the package namespace, so
+    later lookups skip `__getattr__` entirely.
+    """
+    namespace = importlib.import_module(package).__dict__
+    
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        namespace[name] = value
+        return value
+    
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+    
+    return __getattr__, __dir__, list(exports)
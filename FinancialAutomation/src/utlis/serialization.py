@@ -0,0 +1,237 @@
+# src/utils/serialization.py
+import base64
+import datetime
+import json
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ['json', 'compact', 'msgpack']
+# Tagged values are dicts with this key; plain dicts that use it are stored as pairs
+TAG = '$type'
+
+def to_serializable(obj: Any) -> Any:
+    """Rewrite `obj` into plain JSON types, tagging values JSON cannot represent.
+    
+    NumPy scalars become Python numbers of the same value, and arrays,
+    pandas objects, timestamps, non-finite floats, tuples and dicts with
+    non-string keys become `{'$type': ...}` records that `from_serializable`
+    turns back into equal objects. Numeric arrays and columns are stored as
+    base64 of their raw bytes, so no element is formatted one by one.
+    """
+    if obj is None or isinstance(obj, (str, bool)):
+        return obj
+    if isinstance(obj, float):
+        return float(obj) if math.isfinite(obj) else {TAG: 'float', 'value': repr(float(obj))}
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, dict):
+        if all(isinstance(key, str) for key in obj) and TAG not in obj:
+            return {key: to_serializable(value) for key, value in obj.items()}
+        return {TAG: 'map', 'keys': _encode_keys(list(obj)),
+                'values': [to_serializable(value) for value in obj.values()]}
+    if isinstance(obj, list):
+        return [to_serializable(item) for item in obj]
+    if isinstance(obj, (np.datetime64, np.timedelta64)):
+        return {TAG: type(obj).__name__, 'value': int(obj.view('i8')),
+                'unit': np.datetime_data(obj.dtype)[0]}
+    if isinstance(obj, np.generic):
+        return to_serializable(obj.item())
+    if obj is pd.NaT:
+        return {TAG: 'nat'}
+    if obj is pd.NA:
+        return {TAG: 'na'}
+    if isinstance(obj, pd.Timestamp):
+        return {TAG: 'timestamp', 'ns': obj.value, 'tz': str(obj.tz) if obj.tz else None}
+    if isinstance(obj, pd.Timedelta):
+        return {TAG: 'timedelta', 'ns': obj.value}
+    if isinstance(obj, pd.Period):
+        return {TAG: 'period', 'ordinal': obj.ordinal, 'freq': obj.freqstr}
+    if isinstance(obj, np.ndarray):
+        return {TAG: 'ndarray', **_encode_array(obj)}
+    if isinstance(obj, pd.DataFrame):
+        return {TAG: 'frame', 'columns': to_serializable(obj.columns),
+                'index': to_serializable(obj.index), 'attrs': to_serializable(obj.attrs),
+                'data': [_encode_values(obj.iloc[:, i]) for i in range(obj.shape[1])]}
+    if isinstance(obj, pd.Series):
+        return {TAG: 'series', 'name': to_serializable(obj.name),
+                'index': to_serializable(obj.index), 'values': _encode_values(obj)}
+    if isinstance(obj, pd.Index):
+        return {TAG: 'index', 'name': to_serializable(obj.name), 'values': _encode_values(obj)}
+    if isinstance(obj, datetime.datetime):
+        return {TAG: 'datetime', 'value': obj.isoformat()}
+    if isinstance(obj, datetime.date):
+        return {TAG: 'date', 'value': obj.isoformat()}
+    if isinstance(obj, tuple):
+        return {TAG: 'tuple', 'items': [to_serializable(item) for item in obj]}
+    if isinstance(obj, (set, frozenset)):
+        return {TAG: 'set', 'items': [to_serializable(item) for item in obj]}
+    if isinstance(obj, bytes):
+        return {TAG: 'bytes', 'b64': base64.b64encode(obj).decode()}
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+def from_serializable(obj: Any) -> Any:
+    """Inverse of `to_serializable`; plain JSON passes through unchanged."""
+    if isinstance(obj, list):
+        return [from_serializable(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    kind = obj.get(TAG)
+    if kind is None:
+        return {key: from_serializable(value) for key, value in obj.items()}
+    if kind == 'map':
+        return dict(zip(_decode_keys(obj['keys']), (from_serializable(v) for v in obj['values'])))
+    if kind == 'float':
+        return float(obj['value'])
+    if kind == 'timestamp':
+        return pd.Timestamp(obj['ns'], tz='UTC').tz_convert(obj['tz']) if obj['tz'] \
+            else pd.Timestamp(obj['ns'])
+    if kind == 'timedelta':
+        return pd.Timedelta(obj['ns'])
+    if kind == 'nat':
+        return pd.NaT
+    if kind == 'na':
+        return pd.NA
+    if kind in ('datetime64', 'timedelta64'):
+        return getattr(np, kind)(obj['value'], obj['unit'])
+    if kind == 'period':
+        return pd.Period(ordinal=obj['ordinal'], freq=obj['freq'])
+    if kind == 'ndarray':
+        return _decode_array(obj)
+    if kind == 'frame':
+        columns = from_serializable(obj['columns'])
+        data = {i: _decode_values(values) for i, values in enumerate(obj['data'])}
+        frame = pd.DataFrame(data, index=from_serializable(obj['index']))
+        frame.columns = columns
+        frame.attrs = from_serializable(obj.get('attrs', {}))
+        return frame
+    if kind == 'series':
+        return pd.Series(_decode_values(obj['values']), index=from_serializable(obj['index']),
+                         name=from_serializable(obj['name']))
+    if kind == 'index':
+        return pd.Index(_decode_values(obj['values']), name=from_serializable(obj['name']))
+    if kind == 'datetime':
+        return datetime.datetime.fromisoformat(obj['value'])
+    if kind == 'date':
+        return datetime.date.fromisoformat(obj['value'])
+    if kind == 'tuple':
+        return tuple(from_serializable(item) for item in obj['items'])
+    if kind == 'set':
+        return {from_serializable(item) for item in obj['items']}
+    if kind == 'bytes':
+        return base64.b64decode(obj['b64'])
+    raise ValueError(f"Unknown serialized type: {kind}")
+
+def dumps(obj: Any, format: str = 'json') -> bytes:
+    """Serialize `obj` losslessly.
+    
+    'json' is indented standard-library JSON, 'compact' is minified JSON
+    (written by orjson when it is installed) and 'msgpack' is binary and
+    needs the msgpack package.
+    """
+    tree = to_serializable(obj)
+    if format == 'json':
+        return json.dumps(tree, indent=4).encode()
+    if format == 'compact':
+        try:
+            import orjson
+        except ImportError:
+            return json.dumps(tree, separators=(',', ':')).encode()
+        return orjson.dumps(tree)
+    if format == 'msgpack':
+        import msgpack
+        return msgpack.packb(tree, use_bin_type=True)
+    raise ValueError(f"Unsupported format: {format}")
+
+def loads(data: bytes) -> Any:
+    """Deserialize the output of `dumps` in any format.
+    
+    JSON is ASCII, while msgpack maps, arrays and strings start with a byte
+    of 0x80 or above, so the first byte tells them apart. Files written by
+    plain `json.dump` may hold NaN/Infinity tokens, which orjson rejects;
+    those are parsed by the standard library instead.
+    """
+    if data[:1] < b'\x80':
+        try:
+            import orjson
+        except ImportError:
+            tree = json.loads(data)
+        else:
+            try:
+                tree = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                tree = json.loads(data)
+    else:
+        import msgpack
+        tree = msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return from_serializable(tree)
+
+def _encode_array(array: np.ndarray) -> Dict[str, Any]:
+    if array.dtype.hasobject:
+        return {'dtype': 'object', 'shape': list(array.shape),
+                'items': [to_serializable(item) for item in array.ravel().tolist()]}
+    return {'dtype': array.dtype.str, 'shape': list(array.shape),
+            'b64': base64.b64encode(np.ascontiguousarray(array).tobytes()).decode()}
+
+def _decode_array(obj: Dict[str, Any]) -> np.ndarray:
+    if obj['dtype'] == 'object':
+        items = [from_serializable(item) for item in obj['items']]
+        array = np.empty(len(items), dtype=object)
+        array[:] = items
+        return array.reshape(obj['shape'])
+    array = np.frombuffer(base64.b64decode(obj['b64']), dtype=np.dtype(obj['dtype']))
+    return array.reshape(obj['shape']).copy()
+
+def _encode_values(values) -> Dict[str, Any]:
+    """Values of a Series or Index, keeping datetime, period and categorical dtypes."""
+    dtype = values.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        # asi8 counts in the dtype's own unit (s, ms, us or ns)
+        return {'kind': 'datetimetz', 'tz': str(dtype.tz), 'unit': dtype.unit,
+                **_encode_array(pd.DatetimeIndex(values).asi8)}
+    if isinstance(dtype, pd.PeriodDtype):
+        return {'kind': 'period', 'period': str(dtype),
+                **_encode_array(pd.PeriodIndex(values).asi8)}
+    if isinstance(dtype, pd.CategoricalDtype):
+        categorical = pd.Categorical(values)
+        return {'kind': 'categorical', 'ordered': bool(dtype.ordered),
+                'categories': to_serializable(pd.Index(categorical.categories)),
+                **_encode_array(categorical.codes)}
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return {'kind': 'extension', 'extension': str(dtype),
+                **_encode_array(np.asarray(values.astype(object)))}
+    return {'kind': 'numpy', **_encode_array(np.asarray(values))}
+
+def _decode_values(obj: Dict[str, Any]):
+    values = _decode_array(obj)
+    kind = obj['kind']
+    if kind == 'datetimetz':
+        stamps = values.view(f"datetime64[{obj.get('unit', 'ns')}]")
+        return pd.DatetimeIndex(stamps).tz_localize('UTC').tz_convert(obj['tz'])
+    if kind == 'period':
+        return pd.PeriodIndex(pd.arrays.PeriodArray(values, dtype=pd.api.types.pandas_dtype(obj['period'])))
+    if kind == 'categorical':
+        return pd.Categorical.from_codes(values, from_serializable(obj['categories']),
+                                         ordered=obj['ordered'])
+    if kind == 'extension':
+        return pd.array(values, dtype=obj['extension'])
+    return values
+
+def _encode_keys(keys: List[Any]) -> Any:
+    """Dict keys; a run of naive timestamps (e.g. monthly totals) is stored as one int64 array."""
+    if keys and all(type(key) is pd.Timestamp and key.tz is None for key in keys):
+        return {TAG: 'timestamps', **_encode_array(np.array([key.value for key in keys], np.int64))}
+    return [to_serializable(key) for key in keys]
+
+def _decode_keys(keys: Any) -> List[Any]:
+    if isinstance(keys, dict) and keys.get(TAG) == 'timestamps':
+        return _timestamps(keys['b64'])
+    return [from_serializable(key) for key in keys]
+
+@lru_cache(maxsize=256)
+def _timestamps(b64: str) -> Tuple[pd.Timestamp, ...]:
+    # Results repeat the same calendar across metrics and entities; Timestamps are immutable
+    return tuple(pd.DatetimeIndex(np.frombuffer(base64.b64decode(b64), '<i8').view('datetime64[ns]')))
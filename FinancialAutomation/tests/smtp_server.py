@@ -0,0 +1,124 @@
+# tests/smtp_server.py
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO/HELO, AUTH, MAIL, RCPT, DATA, RSET, NOOP, QUIT."""
+    
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply('220 localhost stub SMTP')
+        recipients = []
+        authenticated = False
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb == 'EHLO':
+                self._reply('250-localhost', '250-AUTH PLAIN LOGIN', '250 OK')
+            elif verb == 'HELO':
+                self._reply('250 localhost')
+            elif verb == 'AUTH':
+                with server.lock:
+                    refuse = server.auth_failures > 0
+                    server.auth_failures -= refuse
+                authenticated = not refuse
+                self._reply('454 Temporary authentication failure' if refuse
+                            else '235 Authentication successful')
+            elif verb == 'MAIL' and server.require_auth and not authenticated:
+                self._reply('530 Authentication required')
+            elif verb == 'MAIL':
+                recipients = []
+                self._reply('250 OK')
+            elif verb == 'RCPT':
+                address = command[command.index('<') + 1:command.index('>')]
+                with server.lock:
+                    transient = server.transient_failures.get(address, 0)
+                    if transient:
+                        server.transient_failures[address] = transient - 1
+                    closing = server.closing.get(address, 0)
+                    if closing:
+                        server.closing[address] = closing - 1
+                if closing:
+                    self._reply('421 Service closing transmission channel')
+                    return
+                if address in server.rejected:
+                    self._reply('550 Mailbox unavailable')
+                elif transient:
+                    self._reply('451 Try again later')
+                else:
+                    recipients.append(address)
+                    self._reply('250 OK')
+            elif verb == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line == b'.\r\n':
+                        break
+                    if server.store:
+                        data.append(data_line)
+                with server.lock:
+                    server.delivered += 1
+                    if server.store:
+                        server.messages.append((recipients, message_from_bytes(b''.join(data))))
+                if server.delay:
+                    time.sleep(server.delay)
+                self._reply('250 OK')
+            elif verb in ('RSET', 'NOOP'):
+                self._reply('250 OK')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+    
+    def _reply(self, *lines):
+        self.wfile.write(''.join(f'{line}\r\n' for line in lines).encode())
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """Local SMTP stand-in that records delivered messages.
+    
+    `rejected` recipients get a permanent 550, and `transient_failures`
+    maps a recipient to the number of 451 replies to give before accepting.
+    The first `auth_failures` AUTH commands get a transient 454, and with
+    `require_auth` MAIL is refused with 530 on an unauthenticated session.
+    `closing` does the same with a 421 reply after which the connection is
+    dropped.
+    With `store=False` messages are only counted, for benchmarks, and
+    `delay` seconds are slept before accepting each message to stand in for
+    a remote server's latency.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+    
+    def __init__(self, store: bool = True, delay: float = 0.0):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.store = store
+        self.delay = delay
+        self.delivered = 0
+        self.messages = []
+        self.connections = 0
+        self.rejected = set()
+        self.transient_failures = {}
+        self.closing = {}
+        self.auth_failures = 0
+        self.require_auth = False
+    
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+    
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
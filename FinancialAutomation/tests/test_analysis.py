@@ -0,0 +1,240 @@
+# tests/test_analysis.py
+import pickle
+import pytest
+import pandas as pd
+import numpy as np
+from src.analysis import FinancialAnalyzer, RollupIndex, Forecaster, ApproximateAccumulator
+from src.data_processing import DataLoader, DataCleaner
+
+def test_financial_analyzer():
+    """Test financial analysis functionality."""
+    # Create sample data
+    sample_data = pd.DataFrame({
+        'date': pd.date_range(start='2023-01-01', periods=10),
+        'revenue': np.random.normal(10000, 1000, 10),
+        'expenses': np.random.normal(8000, 800, 10),
+        'category': ['Sales'] * 5 + ['Services'] * 5
+    })
+    
+    # Add derived columns
+    sample_data['profit'] = sample_data['revenue'] - sample_data['expenses']
+    sample_data['profit_margin'] = (sample_data['profit'] / sample_data['revenue'] * 100).round(2)
+    
+    # Initialize analyzer
+    analyzer = FinancialAnalyzer(sample_data)
+    
+    # Test full analysis
+    results = analyzer.generate_full_analysis()
+    
+    # Check results structure
+    assert 'summary_metrics' in results
+    assert 'trend_analysis' in results
+    assert 'category_analysis' in results
+    
+    # Check metrics
+    assert results['summary_metrics']['total_revenue'] > 0
+    assert isinstance(results['trend_analysis']['revenue_trend'], str)
+    assert len(results['category_analysis']) == 2
+
+def _assert_analysis_equal(actual, expected):
+    """Compare two analysis result dicts up to floating-point summation order."""
+    for key, value in expected['summary_metrics'].items():
+        assert actual['summary_metrics'][key] == pytest.approx(value, nan_ok=True)
+    for key in ['monthly_revenue', 'monthly_profit']:
+        assert list(actual['trend_analysis'][key]) == list(expected['trend_analysis'][key])
+        assert list(actual['trend_analysis'][key].values()) == pytest.approx(
+            list(expected['trend_analysis'][key].values()))
+    for key in ['revenue_trend', 'profit_trend']:
+        assert actual['trend_analysis'][key] == expected['trend_analysis'][key]
+    assert list(actual['category_analysis']) == list(expected['category_analysis'])
+    for category, metrics in expected['category_analysis'].items():
+        assert actual['category_analysis'][category] == pytest.approx(metrics)
+
+def test_single_pass_matches_reference(tmp_path):
+    """Test the single-pass engine against the per-metric pandas implementation."""
+    rng = np.random.default_rng(0)
+    n = 500
+    sample_data = pd.DataFrame({
+        'date': pd.Timestamp('2023-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 400, n)), unit='D'),
+        'revenue': rng.normal(10000, 1000, n).round(2),
+        'expenses': rng.normal(8000, 800, n).round(2),
+        'category': rng.choice(['Sales', 'Services', 'Consulting'], n)
+    })
+    # Leave a gap month so zero-filled buckets are exercised
+    sample_data = sample_data[sample_data['date'].dt.month != 6].reset_index(drop=True)
+    sample_data['profit'] = sample_data['revenue'] - sample_data['expenses']
+    sample_data['profit_margin'] = (sample_data['profit'] / sample_data['revenue'] * 100).round(2)
+    
+    analyzer = FinancialAnalyzer(sample_data)
+    expected = analyzer._generate_reference_analysis()
+    _assert_analysis_equal(analyzer.generate_full_analysis(), expected)
+    
+    # Streaming raw loader chunks gives the same results
+    path = tmp_path / 'ledger.csv'
+    sample_data[['date', 'revenue', 'expenses', 'category']].to_csv(path, index=False)
+    chunks = DataLoader().iter_chunks(str(path), chunksize=37, money_dtype='float64')
+    _assert_analysis_equal(FinancialAnalyzer.analyze_chunks(chunks), expected)
+
+def test_incremental_update(tmp_path):
+    """Test appending deltas to a persisted analysis state."""
+    rng = np.random.default_rng(1)
+    n = 120
+    history = pd.DataFrame({
+        'date': pd.date_range(start='2023-01-01', periods=n),
+        'revenue': rng.normal(10000, 1000, n).round(2),
+        'expenses': rng.normal(8000, 800, n).round(2),
+        'category': rng.choice(['Sales', 'Services'], n)
+    })
+    history['profit'] = history['revenue'] - history['expenses']
+    history['profit_margin'] = (history['profit'] / history['revenue'] * 100).round(2)
+    state_path = str(tmp_path / 'analysis_state.json')
+    
+    analyzer = FinancialAnalyzer(history.iloc[:100], state_path=state_path)
+    analyzer.rebuild_state()
+    for start in range(100, n, 7):
+        results = FinancialAnalyzer(state_path=state_path).update(history.iloc[start:start + 7])
+    
+    _assert_analysis_equal(results, FinancialAnalyzer(history).generate_full_analysis())
+    assert FinancialAnalyzer(history, state_path=state_path).verify_state()
+    assert not FinancialAnalyzer(history.iloc[:100], state_path=state_path).verify_state()
+
+def test_rollup_queries(tmp_path):
+    """Test range and period queries on the rollup index against pandas."""
+    rng = np.random.default_rng(2)
+    n = 2000
+    sample_data = pd.DataFrame({
+        'date': pd.Timestamp('2022-11-15') + pd.to_timedelta(rng.integers(0, 500, n), unit='D'),
+        'revenue': rng.normal(1000, 100, n).round(2),
+        'expenses': rng.normal(800, 80, n).round(2),
+        'category': rng.choice(['Sales', 'Services', 'Consulting'], n)
+    })
+    sample_data['profit'] = sample_data['revenue'] - sample_data['expenses']
+    analyzer = FinancialAnalyzer(sample_data)
+    
+    q3 = sample_data['date'].between('2023-07-01', '2023-09-30')
+    services = sample_data['category'] == 'Services'
+    assert analyzer.query('revenue', '2023-07-01', '2023-09-30', category='Services') == pytest.approx(
+        sample_data.loc[q3 & services, 'revenue'].sum())
+    trailing = sample_data['date'] > sample_data['date'].max() - pd.Timedelta(days=90)
+    assert analyzer.query('profit', last_days=90) == pytest.approx(sample_data.loc[trailing, 'profit'].sum())
+    assert analyzer.query('count', category='Missing') == 0
+    
+    quarterly = analyzer.rollup_series('revenue', 'quarter', start='2023-02-10')
+    expected = sample_data[sample_data['date'] >= '2023-02-10'].groupby(
+        sample_data['date'].dt.to_period('Q'))['revenue'].sum()
+    assert list(quarterly.index) == list(expected.index)
+    assert quarterly.to_numpy() == pytest.approx(expected.to_numpy())
+    
+    path = str(tmp_path / 'rollup.npz')
+    analyzer.rollup.save(path)
+    loaded = FinancialAnalyzer(rollup=RollupIndex.load(path))
+    assert loaded.query('expenses', '2023-01-01', '2023-12-31') == pytest.approx(
+        analyzer.query('expenses', '2023-01-01', '2023-12-31'))
+
+def test_rolling_metrics():
+    """Test sliding-window statistics against pandas rolling and polyfit."""
+    rng = np.random.default_rng(3)
+    n = 1500
+    sample_data = pd.DataFrame({
+        'date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 200, n), unit='D'),
+        'revenue': rng.normal(1000, 100, n).round(2),
+        'expenses': rng.normal(800, 80, n).round(2),
+        'category': rng.choice(['Sales', 'Services'], n)
+    })
+    window = 14
+    windowed = FinancialAnalyzer(sample_data).rolling_metrics('revenue', window=window)
+    assert windowed.columns == ['Sales', 'Services', 'total']
+    
+    daily = sample_data[sample_data['category'] == 'Sales'].groupby('date')['revenue'].sum()
+    daily = daily.reindex(windowed.dates, fill_value=0.0)
+    sales = windowed.column('Sales')
+    x = np.arange(window)
+    expected_slope = daily.rolling(window).apply(lambda y: np.polyfit(x, y, 1)[0], raw=True)
+    expected_sum = daily.rolling(window).sum()
+    expected_growth = (expected_sum - expected_sum.shift(window)) / expected_sum.shift(window).abs() * 100
+    np.testing.assert_allclose(sales['sum'], expected_sum, rtol=1e-9)
+    np.testing.assert_allclose(sales['mean'], daily.rolling(window).mean(), rtol=1e-9)
+    np.testing.assert_allclose(sales['slope'], expected_slope, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(sales['growth'], expected_growth, rtol=1e-9)
+    
+    total = windowed.frame('sum')
+    np.testing.assert_allclose(total['total'], total['Sales'] + total['Services'], rtol=1e-9)
+    assert windowed.latest()['total']['sum'] == pytest.approx(total['total'].iloc[-1])
+
+def test_forecasting():
+    """Test the batched forecasting models on known series."""
+    periods = 36
+    t = np.arange(periods)
+    season = np.tile([10.0, -5.0, 0.0, -5.0], periods // 4)
+    values = np.vstack([2.0 * t + 100, 50 + season, 3.0 * t + season])
+    
+    linear = Forecaster('linear', horizon=2).forecast_array(values)
+    np.testing.assert_allclose(linear[0], [172.0, 174.0])
+    naive = Forecaster('seasonal_naive', horizon=6, season_length=4).forecast_array(values)
+    np.testing.assert_allclose(naive[1], [60.0, 45.0, 50.0, 45.0, 60.0, 45.0])
+    holt = Forecaster('holt_winters', horizon=4, season_length=4).forecast_array(values)
+    expected = 3.0 * np.arange(periods, periods + 4) + season[:4]
+    np.testing.assert_allclose(holt[2], expected, rtol=0.02)
+    
+    dates = pd.date_range('2021-01-01', periods=periods, freq='MS')
+    sample_data = pd.DataFrame({
+        'date': np.repeat(dates, 2),
+        'revenue': np.column_stack([2.0 * t + 100, 50 + season]).ravel(),
+        'expenses': 0.0,
+        'category': ['Sales', 'Services'] * periods
+    })
+    forecast = FinancialAnalyzer(sample_data).forecast('revenue', horizon=3, model='linear')
+    assert list(forecast.index) == ['Sales', 'Services']
+    assert [str(p) for p in forecast.columns] == ['2024-01', '2024-02', '2024-03']
+    assert forecast.loc['Sales', forecast.columns[0]] == pytest.approx(172.0)
+
+def test_approximate_analysis():
+    """Test sketch-based statistics against exact pandas results and their error bounds."""
+    rng = np.random.default_rng(0)
+    n = 200_000
+    names = np.array([f'Category_{i:04d}' for i in range(2000)])
+    sample_data = pd.DataFrame({
+        'date': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+        'revenue': rng.lognormal(8, 1, n).round(2),
+        'expenses': rng.lognormal(7.5, 1, n).round(2),
+        'category': names[np.minimum(rng.zipf(1.5, n) - 1, len(names) - 1)]
+    })
+    
+    # Halves sketched separately and merged after a pickle round trip, as across processes
+    first = ApproximateAccumulator(seed=1).update(sample_data.iloc[:n // 2])
+    second = pickle.loads(pickle.dumps(ApproximateAccumulator(seed=2).update(sample_data.iloc[n // 2:])))
+    results = first.merge(second).results(top=5)
+    assert results['rows'] == n
+    
+    revenue = np.sort(sample_data['revenue'].to_numpy())
+    summary = results['quantiles']['revenue']
+    assert 0 < summary['rank_error'] < 0.05
+    for name, q in [('q1', 0.25), ('median', 0.5), ('q3', 0.75), ('p99', 0.99)]:
+        estimate = summary[name]
+        assert estimate['lower'] <= estimate['value'] <= estimate['upper']
+        rank = np.searchsorted(revenue, estimate['value'], side='right') / n
+        assert abs(rank - q) <= summary['rank_error']
+    
+    counts = sample_data['category'].value_counts()
+    top = results['top_categories']['by_rows']
+    assert [item['category'] for item in top['items']] == list(counts.index[:5])
+    for item in top['items']:
+        assert item['lower'] <= counts[item['category']] <= item['upper']
+    assert top['max_error'] <= n / 65
+    
+    distinct = results['distinct_categories']
+    assert distinct['lower'] <= sample_data['category'].nunique() <= distinct['upper']
+    
+    # Chunks cleaned with the shared statistics match a clean that used the same values
+    statistics = first.cleaning_statistics()
+    assert statistics['category_mode'] == counts.index[0]
+    cleaner = DataCleaner(statistics=statistics)
+    chunks = [cleaner.clean_data(sample_data.iloc[i:i + 50_000]) for i in range(0, n, 50_000)]
+    cleaned = pd.concat(chunks)
+    iqr = statistics['q3']['revenue'] - statistics['q1']['revenue']
+    assert cleaned['revenue'].max() == pytest.approx(statistics['q3']['revenue'] + 1.5 * iqr)
+    with pytest.raises(ValueError):
+        DataCleaner(groupwise=True, statistics=statistics)
+    
+    approximate = FinancialAnalyzer.approximate_analysis(chunks, seed=0)
+    assert approximate['quantiles']['profit']['count'] == n
@@ -0,0 +1,433 @@
+# tests/test_automation.py
+import pytest
+import pandas as pd
+from src.automation import ReportGenerator, BatchRunner
+from src.automation.batch_runner import process_file
+from src.automation.email_automation import EmailAutomation, EncodedAttachment
+from src.data_processing import DataLoader, DataCleaner
+from src.analysis import FinancialAnalyzer
+import os
+import email
+import gzip
+from tests.smtp_server import StubSMTPServer
+
+def test_report_generator(tmp_path):
+    """Test report generation functionality."""
+    # Create sample data and analysis results
+    sample_data = pd.DataFrame({
+        'date': pd.date_range(start='2023-01-01', periods=5),
+        'revenue': [1000, 1200, 1100, 1300, 1250],
+        'expenses': [800, 900, 850, 950, 900],
+        'category': ['Sales'] * 3 + ['Services'] * 2
+    })
+    
+    sample_analysis = {
+        'summary_metrics': {
+            'total_revenue': 5850,
+            'total_profit': 1000,
+            'average_profit_margin': 17.5,
+            'revenue_growth': 25.0
+        },
+        'trend_analysis': {
+            'revenue_trend': 'upward',
+            'profit_trend': 'stable'
+        },
+        'category_analysis': {
+            'Sales': {
+                'revenue': 3300,
+                'profit': 600,
+                'profit_margin': 18.2
+            },
+            'Services': {
+                'revenue': 2550,
+                'profit': 400,
+                'profit_margin': 15.7
+            }
+        }
+    }
+    
+    # Create report generator
+    generator = ReportGenerator(sample_data, sample_analysis, output_dir=str(tmp_path / 'charts'))
+    
+    # Test report generation
+    test_output_path = str(tmp_path / 'test_report.md')
+    generator.generate_report(test_output_path)
+    
+    # Check if report was created
+    assert os.path.exists(test_output_path)
+
+def test_batch_runner(tmp_path):
+    """Test the parallel batch runner with a failing input."""
+    frames = []
+    for i in range(3):
+        df = pd.DataFrame({
+            'date': pd.date_range(start=f'2023-0{i + 1}-01', periods=4).strftime('%Y-%m-%d'),
+            'revenue': [1000 + i, 1200, 1100, 1300],
+            'expenses': [800, 900, 850, 950 + i],
+            'category': ['Sales', 'Services', 'Sales', 'Consulting']
+        })
+        df.to_csv(tmp_path / f'unit_{i}.csv', index=False)
+        frames.append(DataCleaner().clean_data(DataLoader().load_data(str(tmp_path / f'unit_{i}.csv'))))
+    pd.DataFrame({'date': ['2023-01-01']}).to_csv(tmp_path / 'unit_9.csv', index=False)
+    
+    result = BatchRunner(max_workers=2, max_in_flight=2).run(str(tmp_path / 'unit_*.csv'))
+    
+    assert len(result['succeeded']) == 3
+    assert list(result['failed']) == [str(tmp_path / 'unit_9.csv')]
+    expected = FinancialAnalyzer(pd.concat(frames, ignore_index=True)).generate_full_analysis()
+    assert result['analysis']['summary_metrics'] == pytest.approx(expected['summary_metrics'])
+    assert result['analysis']['trend_analysis'] == expected['trend_analysis']
+    assert result['analysis']['category_analysis'] == expected['category_analysis']
+
+def _process_or_crash(filepath, report_dir=None):
+    if 'crash' in os.path.basename(filepath):
+        os._exit(1)
+    return process_file(filepath, report_dir)
+
+def test_batch_runner_worker_crash(tmp_path, monkeypatch):
+    """Test that a dead worker fails its file and the batch continues on a new pool."""
+    import src.automation.batch_runner as batch_runner
+    monkeypatch.setattr(batch_runner, 'process_file', _process_or_crash)
+    df = pd.DataFrame({
+        'date': ['2023-01-01', '2023-01-02'],
+        'revenue': [1000, 1200],
+        'expenses': [800, 900],
+        'category': ['Sales', 'Services']
+    })
+    for name in ['a', 'b_crash', 'c', 'd']:
+        df.to_csv(tmp_path / f'{name}.csv', index=False)
+    
+    result = BatchRunner(max_workers=1, max_in_flight=1).run(str(tmp_path / '*.csv'))
+    
+    assert list(result['failed']) == [str(tmp_path / 'b_crash.csv')]
+    assert result['succeeded'] == [str(tmp_path / f'{name}.csv') for name in ['a', 'c', 'd']]
+
+def test_chart_rendering_cache(tmp_path):
+    """Test that charts are rendered from analysis results and cached by content."""
+    sample_data = pd.DataFrame({
+        'date': pd.date_range(start='2023-01-01', periods=90),
+        'revenue': [1000.0 + i for i in range(90)],
+        'expenses': [800.0] * 90,
+        'category': ['Sales', 'Services', 'Consulting'] * 30
+    })
+    sample_data['profit'] = sample_data['revenue'] - sample_data['expenses']
+    sample_data['profit_margin'] = (sample_data['profit'] / sample_data['revenue'] * 100).round(2)
+    results = FinancialAnalyzer(sample_data).generate_full_analysis()
+    
+    generator = ReportGenerator(sample_data, results, output_dir=str(tmp_path))
+    paths = generator._create_visualizations()
+    assert sorted(paths) == ['category_performance', 'trends']
+    mtimes = {name: os.stat(path).st_mtime_ns for name, path in paths.items()}
+    
+    # Unchanged inputs are not re-rendered; changed inputs are
+    results['category_analysis']['Sales']['profit'] += 100
+    ReportGenerator(sample_data, results, output_dir=str(tmp_path))._create_visualizations()
+    assert os.stat(paths['trends']).st_mtime_ns == mtimes['trends']
+    assert os.stat(paths['category_performance']).st_mtime_ns != mtimes['category_performance']
+    assert sorted(os.listdir(tmp_path)) == ['.chart_cache.json', 'category_performance.png', 'trends.png']
+
+def test_bulk_email(tmp_path):
+    """Test pooled bulk delivery against a local SMTP stand-in."""
+    report_path = tmp_path / 'report.md'
+    report_path.write_text('# Financial Analysis Report\n')
+    recipients = [f'user{i}@example.com' for i in range(20)]
+    
+    with StubSMTPServer() as server:
+        server.rejected.add('user3@example.com')
+        server.transient_failures['user5@example.com'] = 1
+        emailer = EmailAutomation('127.0.0.1', server.port, use_tls=False)
+        result = emailer.send_bulk('reports@example.com', recipients, 'Report',
+                                   str(report_path), 'secret', max_workers=4, backoff=0.01)
+    
+    assert list(result['failed']) == ['user3@example.com']
+    assert len(result['sent']) == 19
+    assert len(server.messages) == 19
+    assert server.connections <= 4
+    assert result['attempts'] == 21
+    delivered = {recipients[0]: message for recipients, message in server.messages}
+    attachment = delivered['user5@example.com'].get_payload()[1]
+    assert attachment.get_filename() == 'report.md'
+
+def test_bulk_email_dropped_sessions(tmp_path):
+    """Test that 421 replies retire the connection and header injection is refused."""
+    report_path = tmp_path / 'report.md'
+    report_path.write_text('# Financial Analysis Report\n')
+    recipients = ['a@example.com', 'b@example.com', 'c@example.com',
+                  'd@example.com\r\nBcc: e@example.com']
+    
+    with StubSMTPServer() as server:
+        server.closing['b@example.com'] = 1
+        emailer = EmailAutomation('127.0.0.1', server.port, use_tls=False)
+        result = emailer.send_bulk('reports@example.com', recipients, 'Report',
+                                   str(report_path), 'secret', max_workers=1, backoff=0.01)
+        with pytest.raises(ValueError):
+            emailer.send_bulk('reports@example.com', recipients[:1], 'Report\nBcc: e@example.com',
+                              str(report_path), 'secret')
+    
+    assert result['sent'] == recipients[:3]
+    assert list(result['failed']) == recipients[3:]
+    # One retry on a fresh connection, not a second failure on the dropped one
+    assert result['attempts'] == 4
+    assert server.connections == 2
+    assert all('e@example.com' not in str(message) for _, message in server.messages)
+
+def test_bulk_email_async_auth_retry(tmp_path):
+    """Test that a transient AUTH failure is retried on a new async connection."""
+    import asyncio
+    report_path = tmp_path / 'report.md'
+    report_path.write_text('# Financial Analysis Report\n')
+    recipients = ['a@example.com', 'b@example.com', 'c@example.com']
+    
+    with StubSMTPServer() as server:
+        server.require_auth = True
+        server.auth_failures = 1
+        emailer = EmailAutomation('127.0.0.1', server.port, use_tls=False)
+        result = asyncio.run(emailer.send_bulk_async('reports@example.com', recipients, 'Report',
+                                                     str(report_path), 'secret',
+                                                     max_connections=1, backoff=0.01))
+    
+    assert result['sent'] == recipients
+    assert result['attempts'] == 4
+    assert server.connections == 2
+
+def test_encoded_attachment_compression(tmp_path):
+    """Test that large attachments are compressed, spilled to disk and decode intact."""
+    report_path = tmp_path / 'report.md'
+    content = ''.join(f'| Sales | {i * 7919 % 100003:,}.00 |\n' for i in range(20000)).encode()
+    report_path.write_bytes(content)
+    
+    with EncodedAttachment(str(report_path), compression='gzip', compress_threshold=1024,
+                           max_memory=1024) as attachment:
+        assert attachment.filename == 'report.md.gz'
+        assert attachment.size < len(content)
+        assert attachment._path is not None
+        raw = attachment.headers('a@example.com', 'b@example.com', 'Report') + b''.join(
+            bytes(block) for block in attachment.iter_body())
+    
+    message = email.message_from_bytes(raw)
+    part = message.get_payload()[1]
+    assert part.get_filename() == 'report.md.gz'
+    assert gzip.decompress(part.get_payload(decode=True)) == content
+    
+    with EncodedAttachment(str(report_path)) as attachment:
+        raw = attachment.headers('a@example.com', 'b@example.com', 'Report') + b''.join(
+            bytes(block) for block in attachment.iter_body())
+    assert email.message_from_bytes(raw).get_payload()[1].get_payload(decode=True) == content
+    
+    # Quotes and non-ASCII names get the same header as the non-streamed path
+    for name in ['q "1".md', 'rapport_été.md']:
+        (tmp_path / name).write_bytes(b'# Report\n')
+        with EncodedAttachment(str(tmp_path / name)) as attachment:
+            raw = attachment.headers('a@example.com', 'b@example.com', 'Report') + b''.join(
+                bytes(block) for block in attachment.iter_body())
+        streamed = email.message_from_bytes(raw).get_payload()[1]
+        built = EmailAutomation('localhost', 25)._build_message(
+            'a@example.com', 'b@example.com', 'Report', b'# Report\n', name).get_payload()[1]
+        assert streamed.get_filename() == name
+        assert streamed['Content-Disposition'] == built['Content-Disposition']
+
+def test_scheduler_change_detection(tmp_path, monkeypatch):
+    """Test that the scheduler re-runs only out-of-date stages and coalesces overlapping runs."""
+    import threading
+    import src.automation.scheduler as scheduler_module
+    from src.automation import Scheduler, PipelineJob
+    input_path = str(tmp_path / 'ledger.csv')
+    sample_data = pd.DataFrame({
+        'date': pd.date_range('2023-01-01', periods=60, freq='D').strftime('%Y-%m-%d'),
+        'revenue': [1000.0 + i for i in range(60)],
+        'expenses': [800.0] * 60,
+        'category': ['Sales', 'Services', 'Consulting'] * 20
+    })
+    sample_data.to_csv(input_path, index=False)
+    
+    sent, entered, release = [], threading.Event(), threading.Event()
+    release.set()
+    def send(report_path):
+        entered.set()
+        release.wait(10)
+        sent.append(report_path)
+        return True
+    
+    job = PipelineJob(input_path, str(tmp_path / 'reports' / 'report.md'), send=send)
+    scheduler = Scheduler([job], interval=0.01)
+    assert scheduler.tick() == [input_path]
+    scheduler.drain()
+    assert scheduler.history[-1]['ran'] == ['load', 'clean', 'analyze', 'render', 'send']
+    
+    # Unchanged: stats only, no hashing
+    hashed = []
+    file_digest = scheduler_module.file_digest
+    monkeypatch.setattr(scheduler_module, 'file_digest',
+                        lambda path: hashed.append(path) or file_digest(path))
+    assert scheduler.tick() == [] and hashed == []
+    
+    # Touched but identical: one hash, no stages
+    os.utime(input_path, ns=(0, 1))
+    os.utime(job.report_path, ns=(0, 1))
+    scheduler.tick()
+    scheduler.drain()
+    assert scheduler.history[-1]['ran'] == []
+    assert scheduler.tick() == []
+    
+    # Changed while a run is in flight: one coalesced rerun, never two at once
+    sample_data.loc[0, 'revenue'] = 5000.0
+    sample_data.to_csv(input_path, index=False)
+    release.clear()
+    entered.clear()
+    assert scheduler.tick() == [input_path]
+    assert entered.wait(10)
+    sample_data.loc[1, 'revenue'] = 6000.0
+    sample_data.to_csv(input_path, index=False)
+    assert scheduler.tick() == [] and scheduler.tick() == []
+    assert scheduler.pending == [input_path]
+    release.set()
+    scheduler.drain()
+    assert scheduler.tick() == [input_path]
+    scheduler.drain()
+    assert scheduler.history[-1]['ran'] == ['load', 'clean', 'analyze', 'render', 'send']
+    assert scheduler.pending == []
+    assert len(sent) == 3
+    
+    # A failed render is retried on the next tick without another input change
+    from src.automation.report_generator import ReportGenerator
+    generate_report, failures = ReportGenerator.generate_report, []
+    def fail_once(generator, output_path):
+        if not failures:
+            failures.append(output_path)
+            raise OSError("disk full")
+        return generate_report(generator, output_path)
+    monkeypatch.setattr(ReportGenerator, 'generate_report', fail_once)
+    stale = open(job.report_path).read()
+    sample_data.loc[2, 'revenue'] = 7000.0
+    sample_data.to_csv(input_path, index=False)
+    assert scheduler.tick() == [input_path]
+    scheduler.drain()
+    assert 'error' in scheduler.history[-1]
+    assert scheduler.tick() == [input_path]
+    scheduler.drain()
+    assert scheduler.history[-1]['ran'] == ['render', 'send']
+    assert open(job.report_path).read() != stale and len(sent) == 4
+    scheduler.shutdown()
+
+def test_scheduler_config_reload(tmp_path, monkeypatch):
+    """Test that a reloaded config re-runs analysis and reaches the scheduler and its jobs."""
+    from src.utlis import config as config_module
+    from src.automation.scheduler import Scheduler, build_jobs
+    monkeypatch.setattr(config_module, '_default', None)
+    input_path = str(tmp_path / 'ledger.csv')
+    pd.DataFrame({
+        'date': pd.date_range('2023-01-01', periods=30, freq='D').strftime('%Y-%m-%d'),
+        'revenue': [1000.0 + i for i in range(30)],
+        'expenses': [800.0] * 30,
+        'category': ['Sales', 'Services', 'Consulting'] * 10
+    }).to_csv(input_path, index=False)
+    path = tmp_path / 'config.yaml'
+    path.write_text(f"reporting:\n  report_path: {tmp_path / 'a.md'}\n")
+    config = config_module.configure(str(path))
+    
+    def on_reload(config):
+        scheduler.interval = config.settings.scheduler.interval
+        scheduler.resize(config.settings.scheduler.workers)
+        scheduler.set_jobs(build_jobs(config, [input_path], scheduler.jobs))
+    scheduler = Scheduler(build_jobs(config, [input_path]), config=config, on_reload=on_reload)
+    scheduler.tick()
+    scheduler.drain()
+    job = scheduler.jobs[0]
+    assert job.report_path == str(tmp_path / 'a.md') and job.send is None
+    assert scheduler.history[-1]['ran'] == ['load', 'clean', 'analyze', 'render']
+    assert not scheduler.reload() and scheduler.tick() == []
+    
+    # A new outlier threshold re-runs the analysis; the report moves and the pool grows
+    path.write_text(f"analysis:\n  outlier_threshold: 100\nreporting:\n  report_path: {tmp_path / 'b.md'}\n"
+                    "scheduler:\n  interval: 5\n  workers: 2\nemail:\n  recipient_email: a@x.com\n")
+    os.utime(path, ns=(0, 1))
+    assert scheduler.reload()
+    assert scheduler.interval == 5.0 and scheduler.max_workers == 2
+    assert scheduler.jobs == [job] and job.report_path == str(tmp_path / 'b.md')
+    assert job.send is not None
+    job.send = lambda report_path: True
+    assert scheduler.tick() == [input_path]
+    scheduler.drain()
+    assert scheduler.history[-1]['ran'] == ['load', 'clean', 'analyze', 'render', 'send']
+    assert os.path.exists(tmp_path / 'b.md')
+    scheduler.shutdown()
+
+def test_async_pipeline(tmp_path):
+    """Test the overlapped async pipeline end to end, including async SMTP sends."""
+    from src.automation import AsyncPipeline
+    paths = []
+    for i in range(4):
+        path = tmp_path / f'unit_{i}.csv'
+        pd.DataFrame({
+            'date': pd.date_range('2023-01-01', periods=30).strftime('%Y-%m-%d'),
+            'revenue': [1000.0 + i * 10 + d for d in range(30)],
+            'expenses': [800.0] * 30,
+            'category': ['Sales', 'Services', 'Consulting'] * 10
+        }).to_csv(path, index=False)
+        paths.append(str(path))
+    pd.DataFrame({'date': ['2023-01-01']}).to_csv(tmp_path / 'broken.csv', index=False)
+    paths.append(str(tmp_path / 'broken.csv'))
+    
+    with StubSMTPServer() as server:
+        emailer = EmailAutomation('127.0.0.1', server.port, use_tls=False)
+        pipeline = AsyncPipeline(str(tmp_path / 'out'), emailer=emailer,
+                                 sender='reports@example.com',
+                                 recipients=['a@example.com', 'b@example.com'],
+                                 password='secret', max_workers=2, queue_size=1)
+        result = pipeline.run(paths)
+    
+    assert set(result['reports']) == set(paths[:4])
+    assert all(os.path.exists(report) for report in result['reports'].values())
+    assert list(result['failed']) == [paths[4]]
+    assert result['failed'][paths[4]].startswith('analyze:')
+    assert result['sent'] == {path: ['a@example.com', 'b@example.com'] for path in paths[:4]}
+    assert server.delivered == 8
+    recipients, message = server.messages[0]
+    attachment = message.get_payload()[1]
+    assert attachment.get_filename().endswith('_report.md')
+    assert b'Financial Analysis Report' in attachment.get_payload(decode=True)
+
+def test_report_engine(tmp_path):
+    """Test templated Markdown/HTML/PDF output, per-entity rendering and section reuse."""
+    import re
+    from src.automation.report_engine import ReportEngine, render_reports
+    def analysis(scale):
+        return {
+            'summary_metrics': {'total_revenue': 5850.0 * scale, 'total_profit': 1000.0,
+                                'average_profit_margin': 17.5, 'revenue_growth': 25.0},
+            'trend_analysis': {'revenue_trend': 'upward', 'profit_trend': 'stable'},
+            'category_analysis': {f'Cat <{i}>': {'revenue': 100.0 * i, 'profit': 10.0 * i,
+                                                 'profit_margin': 10.0} for i in range(50)}
+        }
+    
+    html = tmp_path / 'single.html'
+    ReportEngine('html').render(analysis(1), str(html), report_date='2024-01-01')
+    assert '<h3>Cat &lt;3&gt;</h3>' in html.read_text() and html.read_text().endswith('</html>\n')
+    
+    entities = {f'unit_{i}': analysis(i + 1) for i in range(3)}
+    first = render_reports(entities, str(tmp_path / 'out'), format='pdf', max_workers=2,
+                           report_date='2024-01-01')
+    assert not first['failed'] and first['sections_reused'] == 0
+    pdf = open(first['reports']['unit_0'], 'rb').read()
+    # Every cross-reference entry points at the start of its object
+    xref = pdf[pdf.rindex(b'startxref') + 10:].split()[0]
+    offsets = re.findall(rb'(\d{10}) 00000 n', pdf[int(xref):])
+    assert all(re.match(rb'%d 0 obj' % (i + 1), pdf[int(offset):]) for i, offset in enumerate(offsets))
+    assert pdf.count(b'/Type /Page ') >= 2
+    
+    entities['unit_1']['category_analysis']['Cat <7>']['profit'] = 1.0
+    second = render_reports(entities, str(tmp_path / 'out'), format='pdf', max_workers=2,
+                            report_date='2024-01-01')
+    assert second['sections_rendered'] == 1
+    assert second['sections_reused'] == 3 * 55 - 1
+    
+    # NaN metrics are reused, and an unreadable sidecar only costs a full render
+    results = analysis(1)
+    results['summary_metrics']['revenue_growth'] = float('nan')
+    markdown = tmp_path / 'nan.md'
+    engine = ReportEngine('markdown')
+    engine.render(results, str(markdown), report_date='2024-01-01')
+    assert engine.render(results, str(markdown), report_date='2024-01-01') == \
+        {'sections': 55, 'rendered': 0, 'written': False}
+    (tmp_path / '.nan.md.sections.json').write_text('{"version": 1, "sections": 3')
+    assert engine.render(results, str(markdown), report_date='2024-01-01')['rendered'] == 55
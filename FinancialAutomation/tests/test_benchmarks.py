@@ -0,0 +1,65 @@
+# tests/test_benchmarks.py
+from benchmarks.synthetic import generate_ledger
+from benchmarks.run_benchmarks import compare, run
+
+def test_synthetic_ledger():
+    """Test the synthetic ledger shape, ordering and category skew."""
+    ledger = generate_ledger(5000, chunk_rows=1000, categories=10)
+    assert len(ledger) == 5000
+    assert ledger['date'].is_monotonic_increasing
+    counts = ledger['category'].value_counts()
+    assert counts.iloc[0] > 3 * counts.iloc[-1]
+    assert ledger['revenue'].isna().any()
+
+def test_benchmark_regression_gate():
+    """Test a small benchmark run and the baseline comparison."""
+    results = run([2000], repeat=1, trace_memory=False)
+    stages = results['results']['2000']
+    assert list(stages) == ['load', 'clean', 'analyze', 'report']
+    assert compare(results, results) == []
+    
+    slower = {'results': {'2000': {stage: {'seconds': stats['seconds'] * 2, 'peak_mb': None}
+                                   for stage, stats in stages.items()}}}
+    regressions = compare(results, slower, threshold=0.5)
+    assert len(regressions) == 4
+    assert regressions[0].startswith('load @ 2000 rows: seconds')
+    
+    streamed = run([2000], repeat=1, trace_memory=False, stream_above=1000)['results']['2000']
+    assert list(streamed) == list(stages)
+    assert streamed['load']['rows_per_second'] > 0
+
+def test_windows_benchmark():
+    """Test the rolling metrics benchmark agrees with the naive baseline."""
+    from benchmarks.bench_windows import run as run_windows
+    results = run_windows(20000, [7, 30], categories=5)
+    assert set(results) == {'7', '30'}
+    assert all(stats['max_abs_slope_diff'] < 1e-3 for stats in results.values())
+
+def test_forecast_benchmark():
+    """Test the forecasting throughput benchmark covers every model."""
+    from benchmarks.bench_forecast import run as run_forecast
+    results = run_forecast(200, 30, workers=[1, 2], repeat=1)
+    assert len(results) == 6
+    assert all(stats['series_per_second'] > 0 for stats in results.values())
+
+def test_import_budget():
+    """Test that entry points stay within their import-time budgets and stay lazy."""
+    from benchmarks.bench_import import check, run as run_imports
+    results = run_imports(runs=2)
+    assert check(results) == []
+    assert results['src.automation.email_automation']['heavy_packages'] == []
+
+def test_serialization_benchmark():
+    """Test that the serialization benchmark round-trips losslessly in the native formats."""
+    from benchmarks.bench_serialization import run as run_serialization
+    results = run_serialization(entities=20, months=12, repeat=1)
+    assert not results['default_str']['lossless']
+    assert results['json']['lossless'] and results['compact']['lossless']
+
+def test_sketches_benchmark():
+    """Test that the sketch benchmark stays within its claimed error bounds."""
+    from benchmarks.bench_sketches import run as run_sketches
+    errors = run_sketches(rows=200_000, parts=2, workers=1, categories=100)['errors']
+    assert errors['max_quantile_rank_error'] <= errors['rank_error_bound']
+    assert errors['max_top_count_error'] <= errors['top_count_error_bound']
+    assert errors['top10_exact_order']
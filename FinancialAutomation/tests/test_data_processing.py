@@ -0,0 +1,219 @@
+# tests/test_data_processing.py
+import pytest
+import pandas as pd
+from src.data_processing import (DataLoader, DataCleaner, DataCache, ConnectionPool, SQLSource,
+                                 CompactSchema, ledger_column, memory_report)
+
+def test_data_loader():
+    """Test data loading functionality."""
+    loader = DataLoader()
+    
+    # Create sample data
+    sample_data = pd.DataFrame({
+        'date': ['2023-01-01', '2023-01-02'],
+        'revenue': [1000, 2000],
+        'expenses': [800, 1500],
+        'category': ['Sales', 'Services']
+    })
+    sample_data.to_csv('test_data.csv', index=False)
+    
+    # Test loading
+    df = loader.load_data('test_data.csv')
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == 2
+    assert all(col in df.columns for col in ['date', 'revenue', 'expenses', 'category'])
+
+def test_data_cleaner():
+    """Test data cleaning functionality."""
+    cleaner = DataCleaner()
+    
+    # Create sample data with issues
+    sample_data = pd.DataFrame({
+        'date': ['2023-01-01', '2023-01-02'],
+        'revenue': [1000, None],
+        'expenses': [800, 1500],
+        'category': ['Sales', None]
+    })
+    
+    # Test cleaning
+    cleaned_df = cleaner.clean_data(sample_data)
+    assert cleaned_df['revenue'].isna().sum() == 0
+    assert cleaned_df['category'].isna().sum() == 0
+
+def test_data_loader_iter_chunks(tmp_path):
+    """Test streaming data loading in bounded chunks."""
+    loader = DataLoader()
+    
+    sample_data = pd.DataFrame({
+        'date': ['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04', '2023-01-05'],
+        'revenue': [1000.25, 2000, 1500, 1200, 1800],
+        'expenses': [800, 1500, 900, 1000, 1100],
+        'category': ['Sales', 'Services', 'Sales', 'Consulting', 'Sales'],
+        'notes': ['a', 'b', 'c', 'd', 'e']
+    })
+    path = tmp_path / 'ledger.csv'
+    sample_data.to_csv(path, index=False)
+    
+    chunks = list(loader.iter_chunks(str(path), chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert list(chunks[0].columns) == ['date', 'revenue', 'expenses', 'category']
+    assert chunks[0]['revenue'].dtype == 'float32'
+    assert str(chunks[0]['category'].dtype) == 'category'
+    assert pd.api.types.is_datetime64_any_dtype(chunks[0]['date'])
+    
+    cents = next(loader.iter_chunks(str(path), money_dtype='int64'))
+    assert cents['revenue'].iloc[0] == 100025
+    
+    sample_data.drop(columns='expenses').to_csv(path, index=False)
+    with pytest.raises(Exception, match='Missing required columns'):
+        next(loader.iter_chunks(str(path)))
+
+def test_data_cache(tmp_path):
+    """Test cached loading, invalidation and eviction."""
+    pytest.importorskip('pyarrow')
+    cache = DataCache(str(tmp_path / 'cache'))
+    
+    sample_data = pd.DataFrame({
+        'date': ['2023-01-01', '2023-01-02', '2023-01-03'],
+        'revenue': [1000, 2000, 1500],
+        'expenses': [800, 1500, 900],
+        'category': ['Sales', 'Services', 'Sales']
+    })
+    path = tmp_path / 'ledger.csv'
+    sample_data.to_csv(path, index=False)
+    
+    first = cache.load_cleaned(str(path), DataLoader(), DataCleaner())
+    assert len(cache.entries()) == 2
+    index = (tmp_path / 'cache' / 'index.json').read_bytes()
+    accessed = max(entry['last_access'] for entry in cache.entries())
+    second = cache.load_cleaned(str(path), DataLoader(), DataCleaner())
+    pd.testing.assert_frame_equal(first, second)
+    # A hit only touches the in-memory access time
+    assert (tmp_path / 'cache' / 'index.json').read_bytes() == index
+    assert cache.entries()[0]['last_access'] > accessed
+    
+    # Changed cleaner settings and changed input both miss the cache
+    cleaner = DataCleaner()
+    cleaner.outlier_threshold = 2
+    cache.load_cleaned(str(path), DataLoader(), cleaner)
+    assert len(cache.entries()) == 3
+    sample_data.iloc[:2].to_csv(path, index=False)
+    assert len(DataLoader().load_data(str(path), cache=cache)) == 2
+    
+    cache.max_bytes = cache.entries()[0]['size']
+    cache._evict()
+    assert len(cache.entries()) == 1
+    cache.clear()
+    assert cache.entries() == []
+
+def test_data_cleaner_groupwise():
+    """Test per-category and rolling outlier bounds."""
+    sample_data = pd.DataFrame({
+        'date': pd.date_range(start='2023-01-01', periods=10),
+        'revenue': [100, 110, 105, 5000, None, 10000, 11000, 10500, 10800, 10200],
+        'expenses': [80, 90, 85, 95, 88, 8000, 8800, 8400, None, 8100],
+        'category': ['Small'] * 5 + ['Large'] * 5
+    })
+    
+    cleaned = DataCleaner(groupwise=True).clean_data(sample_data)
+    small = sample_data[sample_data['category'] == 'Small']['revenue']
+    Q1, Q3 = small.quantile(0.25), small.quantile(0.75)
+    assert cleaned.loc[3, 'revenue'] == pytest.approx(Q3 + 1.5 * (Q3 - Q1))
+    assert cleaned.loc[4, 'revenue'] == pytest.approx(small.median())
+    assert cleaned.loc[8, 'expenses'] == pytest.approx(8250)
+    # Large-category values are untouched by the small category's bounds
+    assert cleaned.loc[5, 'revenue'] == 10000
+    
+    in_place = sample_data.copy()
+    assert DataCleaner(groupwise=True).clean_data(in_place, inplace=True) is in_place
+    
+    rolling = DataCleaner(window='3D').clean_data(sample_data)
+    # The spike sits inside the bounds of its own trailing window
+    assert rolling.loc[3, 'revenue'] == 5000
+    assert rolling.loc[4, 'revenue'] == pytest.approx(sample_data['revenue'].iloc[2:4].median())
+    assert rolling['revenue'].isna().sum() == 0
+
+def test_data_sources(tmp_path):
+    """Test Parquet, SQLite and JSON Lines sources against the CSV path."""
+    import sqlite3
+    loader = DataLoader()
+    sample_data = pd.DataFrame({
+        'date': pd.date_range('2023-01-01', periods=12, freq='D').strftime('%Y-%m-%d'),
+        'revenue': [1000.0 + i for i in range(12)],
+        'expenses': [800.0 + i for i in range(12)],
+        'category': ['Sales', 'Services', 'Consulting'] * 4,
+        'region': ['North', 'South'] * 6
+    })
+    sample_data.to_csv(tmp_path / 'ledger.csv', index=False)
+    sample_data.to_parquet(tmp_path / 'ledger.parquet', index=False, row_group_size=4)
+    sample_data.to_json(tmp_path / 'ledger.jsonl', orient='records', lines=True)
+    with sqlite3.connect(tmp_path / 'ledger.db') as conn:
+        sample_data.to_sql('ledger', conn, index=False)
+    pool = ConnectionPool.sqlite(str(tmp_path / 'ledger.db'), max_connections=2)
+    
+    filters = [('category', 'in', ['Sales', 'Services']), ('revenue', '>=', 1003.0)]
+    expected = loader.load_data(str(tmp_path / 'ledger.csv'), filters=filters)
+    assert len(expected) == 6
+    for source in [str(tmp_path / 'ledger.parquet'), str(tmp_path / 'ledger.jsonl'),
+                   SQLSource(pool, table='ledger')]:
+        df = loader.load_data(source, filters=filters)
+        pd.testing.assert_frame_equal(df[expected.columns], expected, check_dtype=False)
+    
+    projected = loader.load_data(str(tmp_path / 'ledger.parquet'), columns=[])
+    assert list(projected.columns) == loader.required_columns
+    
+    # Filters may name columns outside the projection; unknown extensions read as CSV
+    (tmp_path / 'ledger.txt').write_text((tmp_path / 'ledger.csv').read_text())
+    for source in [str(tmp_path / 'ledger.txt'), SQLSource(pool, table='ledger')]:
+        df = loader.load_data(source, columns=[], filters=[('region', '==', 'North')])
+        assert list(df.columns) == loader.required_columns and len(df) == 6
+    with pytest.raises(ValueError, match='Unknown column'):
+        SQLSource(pool, table='ledger').read(columns=['revenue', '1; DROP TABLE ledger'])
+    with pytest.raises(ValueError, match='Invalid table name'):
+        SQLSource(pool, table='ledger; DROP TABLE ledger')
+    
+    # Chunk boundaries differ per source (Parquet batches follow row groups), so compare the stream
+    csv_rows = pd.concat(loader.iter_chunks(str(tmp_path / 'ledger.csv'), chunksize=5),
+                         ignore_index=True).astype({'category': str})
+    for source in [str(tmp_path / 'ledger.parquet'), str(tmp_path / 'ledger.jsonl'),
+                   SQLSource(pool, query='SELECT * FROM ledger ORDER BY date')]:
+        chunks = list(loader.iter_chunks(source, chunksize=5))
+        assert all(len(chunk) <= 5 for chunk in chunks)
+        assert all(chunk['category'].dtype == 'category' for chunk in chunks)
+        rows = pd.concat(chunks, ignore_index=True).astype({'category': str})
+        pd.testing.assert_frame_equal(rows, csv_rows)
+    assert pool._idle.qsize() == 1
+    pool.close()
+
+def test_compact_schema(tmp_path):
+    """Test the compact layout: memory, lazy derived columns and shared categories."""
+    from src.analysis import FinancialAnalyzer
+    from benchmarks.synthetic import write_ledger_csv
+    path = str(write_ledger_csv(str(tmp_path / 'ledger.csv'), 20000, categories=12))
+    loader = DataLoader()
+    
+    default = DataCleaner().clean_data(loader.load_data(path))
+    schema = CompactSchema('int64')
+    compact = DataCleaner(schema=schema).clean_data(loader.load_data(path, schema=schema))
+    assert 'profit' not in compact.columns
+    assert compact['revenue'].dtype == 'int64'
+    # Cleaned medians and IQR bounds are rounded to whole cents
+    assert ledger_column(compact, 'profit').to_numpy() == pytest.approx(default['profit'].to_numpy(), abs=0.011)
+    report = memory_report(default, compact)
+    assert report['reduction'] >= 3
+    assert report['bytes_per_row_after'] < report['bytes_per_row_before']
+    
+    expected = FinancialAnalyzer(default).generate_full_analysis()
+    actual = FinancialAnalyzer(compact).generate_full_analysis()
+    for key, value in expected['summary_metrics'].items():
+        assert actual['summary_metrics'][key] == pytest.approx(value, rel=1e-4)
+    
+    chunk_schema = CompactSchema('float32')
+    chunks = list(loader.iter_chunks(path, chunksize=3000, schema=chunk_schema))
+    for chunk in chunks:
+        codes = list(chunk['category'].cat.categories)
+        assert codes == chunk_schema.categories[:len(codes)]
+    combined = chunk_schema.concat(chunks)
+    assert combined['category'].dtype == 'category'
+    assert combined['revenue'].dtype == 'float32'
+    assert len(combined) == 20000
@@ -0,0 +1,162 @@
+# tests/test_utils.py
+import pytest
+import pandas as pd
+import json
+from src.utlis import instrumentation, instrumented, stage
+from src.data_processing import DataLoader, DataCleaner
+from src.analysis import FinancialAnalyzer
+
+def test_instrumentation(tmp_path):
+    """Test per-stage metrics, hooks and exporters."""
+    sample_data = pd.DataFrame({
+        'date': ['2023-01-01', '2023-01-02', '2023-02-01'],
+        'revenue': [1000, 2000, 1500],
+        'expenses': [800, 1500, 900],
+        'category': ['Sales', 'Services', 'Sales']
+    })
+    path = tmp_path / 'ledger.csv'
+    sample_data.to_csv(path, index=False)
+    
+    # Disabled by default: no records are kept
+    with stage('ignored'):
+        pass
+    assert instrumentation.records == []
+    
+    seen = []
+    with instrumented(trace_memory=True, hooks=[seen.append]) as registry:
+        registry.reset()
+        df = DataCleaner().clean_data(DataLoader().load_data(str(path)))
+        FinancialAnalyzer(df).generate_full_analysis()
+        registry.export_json(str(tmp_path / 'metrics.json'))
+        registry.export_prometheus(str(tmp_path / 'metrics.prom'))
+    
+    summary = json.loads((tmp_path / 'metrics.json').read_text())['summary']
+    for name in ['load.parse', 'load.validate', 'clean.missing_values', 'clean.outliers',
+                 'analyze.accumulate', 'analyze.trends', 'analyze.categories']:
+        assert name in summary
+    assert summary['load.parse']['rows'] == 3
+    assert summary['clean.copy']['peak_memory_bytes'] >= 0
+    assert len(seen) == len(registry.records)
+    
+    prometheus = (tmp_path / 'metrics.prom').read_text()
+    assert '# TYPE finauto_stage_wall_seconds_total counter' in prometheus
+    assert 'finauto_stage_rows_total{stage="load.parse"} 3' in prometheus
+    assert not instrumentation.enabled
+    instrumentation.reset()
+
+def test_lazy_exports():
+    """Test that package exports resolve on first access and unknown names still fail."""
+    import src.analysis
+    assert 'FinancialAnalyzer' in dir(src.analysis)
+    assert 'FinancialAnalyzer' in src.analysis.__all__
+    from src.analysis import FinancialAnalyzer
+    assert src.analysis.__dict__['FinancialAnalyzer'] is FinancialAnalyzer
+    with pytest.raises(AttributeError):
+        src.analysis.MissingName
+
+def test_results_serialization(tmp_path):
+    """Test that analysis results with NumPy and pandas values round-trip through every format."""
+    import numpy as np
+    from src.utlis import save_to_json, load_from_json
+    from src.data_processing.schema import CompactSchema
+    sample_data = pd.DataFrame({
+        'date': pd.date_range('2023-01-01', periods=90, freq='D'),
+        'revenue': [1000.0 + i for i in range(90)],
+        'expenses': [800.0] * 90,
+        'category': ['Sales', 'Services', 'Consulting'] * 30
+    })
+    results = FinancialAnalyzer(sample_data).generate_full_analysis()
+    results['extras'] = {
+        'daily': np.arange(5, dtype=np.float32),
+        'missing': np.float64('nan'),
+        'key_pair': (1, 'a'),
+        'frame': CompactSchema().compact(sample_data.head(3)),
+        'stamps': pd.Series(pd.date_range('2024-01-01', periods=3, tz='Europe/Berlin').as_unit('s'),
+                            index=pd.date_range('2024-01-01', periods=3, tz='UTC').as_unit('ms'))
+    }
+    
+    for format in ['json', 'compact']:
+        path = str(tmp_path / f'results_{format}.json')
+        save_to_json(results, path, format=format)
+        loaded = load_from_json(path)
+        
+        assert loaded['summary_metrics'] == results['summary_metrics']
+        assert loaded['category_analysis'] == results['category_analysis']
+        monthly = loaded['trend_analysis']['monthly_revenue']
+        assert monthly == results['trend_analysis']['monthly_revenue']
+        assert all(isinstance(key, pd.Timestamp) for key in monthly)
+        extras = loaded['extras']
+        assert extras['daily'].dtype == np.float32
+        np.testing.assert_array_equal(extras['daily'], results['extras']['daily'])
+        assert np.isnan(extras['missing']) and extras['key_pair'] == (1, 'a')
+        pd.testing.assert_frame_equal(extras['frame'], results['extras']['frame'])
+        assert extras['frame'].attrs == {'money_scale': 100}
+        pd.testing.assert_series_equal(extras['stamps'], results['extras']['stamps'], check_freq=False)
+    
+    # Plain JSON written elsewhere still loads unchanged
+    (tmp_path / 'plain.json').write_text('{"a": [1, 2.5, null]}')
+    assert load_from_json(str(tmp_path / 'plain.json')) == {'a': [1, 2.5, None]}
+
+def test_load_legacy_json(tmp_path):
+    """Test that files written by plain json.dump, with NaN and Infinity, still load."""
+    import math
+    from src.utlis import load_from_json
+    path = tmp_path / 'legacy.json'
+    path.write_text(json.dumps({'summary_metrics': {'revenue_growth': float('nan'),
+                                                    'profit_growth': float('inf')}}, indent=4))
+    metrics = load_from_json(str(path))['summary_metrics']
+    assert math.isnan(metrics['revenue_growth'])
+    assert metrics['profit_growth'] == float('inf')
+
+def test_config(tmp_path, monkeypatch):
+    """Test typed config loading, override precedence, hot reload and component defaults."""
+    import os
+    from src.utlis import config as config_module
+    from src.utlis.config import Config, configure
+    from src.data_processing import DataCache
+    
+    path = tmp_path / 'config.yaml'
+    defaults = Config(str(path), environ={})
+    assert defaults.settings.pipeline.chunk_size == 100_000
+    assert defaults.get('reporting', 'charts_dir') == 'reports/charts'
+    assert defaults.get('reporting', 'missing') is None
+    
+    path.write_text("pipeline:\n  chunk_size: 5000\n  max_workers: 2\nemail:\n  recipient_email: a@x.com, b@x.com\n")
+    config = Config(str(path), overrides={'pipeline.max_workers': '3'},
+                    environ={'FINAUTO_PIPELINE__CHUNK_SIZE': '7_000', 'FINAUTO_SMTP_PASSWORD': 'x'})
+    assert config.settings.pipeline.chunk_size == 7000
+    assert config.settings.pipeline.max_workers == 3
+    assert config.settings.email.recipient_email == ['a@x.com', 'b@x.com']
+    
+    for bad in ["pipeline:\n  chunk_size: many\n", "pipeline:\n  chunk_sise: 1\n",
+                "pipeline:\n  cache_format: csv\n", "reportin:\n  charts_dir: x\n"]:
+        path.write_text(bad)
+        with pytest.raises(ValueError):
+            Config(str(path), environ={})
+    
+    # Hot reload picks up a valid edit and keeps the last good settings on an invalid one
+    path.write_text("analysis:\n  outlier_threshold: 2.5\n")
+    config = Config(str(path), environ={})
+    assert not config.reload_if_changed()
+    path.write_text("analysis:\n  outlier_threshold: 4\n")
+    os.utime(path, ns=(0, 1))
+    assert config.reload_if_changed()
+    assert config.settings.analysis.outlier_threshold == 4.0
+    path.write_text("analysis:\n  outlier_threshold: high\n")
+    assert not config.reload_if_changed()
+    assert config.settings.analysis.outlier_threshold == 4.0
+    path.unlink()
+    assert not config.reload_if_changed()
+    assert config.settings.analysis.outlier_threshold == 4.0
+    
+    # Components read their defaults from the process-wide config
+    monkeypatch.setattr(config_module, '_default', None)
+    path.write_text(f"analysis:\n  outlier_threshold: 2\npipeline:\n  cache_dir: {tmp_path / 'cache'}\n")
+    configure(str(path), {'pipeline.chunk_size': 2, 'data.date_format': '%d/%m/%Y'})
+    assert DataCleaner().outlier_threshold == 2.0
+    assert DataCache().cache_dir == str(tmp_path / 'cache')
+    pd.DataFrame({'date': ['31/01/2023', '01/02/2023', '02/02/2023'], 'revenue': [1.0, 2.0, 3.0],
+                  'expenses': [0.5, 1.0, 1.5], 'category': ['Sales'] * 3}).to_csv(tmp_path / 'in.csv', index=False)
+    chunks = list(DataLoader().iter_chunks(str(tmp_path / 'in.csv')))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0]['date'].iloc[0] == pd.Timestamp('2023-01-31')